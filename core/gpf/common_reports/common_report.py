@@ -3,6 +3,8 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
+from collections import OrderedDict
 from typing import Any, cast
 
 from gpf.common_reports.denovo_report import DenovoReport
@@ -11,6 +13,8 @@ from gpf.common_reports.people_counter import PeopleReport
 
 logger = logging.getLogger(__name__)
 
+LOADED_REPORTS_LIMIT = 32
+
 
 class CommonReport:
     """Class representing a common report JSON."""
@@ -32,6 +36,7 @@ class CommonReport:
         self.denovo = data["denovo"]
         self.transmitted = data["transmitted"]
         self.study_description = data["study_description"]
+        self._dicts: dict[bool, dict[str, Any]] = {}
 
     def to_dict(self, *, full: bool = False) -> dict[str, Any]:
         return {
@@ -54,22 +59,103 @@ class CommonReport:
             "study_description": self.study_description,
         }
 
+    def get_dict(self, *, full: bool = False) -> dict[str, Any]:
+        """Return the report as a dict; the result is computed once.
+
+        The returned dict is shared and should not be modified.
+        """
+        result = self._dicts.get(full)
+        if result is None:
+            result = self.to_dict(full=full)
+            self._dicts[full] = result
+        return result
+
     def save(self, report_filename: str) -> None:
         """Save common report into a file."""
         if not os.path.exists(os.path.dirname(report_filename)):
             os.makedirs(os.path.dirname(report_filename))
         with open(report_filename, "w+", encoding="utf8") as crf:
             json.dump(self.to_dict(full=True), crf)
+        _LOADED_REPORTS.put(report_filename, self)
 
     @staticmethod
     def load(report_filename: str) -> CommonReport | None:
         """Load a common report from a file.
 
-        If file does not exists returns None.
+        If file does not exists returns None. Loaded reports are cached
+        in memory until the file changes.
         """
-        if not os.path.exists(report_filename):
+        signature = _LoadedReportsCache.signature(report_filename)
+        if signature is None:
             return None
+        report = _LOADED_REPORTS.get(report_filename, signature)
+        if report is not None:
+            return report
         with open(report_filename, "r", encoding="utf-8") as crf:
             cr_json = json.load(crf)
 
-        return CommonReport(cr_json)
+        report = CommonReport(cr_json)
+        _LOADED_REPORTS.put(report_filename, report, signature)
+        return report
+
+
+class _LoadedReportsCache:
+    """Process level cache of common reports loaded from files.
+
+    Reports are keyed by the file path and are valid while the
+    modification time and the size of the file do not change.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._reports: OrderedDict[
+            str, tuple[tuple[int, int], CommonReport]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def signature(report_filename: str) -> tuple[int, int] | None:
+        """Return the modification time and size of a report file."""
+        try:
+            stat = os.stat(report_filename)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(
+        self, report_filename: str, signature: tuple[int, int],
+    ) -> CommonReport | None:
+        key = os.path.abspath(report_filename)
+        with self._lock:
+            cached = self._reports.get(key)
+            if cached is None or cached[0] != signature:
+                return None
+            self._reports.move_to_end(key)
+            return cached[1]
+
+    def put(
+        self, report_filename: str, report: CommonReport,
+        signature: tuple[int, int] | None = None,
+    ) -> None:
+        """Cache a report loaded from (or saved to) a file.
+
+        The signature should be taken before the file is read; if it is
+        not given, the current signature of the file is used.
+        """
+        key = os.path.abspath(report_filename)
+        if signature is None:
+            signature = self.signature(key)
+        with self._lock:
+            if signature is None:
+                self._reports.pop(key, None)
+                return
+            self._reports[key] = (signature, report)
+            self._reports.move_to_end(key)
+            while len(self._reports) > self.limit:
+                self._reports.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reports.clear()
+
+
+_LOADED_REPORTS = _LoadedReportsCache(LOADED_REPORTS_LIMIT)
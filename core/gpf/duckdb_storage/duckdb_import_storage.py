@@ -57,7 +57,9 @@ class AbstractDuckDbImportStorage(Schema2ImportStorage, abc.ABC):
         }
         has_denovo = False
 
-        if project.get_processing_parquet_dataset_dir() is not None:
+        if project.get_processing_parquet_dataset_dir() is not None \
+                or project.append:
+            # appended studies keep the variant types of the whole dataset
             meta = cls.load_meta(project)
             study_config = yaml.safe_load(meta["study"])
             study_config["id"] = project.study_id
@@ -1,11 +1,14 @@
 import logging
+import math
+import os
+import threading
 import time
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from copy import copy
 from typing import Any
 
 import duckdb
-import numpy as np
 from box import Box
 from sqlglot import column, select
 from sqlglot.expressions import (
@@ -27,6 +30,64 @@ from gpf.utils.sql_utils import to_duckdb_transpile
 logger = logging.getLogger(__name__)
 
 
+class _ReadOnlyConnections:
+    """Read-only connections to gene profile DB files.
+
+    A connection is opened for each request and is closed when the request
+    is done, so other processes (e.g. `generate_gene_profile`) can write the
+    DB file between requests. Each connection comes with a signature of the
+    DB file that changes when the file changes on disk or is written through
+    `GeneProfileDBWriter`; results derived from the file are kept only
+    while the signature stays the same.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._generations: dict[str, int] = {}
+
+    def _signature(self, dbfile: str) -> tuple[int, int, int]:
+        stat = os.stat(dbfile)
+        return (
+            self._generations.get(dbfile, 0), stat.st_mtime_ns, stat.st_size,
+        )
+
+    @contextmanager
+    def cursor(
+        self, dbfile: str,
+    ) -> Iterator[tuple[tuple[int, int, int], duckdb.DuckDBPyConnection]]:
+        """Yield the signature of the DB file and a connection to it."""
+        dbfile = os.path.abspath(dbfile)
+        with self._lock:
+            signature = self._signature(dbfile)
+        with duckdb.connect(dbfile, read_only=True) as connection:
+            yield signature, connection
+
+    def close(self, dbfile: str) -> None:
+        """Invalidate results derived from a DB file before writing to it."""
+        dbfile = os.path.abspath(dbfile)
+        with self._lock:
+            self._generations[dbfile] = self._generations.get(dbfile, 0) + 1
+
+
+_READ_ONLY_CONNECTIONS = _ReadOnlyConnections()
+
+
+def _fetch_records(
+    cursor: duckdb.DuckDBPyConnection, query: str,
+) -> list[dict[str, Any]]:
+    """Execute a query and return the result rows as dictionaries."""
+    cursor.execute(query)
+    names = [desc[0] for desc in cursor.description]
+    return [
+        {
+            name: None if isinstance(value, float) and math.isnan(value)
+            else value
+            for name, value in zip(names, row, strict=True)
+        }
+        for row in cursor.fetchall()
+    ]
+
+
 class GeneProfileDB:
     """
     Class for managing the gene profile database.
@@ -35,6 +96,10 @@ class GeneProfileDB:
     and storing to filesystem.
     Has to be supplied a configuration and a path to which to read/write
     the SQLite DB.
+
+    Pages are sliced from precomputed orders of the gene symbols. The
+    order for each sort column is computed on first use and is kept until
+    the DB file changes.
     """
 
     PAGE_SIZE = 50
@@ -52,6 +117,8 @@ class GeneProfileDB:
         self.configuration = \
             GeneProfileDBWriter.build_configuration(configuration)
         self.table = table_("gene_profile")
+        self._sort_indexes: dict[tuple[str | None, str | None], list[str]] = {}
+        self._sort_indexes_signature: tuple[int, int, int] | None = None
         self.gene_sets_categories = {}
         if len(self.configuration.keys()):
             for category in self.configuration["gene_sets"]:
@@ -71,10 +138,8 @@ class GeneProfileDB:
         query = select("*") \
             .from_(self.table) \
             .where(f"symbol_name = '{gene_symbol}'")
-        with duckdb.connect(f"{self.dbfile}", read_only=True) as connection:
-            rows = connection.execute(
-                to_duckdb_transpile(query),
-            ).df().replace({np.nan: None}).to_dict("records")
+        with _READ_ONLY_CONNECTIONS.cursor(self.dbfile) as (_, cursor):
+            rows = _fetch_records(cursor, to_duckdb_transpile(query))
         if len(rows) == 0:
             return None
         if len(rows) > 1:
@@ -198,6 +263,62 @@ class GeneProfileDB:
                 sort_by = ".".join((collection_id, sort_by_tokens[1]))
         return sort_by.replace(".", "_")
 
+    def _sort_index(
+        self,
+        cursor: duckdb.DuckDBPyConnection,
+        signature: tuple[int, int, int],
+        sort_by: str | None,
+        order: str | None,
+    ) -> list[str]:
+        """Return all gene symbols in the order of a sort column."""
+        if self._sort_indexes_signature != signature:
+            self._sort_indexes = {}
+            self._sort_indexes_signature = signature
+        key = (sort_by, order)
+        index = self._sort_indexes.get(key)
+        if index is not None:
+            return index
+
+        query = select(
+            column(
+                "symbol_name",
+                table=self.table.alias_or_name,
+            ),
+        ).from_(self.table)
+        if sort_by is not None:
+            query = query.order_by(
+                f'"{sort_by}" {order} NULLS LAST', "symbol_name ASC",
+            )
+        cursor.execute(to_duckdb_transpile(query))
+        index = [row[0] for row in cursor.fetchall()]
+        self._sort_indexes[key] = index
+        return index
+
+    def _page(
+        self,
+        symbols: list[str],
+        page: int | None,
+        symbol_like: str | None,
+        *,
+        prefix: bool = False,
+    ) -> list[str]:
+        if symbol_like:
+            symbol_like = symbol_like.lower()
+            if prefix:
+                symbols = [
+                    symbol for symbol in symbols
+                    if symbol.lower().startswith(symbol_like)
+                ]
+            else:
+                symbols = [
+                    symbol for symbol in symbols
+                    if symbol_like in symbol.lower()
+                ]
+        if page is None:
+            return symbols
+        start = self.PAGE_SIZE * (page - 1)
+        return symbols[start:start + self.PAGE_SIZE]
+
     def query_gps(
         self,
         page: int,
@@ -215,33 +336,35 @@ class GeneProfileDB:
             sort_by - Column to sort by
             order - "asc" or "desc"
         """
-        query = select("*").from_(self.table)
-        if symbol_like:
-            query = query.where(
-                column(
-                    "symbol_name",
-                    table=self.table.alias_or_name,
-                ).ilike(f"%{symbol_like}%"),
-            )
-
         if sort_by is not None:
             if order is None:
                 order = "desc"
             sort_by = self._transform_sort_by(sort_by)
             order = "DESC" if order == "desc" else "ASC"
-            query = query.order_by(f'"{sort_by}" {order}')
+        else:
+            order = None
 
-        if page is not None:
-            query = query.limit(self.PAGE_SIZE).offset(
-                self.PAGE_SIZE * (page - 1),
+        with _READ_ONLY_CONNECTIONS.cursor(self.dbfile) as (
+                signature, cursor):
+            symbols = self._page(
+                self._sort_index(cursor, signature, sort_by, order),
+                page, symbol_like,
             )
-
-        # Can't have multiple connections with sqlite db alive when
-        # one of those does a 'write' action. That's why connect here:
-        with duckdb.connect(f"{self.dbfile}", read_only=True) as connection:
-            return connection.execute(
-                to_duckdb_transpile(query),
-            ).df().replace({np.nan: None}).to_dict("records")
+            if not symbols:
+                return []
+            query = select("*").from_(self.table)
+            if page is not None or symbol_like:
+                query = query.where(
+                    column(
+                        "symbol_name",
+                        table=self.table.alias_or_name,
+                    ).isin(*symbols),
+                )
+            rows = {
+                row["symbol_name"]: row
+                for row in _fetch_records(cursor, to_duckdb_transpile(query))
+            }
+        return [rows[symbol] for symbol in symbols]
 
     def list_symbols(
         self, page: int, symbol_like: str | None = None,
@@ -254,33 +377,11 @@ class GeneProfileDB:
             symbol_like - Which gene symbol to search for, supports
             incomplete search
         """
-        query = select(
-            column(
-                "symbol_name",
-                table=self.table.alias_or_name,
-            ),
-        ).from_(self.table)
-        if symbol_like:
-            query = query.where(
-                column(
-                    "symbol_name",
-                    table=self.table.alias_or_name,
-                ).ilike(f"{symbol_like}%"),
-            )
-
-        query = query.order_by("symbol_name ASC")
-
-        if page is not None:
-            query = query.limit(self.PAGE_SIZE).offset(
-                self.PAGE_SIZE * (page - 1),
-            )
-
-        with duckdb.connect(f"{self.dbfile}", read_only=True) as connection:
-            return [
-                row["symbol_name"] for row in connection.execute(
-                    to_duckdb_transpile(query),
-                ).df().replace({np.nan: None}).to_dict("records")
-            ]
+        with _READ_ONLY_CONNECTIONS.cursor(self.dbfile) as (
+                signature, cursor):
+            symbols = self._sort_index(
+                cursor, signature, "symbol_name", "ASC")
+        return self._page(symbols, page, symbol_like, prefix=True)
 
 
 class GeneProfileDBWriter:
@@ -350,8 +451,15 @@ class GeneProfileDBWriter:
 
         return copy(configuration)
 
+    def _connect(self) -> duckdb.DuckDBPyConnection:
+        # Results cached from the read-only connections of this process
+        # are invalidated first, since the file may be written without
+        # changing its size or modification time.
+        _READ_ONLY_CONNECTIONS.close(self.dbfile)
+        return duckdb.connect(f"{self.dbfile}")
+
     def drop_gp_table(self) -> None:
-        with duckdb.connect(f"{self.dbfile}") as connection:
+        with self._connect() as connection:
             connection.execute("DROP TABLE IF EXISTS gene_profile")
             connection.commit()
 
@@ -448,7 +556,7 @@ class GeneProfileDBWriter:
         )
 
         query = Create(this=self.schema, kind="TABLE", exists=True)
-        with duckdb.connect(f"{self.dbfile}") as connection:
+        with self._connect() as connection:
             connection.execute(to_duckdb_transpile(query))
 
     def insert_gp(
@@ -467,7 +575,7 @@ class GeneProfileDBWriter:
             connection.execute(to_duckdb_transpile(query))
             return
 
-        with duckdb.connect(f"{self.dbfile}") as conn:
+        with self._connect() as conn:
             conn.execute(to_duckdb_transpile(query))
 
     def _create_insert_map(
@@ -509,7 +617,7 @@ class GeneProfileDBWriter:
         gps: Iterable[GPStatistic],
     ) -> None:
         """Insert multiple GPStatistics into the DB."""
-        with duckdb.connect(f"{self.dbfile}") as connection:
+        with self._connect() as connection:
             cols = None
             vals = []
             for gp in gps:
@@ -529,7 +637,7 @@ class GeneProfileDBWriter:
 
     def update_gps_with_values(self, gs_values: dict[str, Any]) -> None:
         """Update gp statistic with values"""
-        with duckdb.connect(f"{self.dbfile}") as connection:
+        with self._connect() as connection:
             started = time.time()
             for idx, (gs, vals) in enumerate(gs_values.items(), 1):
                 query = update(
@@ -1,5 +1,8 @@
+import hashlib
 import logging
 import operator
+import os
+import uuid
 from functools import cached_property, lru_cache
 from typing import Any, cast
 
@@ -10,6 +13,7 @@ from gpf.gene_sets.denovo_gene_set_helpers import (
 from gpf.gene_sets.denovo_gene_sets_config import (
     parse_denovo_gene_sets_study_config,
 )
+from gpf.gene_sets.gene_sets_search import GeneSetsSearchIndex
 
 logger = logging.getLogger(__name__)
 
@@ -17,11 +21,16 @@ logger = logging.getLogger(__name__)
 class DenovoGeneSetsDb:
     """Class to manage available de Novo gene sets."""
 
+    SEARCH_INDEXES_LIMIT = 64
+
     def __init__(self, gpf_instance: Any):
         self.gpf_instance = gpf_instance
         self._gene_set_collections_cache: dict[
             str, DenovoGeneSetCollection] = {}
         self._gene_set_configs_cache: dict[str, Any] = {}
+        self._search_indexes: dict[
+            str, tuple[list[str], GeneSetsSearchIndex]] = {}
+        self._cache_version: str | None = None
 
     def __len__(self) -> int:
         return len(self._denovo_gene_set_collections)
@@ -32,6 +41,20 @@ class DenovoGeneSetsDb:
     def reload(self) -> None:
         self._gene_set_collections_cache = {}
         self._gene_set_configs_cache = {}
+        self._search_indexes = {}
+        self._cache_version = None
+
+    @property
+    def cache_version(self) -> str:
+        """Return the version of the loaded de Novo gene sets cache.
+
+        The version is derived from the cache files the gene sets are
+        loaded from, so it changes when the cache is rebuilt.
+        """
+        if self._cache_version is None:
+            self._load_cache()
+        assert self._cache_version is not None
+        return self._cache_version
 
     @property
     def _denovo_gene_set_collections(
@@ -76,8 +99,11 @@ class DenovoGeneSetsDb:
 
             self._gene_set_configs_cache[study_id] = dgsc.config
             self._gene_set_collections_cache[study_id] = dgsc
+        self._search_indexes = {}
+        self._cache_version = uuid.uuid4().hex
 
     def _load_cache(self) -> None:
+        cache_files = []
         for study_id in self.get_genotype_data_ids():
             study = self.gpf_instance.get_genotype_data(study_id)
             assert study is not None, study_id
@@ -91,6 +117,17 @@ class DenovoGeneSetsDb:
             self._gene_set_configs_cache[study_id] = dgsc.config
             self._gene_set_collections_cache[study_id] = dgsc
 
+            cache_dir = study.config.get("conf_dir")
+            for psc_id in dgsc.config.selected_person_set_collections:
+                cache_file = DenovoGeneSetCollection._cache_file(  # noqa: SLF001
+                    psc_id, cache_dir)
+                if os.path.exists(cache_file):
+                    stat = os.stat(cache_file)
+                    cache_files.append(
+                        f"{cache_file}:{stat.st_mtime_ns}:{stat.st_size}")
+        self._cache_version = hashlib.md5(  # noqa: S324
+            "\n".join(cache_files).encode()).hexdigest()
+
     def build_cache(
         self, genotype_data_ids: list[str], *,
         force: bool = False,
@@ -179,3 +216,47 @@ class DenovoGeneSetsDb:
             list(self._denovo_gene_set_collections.values()),
             denovo_gene_set_spec,
         )
+
+    def _search_index(
+        self, denovo_gene_set_spec: dict[str, dict[str, list[str]]],
+    ) -> tuple[list[str], GeneSetsSearchIndex]:
+        # pylint: disable=protected-access
+        spec_desc = DenovoGeneSetCollection._format_description(  # noqa: SLF001
+            denovo_gene_set_spec)
+        if spec_desc not in self._search_indexes:
+            if len(self._search_indexes) >= self.SEARCH_INDEXES_LIMIT:
+                self._search_indexes.clear()
+            names = DenovoGeneSetCollection._get_gene_sets_names(  # noqa: SLF001
+                list(self._denovo_gene_set_collections.values()))
+            self._search_indexes[spec_desc] = (
+                names,
+                GeneSetsSearchIndex(
+                    (name, f"{name} ({spec_desc})") for name in names),
+            )
+        return self._search_indexes[spec_desc]
+
+    def search_gene_sets(
+        self,
+        denovo_gene_set_spec: dict[str, dict[str, list[str]]],
+        query: str | None = None,
+        limit: int | None = None,
+        collection_id: str = "denovo",  # noqa: ARG002
+    ) -> list[dict[str, Any]]:
+        # pylint: disable=unused-argument
+        """Return a ranked page of de Novo gene sets matching the query.
+
+        Gene sets are computed only for the matching names and only until
+        the page is filled.
+        """
+        names, index = self._search_index(denovo_gene_set_spec)
+        collections = list(self._denovo_gene_set_collections.values())
+        result: list[dict[str, Any]] = []
+        for position in index.search(query):
+            gene_set = DenovoGeneSetCollection.get_gene_set_from_collections(
+                names[position], collections, denovo_gene_set_spec)
+            if gene_set is None:
+                continue
+            result.append(gene_set)
+            if limit is not None and len(result) >= limit:
+                break
+        return result
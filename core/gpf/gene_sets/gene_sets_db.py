@@ -1,13 +1,17 @@
 """Class for handling a database of gene set collections."""
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 from collections.abc import Sequence
 from functools import cached_property
-from typing import Any
+from typing import Any, cast
 
 from gain.gene_sets.gene_set import BaseGeneSetCollection, GeneSet
 
+from gpf.gene_sets.gene_sets_search import GeneSetsSearchIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +26,9 @@ class GeneSetsDb:
             gsc.collection_id: gsc.load()
             for gsc in gene_set_collections
         }
+        self._search_indexes: dict[
+            str, tuple[list[GeneSet], GeneSetsSearchIndex]] = {}
+        self._collection_versions: dict[str, str] = {}
 
     @cached_property
     def collections_descriptions(self) -> list[dict[str, Any]]:
@@ -69,6 +76,55 @@ class GeneSetsDb:
             "gene sets from %s: %s", collection_id, len(gsc.gene_sets.keys()))
         return gsc.get_all_gene_sets()
 
+    def get_gene_set_version(
+        self, collection_id: str, gene_set_id: str,
+    ) -> str:
+        """Return a version of the content of a gene set.
+
+        Collections that can change while the instance runs, like remote
+        ones, provide the version of their gene sets. For other collections
+        the version is a hash of the names, descriptions and symbols of all
+        gene sets in the collection. It is the same across workers and
+        restarts and changes when the gene set resource is updated.
+        """
+        gsc = self.gene_set_collections[collection_id]
+        get_version = getattr(gsc, "get_gene_set_version", None)
+        if get_version is not None:
+            return cast(str, get_version(gene_set_id))
+        if collection_id not in self._collection_versions:
+            content = sorted(
+                (gene_set["name"], gene_set["desc"],
+                 sorted(gene_set["syms"]))
+                for gene_set in self.get_all_gene_sets(collection_id)
+            )
+            self._collection_versions[collection_id] = hashlib.sha256(
+                json.dumps(content).encode(),
+            ).hexdigest()
+        return self._collection_versions[collection_id]
+
+    def _search_index(
+        self, collection_id: str,
+    ) -> tuple[list[GeneSet], GeneSetsSearchIndex]:
+        if collection_id not in self._search_indexes:
+            gene_sets = self.get_all_gene_sets(collection_id)
+            self._search_indexes[collection_id] = (
+                gene_sets, GeneSetsSearchIndex.from_gene_sets(gene_sets),
+            )
+        return self._search_indexes[collection_id]
+
+    def search_gene_sets(
+        self, collection_id: str,
+        query: str | None = None,
+        limit: int | None = None,
+    ) -> list[GeneSet]:
+        """Return a ranked page of gene sets matching the query.
+
+        Gene sets are matched case-insensitively by name or description
+        using a search index built once per collection.
+        """
+        gene_sets, index = self._search_index(collection_id)
+        return [gene_sets[position] for position in index.search(query, limit)]
+
     def get_gene_set(
         self, collection_id: str,
         gene_set_id: str,
@@ -0,0 +1,88 @@
+"""Search index over names and descriptions of gene sets."""
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable, Iterator, Sequence
+
+from gain.gene_sets.gene_set import GeneSet
+
+TRIGRAM_SIZE = 3
+
+
+def _trigrams(text: str) -> set[str]:
+    return {
+        text[index:index + TRIGRAM_SIZE]
+        for index in range(len(text) - TRIGRAM_SIZE + 1)
+    }
+
+
+class GeneSetsSearchIndex:
+    """Case-insensitive trigram index over gene set names and descriptions.
+
+    The index is built once for a collection and returns ranked positions
+    of the matching gene sets without scanning the whole collection.
+    Matches are ranked as follows: exact name matches, names starting
+    with the query, names containing the query and finally descriptions
+    containing the query. Ties keep the order of the collection.
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, str]]) -> None:
+        self._names: list[str] = []
+        self._descs: list[str] = []
+        postings: dict[str, list[int]] = {}
+        for position, (name, desc) in enumerate(entries):
+            name, desc = name.lower(), (desc or "").lower()
+            self._names.append(name)
+            self._descs.append(desc)
+            for trigram in _trigrams(name) | _trigrams(desc):
+                postings.setdefault(trigram, []).append(position)
+        self._postings = postings
+
+    @staticmethod
+    def from_gene_sets(
+        gene_sets: Iterable[GeneSet],
+    ) -> GeneSetsSearchIndex:
+        return GeneSetsSearchIndex(
+            (gene_set["name"], gene_set["desc"]) for gene_set in gene_sets
+        )
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _candidates(self, query: str) -> Iterable[int]:
+        if len(query) < TRIGRAM_SIZE:
+            return range(len(self._names))
+        return min(
+            (self._postings.get(trigram, []) for trigram in
+             _trigrams(query)),
+            key=len,
+        )
+
+    def _rank(self, query: str) -> Iterator[tuple[int, int, int]]:
+        for position in self._candidates(query):
+            name = self._names[position]
+            found = name.find(query)
+            if found == 0:
+                yield (0 if name == query else 1, 0, position)
+            elif found > 0:
+                yield (2, found, position)
+            else:
+                found = self._descs[position].find(query)
+                if found >= 0:
+                    yield (3, found, position)
+
+    def search(
+        self, query: str | None, limit: int | None = None,
+    ) -> list[int]:
+        """Return positions of the gene sets matching the query.
+
+        If the query is empty, returns the first `limit` positions.
+        """
+        if not query:
+            return list(range(len(self._names)))[:limit]
+        ranked = self._rank(query.lower())
+        if limit is None:
+            selected: Sequence[tuple[int, int, int]] = sorted(ranked)
+        else:
+            selected = heapq.nsmallest(limit, ranked)
+        return [position for _, _, position in selected]
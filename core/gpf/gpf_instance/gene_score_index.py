@@ -0,0 +1,107 @@
+"""Sorted index of gene score values for partitions and range queries."""
+from __future__ import annotations
+
+import weakref
+from functools import cached_property
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+class GeneScoreIndex:
+    """Sorted values of a single gene score.
+
+    The index keeps the values of a numeric gene score sorted together
+    with their genes, so counting the genes of a range and selecting them
+    take two binary searches. Partition counts use ranges inclusive on both
+    ends, as in the partitions view. Gene selection uses the bounds of
+    `GeneScore.get_genes`: the minimum is inclusive and the maximum is
+    exclusive. Missing values are counted in the total but are never in a
+    range.
+
+    The serialized TSV download of the score is kept with the index.
+    """
+
+    def __init__(
+        self, score_id: str, score_df: pd.DataFrame,
+        gene_score: Any = None,
+    ) -> None:
+        self.score_id = score_id
+        self.total = len(score_df)
+        # a weak reference, so the index does not keep its gene score alive
+        self._gene_score = None if gene_score is None \
+            else weakref.ref(gene_score)
+
+        values = score_df[score_id]
+        self.is_numeric = pd.api.types.is_numeric_dtype(values)
+        if not self.is_numeric:
+            self._values = np.empty(0, dtype=np.float64)
+            self._genes = np.empty(0, dtype=object)
+            return
+        values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+        order = np.argsort(values[present], kind="stable")
+        self._values = values[present][order]
+        self._genes = score_df["gene"].to_numpy(dtype=object)[present][order]
+
+    @staticmethod
+    def build(gene_score: Any, score_id: str) -> GeneScoreIndex:
+        """Build an index of a score of a gene score resource."""
+        return GeneScoreIndex(
+            score_id, gene_score.get_score_df(score_id), gene_score)
+
+    def count_partitions(
+        self, score_min: float, score_max: float,
+    ) -> tuple[int, int, int]:
+        """Count values below, inside and above the range."""
+        if not self.is_numeric:
+            raise ValueError(f"gene score {self.score_id} is not numeric")
+        start = int(np.searchsorted(self._values, score_min, side="left"))
+        end = int(np.searchsorted(self._values, score_max, side="right"))
+        return start, max(end - start, 0), len(self._values) - end
+
+    def get_genes(
+        self,
+        score_min: float | None = None,
+        score_max: float | None = None,
+    ) -> set[str]:
+        """Return the genes with values at least min and less than max.
+
+        Missing or infinite bounds leave the range open on that side.
+        """
+        if not self.is_numeric:
+            raise ValueError(f"gene score {self.score_id} is not numeric")
+        start = 0
+        if score_min is not None and score_min != -np.inf:
+            start = int(np.searchsorted(self._values, score_min, side="left"))
+        end = len(self._values)
+        if score_max is not None and score_max != np.inf:
+            end = int(np.searchsorted(self._values, score_max, side="left"))
+        return set(self._genes[start:max(start, end)])
+
+    @cached_property
+    def tsv_lines(self) -> tuple[str, ...]:
+        """Return the lines of the TSV download of the score."""
+        assert self._gene_score is not None
+        gene_score = self._gene_score()
+        assert gene_score is not None
+        return tuple(gene_score.to_tsv(self.score_id))
+
+
+_INDEXES: weakref.WeakKeyDictionary[Any, dict[str, GeneScoreIndex]] = \
+    weakref.WeakKeyDictionary()
+
+
+def get_gene_score_index(gene_score: Any, score_id: str) -> GeneScoreIndex:
+    """Return the index of a gene score; build it on first use.
+
+    Indexes are kept by gene score in a weak dictionary, so they are dropped
+    together with the gene score when the instance is reloaded.
+    """
+    indexes = _INDEXES.setdefault(gene_score, {})
+    index = indexes.get(score_id)
+    if index is None:
+        index = GeneScoreIndex.build(gene_score, score_id)
+        indexes[score_id] = index
+    return index
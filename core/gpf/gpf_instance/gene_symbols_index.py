@@ -0,0 +1,125 @@
+"""Index of gene symbols for autocomplete and validation."""
+from __future__ import annotations
+
+import bisect
+import heapq
+import itertools
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+MAX_NGRAM_SIZE = 3
+
+
+def _ngrams(term: str, size: int) -> set[str]:
+    return {
+        term[index:index + size]
+        for index in range(len(term) - size + 1)
+    }
+
+
+class GeneSymbolsIndex:
+    """Case-insensitive prefix and substring index of gene symbols.
+
+    The index is built once for a gene models mapping (gene symbol to
+    transcript models) and answers autocomplete queries in time
+    proportional to the number of candidate symbols. Gene symbols are also
+    resolved case-insensitively to their canonical spelling.
+    """
+
+    def __init__(self, gene_symbols: Iterable[str]) -> None:
+        entries = sorted({(symbol.lower(), symbol) for symbol in gene_symbols})
+        self._lowers = [lower for lower, _ in entries]
+        self._symbols = [symbol for _, symbol in entries]
+        self._canonical: set[str] = set(self._symbols)
+        self._aliases: dict[str, str] = {}
+        for lower, symbol in entries:
+            self._aliases.setdefault(lower, symbol)
+
+        ngrams: dict[str, list[int]] = {}
+        for position, lower in enumerate(self._lowers):
+            for size in range(1, MAX_NGRAM_SIZE + 1):
+                for ngram in _ngrams(lower, size):
+                    ngrams.setdefault(ngram, []).append(position)
+        self._ngrams = ngrams
+        self._source: Any = None
+
+    @staticmethod
+    def build(gene_models: Mapping[str, Any]) -> GeneSymbolsIndex:
+        """Build an index of the gene symbols of a gene models mapping."""
+        index = GeneSymbolsIndex(gene_models.keys())
+        index._source = gene_models
+        return index
+
+    def is_built_for(self, gene_models: Mapping[str, Any]) -> bool:
+        """Check if the index was built for the given gene models mapping."""
+        return self._source is gene_models \
+            and len(self._canonical) == len(gene_models)
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, gene_symbol: object) -> bool:
+        """Check if a gene symbol is in the index with the exact spelling."""
+        return gene_symbol in self._canonical
+
+    def resolve(self, gene_symbol: str) -> str | None:
+        """Return the canonical gene symbol or None if it is unknown.
+
+        Exact matches are preferred; otherwise the symbol is matched
+        case-insensitively.
+        """
+        if gene_symbol in self._canonical:
+            return gene_symbol
+        return self._aliases.get(gene_symbol.lower())
+
+    def prefix_search(self, term: str, limit: int | None = None) -> list[str]:
+        """Return gene symbols starting with the term, in sorted order."""
+        term = term.lower()
+        start = bisect.bisect_left(self._lowers, term)
+        matches = itertools.takewhile(
+            lambda position: self._lowers[position].startswith(term),
+            range(start, len(self._lowers)),
+        )
+        return [
+            self._symbols[position]
+            for position in itertools.islice(matches, limit)
+        ]
+
+    def substring_search(
+        self, term: str, limit: int | None = None,
+    ) -> list[str]:
+        """Return gene symbols containing the term (not as a prefix).
+
+        Matches are ranked by the position of the term in the symbol and
+        then by symbol length.
+        """
+        term = term.lower()
+        if not term:
+            return []
+        candidates = min(
+            (self._ngrams.get(ngram, []) for ngram in
+             _ngrams(term, min(len(term), MAX_NGRAM_SIZE))),
+            key=len,
+        )
+        ranked = []
+        for position in candidates:
+            found = self._lowers[position].find(term)
+            if found > 0:
+                ranked.append(
+                    (found, len(self._lowers[position]), position))
+        if limit is None:
+            ranked.sort()
+        else:
+            ranked = heapq.nsmallest(limit, ranked)
+        return [self._symbols[position] for _, _, position in ranked]
+
+    def search(self, term: str, limit: int) -> list[str]:
+        """Return ranked gene symbols matching the term.
+
+        Symbols starting with the term come first, followed by symbols
+        containing it.
+        """
+        result = self.prefix_search(term, limit)
+        if len(result) < limit:
+            result.extend(self.substring_search(term, limit - len(result)))
+        return result
@@ -36,6 +36,7 @@ from gpf.gene_profile.statistic import GPStatistic
 from gpf.gene_sets.denovo_gene_sets_db import DenovoGeneSetsDb
 from gpf.gene_sets.gene_sets_db import GeneSetsDb
 from gpf.genomic_scores.scores import GenomicScoresRegistry
+from gpf.gpf_instance.gene_symbols_index import GeneSymbolsIndex
 from gpf.pheno.pheno_data import (
     PhenotypeData,
     get_pheno_db_dir,
@@ -45,6 +46,7 @@ from gpf.pheno.storage import (
     PhenotypeStorage,
     PhenotypeStorageRegistry,
 )
+from gpf.studies.families_snapshot import FamiliesSnapshotCache
 from gpf.studies.study import GenotypeData
 from gpf.studies.variants_db import VariantsDb
 
@@ -125,6 +127,7 @@ class GPFInstance:
             kwargs.get("gene_models"),
         )
         self._annotation_pipeline: AnnotationPipeline | None = None
+        self._gene_symbols_index: GeneSymbolsIndex | None = None
 
         cache_dir = self.dae_config.get("cache_path")
         if cache_dir:
@@ -217,14 +220,26 @@ class GPFInstance:
         self, gene_symbol: str,
     ) -> tuple[str | None, list[TranscriptModel] | None]:
         """Get gene model by gene symbol."""
-        gene_symbol = gene_symbol.lower()
-        gene_models = self.gene_models.gene_models
+        canonical_gene_symbol = self.gene_symbols_index.resolve(gene_symbol)
+        if canonical_gene_symbol is None:
+            return None, None
+        return (
+            canonical_gene_symbol,
+            self.gene_models.gene_models[canonical_gene_symbol],
+        )
 
-        for k, v in gene_models.items():
-            if gene_symbol == k.lower():
-                return k, v
+    @property
+    def gene_symbols_index(self) -> GeneSymbolsIndex:
+        """Return an index of the gene symbols of the instance gene models.
 
-        return None, None
+        The index is built once and rebuilt only if the gene models change.
+        """
+        gene_models = self.gene_models.gene_models
+        index = self._gene_symbols_index
+        if index is None or not index.is_built_for(gene_models):
+            index = GeneSymbolsIndex.build(gene_models)
+            self._gene_symbols_index = index
+        return index
 
     def _get_default_phenotype_storage_config(self) -> dict:
         base_dir = get_pheno_db_dir(self.dae_config)
@@ -331,12 +346,17 @@ class GPFInstance:
 
     @cached_property
     def _variants_db(self) -> VariantsDb:
+        families_snapshots = None
+        families_cache_path = self.get_cache_path("families")
+        if families_cache_path is not None:
+            families_snapshots = FamiliesSnapshotCache(families_cache_path)
         return VariantsDb(
             self.dae_config,
             self.reference_genome,
             self.gene_models,
             self.get_annotation_pipeline().get_attributes(),
             self.genotype_storages,
+            families_snapshots=families_snapshots,
         )
 
     @cached_property
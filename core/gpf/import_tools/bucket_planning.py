@@ -0,0 +1,284 @@
+"""Planning of import buckets balanced by the density of variants."""
+from __future__ import annotations
+
+import gzip
+import io
+import logging
+import struct
+from collections.abc import Callable, Iterable
+from typing import BinaryIO
+
+import fsspec
+import numpy as np
+from gain.utils import fs_utils
+from gain.utils.regions import Region
+
+from gpf.variants_loaders.cnv.loader import CNVLoader
+from gpf.variants_loaders.dae.loader import DaeTransmittedLoader, DenovoLoader
+from gpf.variants_loaders.raw.loader import VariantsGenotypesLoader
+from gpf.variants_loaders.vcf.loader import VcfLoader
+
+logger = logging.getLogger(__name__)
+
+DENSITY_WINDOW = 1 << 14
+
+TABIX_MIN_SHIFT = 14
+TABIX_DEPTH = 5
+BGZF_COMPRESSION_RATIO = 4
+
+# Density of a chromosome: start positions (0-based) of windows and
+# estimated amount of work for each window.
+Density = dict[str, tuple[np.ndarray, np.ndarray]]
+
+
+def _read(infile: BinaryIO, fmt: str) -> tuple:
+    size = struct.calcsize(fmt)
+    data = infile.read(size)
+    if len(data) != size:
+        raise ValueError("unexpected end of index file")
+    return struct.unpack(fmt, data)
+
+
+def _read_sequence_names(infile: BinaryIO) -> list[str]:
+    # tabix header: format, col_seq, col_beg, col_end, meta, skip, l_nm
+    header = _read(infile, "<7i")
+    names = infile.read(header[6])
+    return [name.decode() for name in names.split(b"\0") if name]
+
+
+def _bin_starts(
+    bins: np.ndarray, min_shift: int, depth: int,
+) -> np.ndarray:
+    """Return 0-based start positions of UCSC binning scheme bins."""
+    starts = np.zeros(len(bins), dtype=np.int64)
+    for level in range(depth + 1):
+        first = ((1 << (3 * level)) - 1) // 7
+        last = ((1 << (3 * (level + 1))) - 1) // 7
+        in_level = (bins >= first) & (bins < last)
+        shift = min_shift + 3 * (depth - level)
+        starts[in_level] = (bins[in_level] - first) << shift
+    return starts
+
+
+def _chunks_size(chunks: np.ndarray) -> float:
+    """Estimate the uncompressed size of BGZF chunks.
+
+    Virtual offsets point to a compressed block and to a position inside
+    the uncompressed block; the size of the compressed blocks between the
+    ends of a chunk is scaled by a typical compression ratio.
+    """
+    begin, end = chunks[:, 0].astype(np.int64), chunks[:, 1].astype(np.int64)
+    sizes = ((end >> 16) - (begin >> 16)) * BGZF_COMPRESSION_RATIO \
+        + (end & 0xFFFF) - (begin & 0xFFFF)
+    return float(np.sum(np.maximum(sizes, 1)))
+
+
+def _sum_windows(
+    starts: np.ndarray, weights: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Sort windows by start and sum the weights of equal windows."""
+    result_starts, inverse = np.unique(starts, return_inverse=True)
+    result_weights = np.zeros(len(result_starts), dtype=np.float64)
+    np.add.at(result_weights, inverse, weights)
+    return result_starts, result_weights
+
+
+def _read_reference_bins(
+    infile: BinaryIO, min_shift: int, depth: int, *,
+    csi: bool,
+) -> tuple[np.ndarray, np.ndarray]:
+    pseudo_bin = ((1 << (3 * (depth + 1))) - 1) // 7 + 1
+    (n_bin,) = _read(infile, "<i")
+    bins = []
+    sizes = []
+    for _ in range(n_bin):
+        if csi:
+            bin_id, _loffset, n_chunk = _read(infile, "<IQi")
+        else:
+            bin_id, n_chunk = _read(infile, "<Ii")
+        chunks = np.frombuffer(
+            infile.read(16 * n_chunk), dtype="<u8").reshape(-1, 2)
+        if bin_id == pseudo_bin:
+            continue
+        bins.append(bin_id)
+        sizes.append(_chunks_size(chunks))
+    if not csi:
+        (n_intv,) = _read(infile, "<i")
+        infile.read(8 * n_intv)
+    return (
+        _bin_starts(np.array(bins, dtype=np.int64), min_shift, depth),
+        np.array(sizes, dtype=np.float64),
+    )
+
+
+def index_density(index_filename: str) -> Density:
+    """Estimate the density of records from a tabix (TBI) or CSI index.
+
+    The amount of work in a region is estimated with the size of the
+    records the index points to in that region.
+    """
+    with fsspec.open(index_filename, "rb") as raw, \
+            gzip.GzipFile(fileobj=raw) as infile:
+        magic = infile.read(4)
+        if magic == b"TBI\1":
+            (n_ref,) = _read(infile, "<i")
+            names = _read_sequence_names(infile)
+            min_shift, depth, csi = TABIX_MIN_SHIFT, TABIX_DEPTH, False
+        elif magic == b"CSI\1":
+            min_shift, depth, l_aux = _read(infile, "<3i")
+            aux = infile.read(l_aux)
+            (n_ref,) = _read(infile, "<i")
+            names = []
+            if l_aux >= struct.calcsize("<7i"):
+                names = _read_sequence_names(io.BytesIO(aux))
+            csi = True
+        else:
+            raise ValueError(f"unsupported index file {index_filename}")
+
+        if len(names) != n_ref:
+            raise ValueError(
+                f"sequence names missing in index {index_filename}")
+        result: Density = {}
+        for name in names:
+            starts, sizes = _read_reference_bins(
+                infile, min_shift, depth, csi=csi)
+            if len(starts) > 0:
+                result[name] = _sum_windows(starts, sizes)
+        return result
+
+
+def positions_density(
+    chromosomes: Iterable[str], positions: Iterable[int],
+) -> Density:
+    """Count positions (1-based) in windows of `DENSITY_WINDOW` length."""
+    chroms = np.asarray(list(chromosomes), dtype=object)
+    windows = (np.asarray(list(positions), dtype=np.int64) - 1) \
+        // DENSITY_WINDOW * DENSITY_WINDOW
+    result: Density = {}
+    for chrom in dict.fromkeys(chroms):
+        starts, counts = np.unique(
+            windows[chroms == chrom], return_counts=True)
+        result[chrom] = (starts, counts.astype(np.float64))
+    return result
+
+
+def merge_densities(
+    densities: Iterable[Density],
+    adjust_chrom: Callable[[str], str] = lambda chrom: chrom,
+) -> Density:
+    """Sum densities of several inputs."""
+    collected: dict[str, list[tuple[np.ndarray, np.ndarray]]] = {}
+    for density in densities:
+        for chrom, windows in density.items():
+            collected.setdefault(adjust_chrom(chrom), []).append(windows)
+    return {
+        chrom: _sum_windows(
+            np.concatenate([part[0] for part in parts]),
+            np.concatenate([part[1] for part in parts]))
+        for chrom, parts in collected.items()
+    }
+
+
+def loader_density(loader: VariantsGenotypesLoader) -> Density | None:
+    """Estimate the density of the variants of a loader.
+
+    VCF and DAE inputs are estimated from their tabix indexes; de Novo and
+    CNV inputs are already loaded in memory and their records are counted.
+    De Novo records are counted by their locations in the input, without
+    converting them into variants.
+    Returns None when the density of the input cannot be estimated.
+    """
+    if isinstance(loader, DenovoLoader):
+        chroms, positions = loader.record_locations
+        located = positions > 0
+        return positions_density(chroms[located], positions[located])
+    if isinstance(loader, CNVLoader):
+        return positions_density(
+            loader.cnv_df["chrom"].map(loader._adjust_chrom),  # noqa: SLF001
+            loader.cnv_df["position"])
+    if isinstance(loader, VcfLoader):
+        filenames = loader.filenames
+    elif isinstance(loader, DaeTransmittedLoader):
+        filenames = [loader.summary_filename]
+    else:
+        return None
+
+    densities = []
+    for filename in filenames:
+        index_filename = fs_utils.tabix_index_filename(filename)
+        if index_filename is None:
+            return None
+        try:
+            densities.append(index_density(index_filename))
+        except (ValueError, OSError, EOFError):
+            logger.warning(
+                "unable to estimate variants density from %s",
+                index_filename, exc_info=True)
+            return None
+    return merge_densities(
+        densities, loader._adjust_chrom)  # noqa: SLF001
+
+
+def plan_balanced_buckets(
+    density: Density,
+    chromosomes: list[str],
+    chromosome_lengths: dict[str, int],
+    buckets_count: int,
+) -> list[list[Region]]:
+    """Split chromosomes into buckets of similar estimated work.
+
+    Chromosomes are covered in order by consecutive regions. A bucket is
+    closed when it reaches its share of the total work, so dense parts of
+    the genome are split into many buckets and sparse chromosomes are
+    grouped together in a single bucket.
+    """
+    total = sum(
+        float(np.sum(density[chrom][1]))
+        for chrom in chromosomes if chrom in density)
+    if buckets_count <= 1 or total == 0:
+        return [[Region(chrom) for chrom in chromosomes]]
+    target = total / buckets_count
+
+    result: list[list[Region]] = []
+    current: list[Region] = []
+    accumulated = 0.0
+    closed = 0.0
+
+    def is_full() -> bool:
+        # the last bucket takes whatever is left
+        return len(result) < buckets_count - 1 \
+            and accumulated >= (len(result) + 1) * target
+
+    for chrom in chromosomes:
+        starts, weights = density.get(
+            chrom, (np.empty(0, dtype=np.int64), np.empty(0)))
+        region_start = 1
+        for index, weight in enumerate(weights):
+            accumulated += weight
+            if index == len(starts) - 1 or not is_full():
+                continue
+            # close the bucket just before the next window with records
+            region_end = int(starts[index + 1])
+            current.append(Region(chrom, region_start, region_end))
+            result.append(current)
+            current = []
+            closed = accumulated
+            region_start = region_end + 1
+        if region_start == 1:
+            current.append(Region(chrom))
+        else:
+            current.append(
+                Region(chrom, region_start, chromosome_lengths.get(chrom)))
+        if is_full():
+            result.append(current)
+            current = []
+            closed = accumulated
+    if current and result and accumulated == closed:
+        # chromosomes without variants after the last full bucket
+        result[-1].extend(current)
+    elif current:
+        result.append(current)
+    logger.info(
+        "planned %s balanced buckets with estimated work %.0f each",
+        len(result), target)
+    return result
@@ -23,6 +23,7 @@ _region_chromosomes_schema: dict[str, Any] = {
 
 _loader_processing_params = {
     "row_group_size": {"anyof_type": ["integer", "string"]},
+    "buckets": {"type": "integer", "min": 1},
     **_region_chromosomes_schema,
 }
 
@@ -92,11 +93,24 @@ import_config_schema: dict[str, Any] = {
                 "default": "json",
             },
             "include_reference": {"type": "boolean", "default": False},
+            "append": {"type": "boolean", "default": False},
             "annotation_batch_size": {"type": "integer", "default": 0},
+            "annotation_cache": {"type": "string"},
             "parquet_row_group_size": {
                 "anyof_type": ["integer", "string"],
                 "default": 50_000,
             },
+            "parquet_row_group_bytes": {
+                "anyof_type": ["integer", "string"],
+            },
+            "parquet_merge": {
+                "type": "dict",
+                "schema": {
+                    "sort": {"type": "boolean", "default": False},
+                    "threads": {"type": "integer", "min": 1, "default": 1},
+                    "memory_limit": {"type": "string", "default": "4G"},
+                },
+            },
             "vcf": _loader_processing_schema,
             "denovo": _loader_processing_schema,
             "cnv": _loader_processing_schema,
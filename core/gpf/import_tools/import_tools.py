@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
 import pathlib
@@ -12,6 +14,7 @@ from dataclasses import dataclass
 from functools import cache, cached_property
 from typing import Any, cast
 
+import fsspec
 import yaml
 from box import Box
 from gain.annotation.annotation_factory import (
@@ -34,6 +37,10 @@ from gpf.genotype_storage.genotype_storage_registry import (
     GenotypeStorageRegistry,
 )
 from gpf.gpf_instance import GPFInstance
+from gpf.import_tools.bucket_planning import (
+    loader_density,
+    plan_balanced_buckets,
+)
 from gpf.import_tools.import_config import (
     embedded_input_schema,
     import_config_schema,
@@ -282,6 +289,52 @@ class ImportProject:
             self._input_filenames_cache[bucket.type] = loader.filenames
         return self._input_filenames_cache[bucket.type]
 
+    def get_bucket_fingerprint(
+        self, bucket: Bucket,
+        file_fingerprints: dict[str, str] | None = None,
+    ) -> str:
+        """Return a fingerprint of everything the output of a bucket uses.
+
+        The fingerprint covers the bucket regions, the content of the input
+        files and the pedigree, the loader parameters, the annotation
+        pipeline config, the partition descriptor and the parquet row group
+        sizes. Fingerprints of the input files are looked up in and added to
+        `file_fingerprints`, so buckets sharing inputs read them only once.
+        """
+        if file_fingerprints is None:
+            file_fingerprints = {}
+
+        def fingerprint(filename: str) -> str:
+            if filename not in file_fingerprints:
+                file_fingerprints[filename] = file_fingerprint(filename)
+            return file_fingerprints[filename]
+
+        content: dict[str, Any] = {
+            "bucket": [
+                bucket.type, bucket.region_bin, bucket.regions, bucket.index],
+            "inputs": [
+                fingerprint(filename)
+                for filename in self.get_input_filenames(bucket)
+            ],
+            "variant_params": self.get_variant_params(bucket.type)[1],
+            "annotation": self.get_annotation_pipeline_config(),
+            "partition_description":
+                self.get_partition_descriptor().serialize(),
+            "reference_genome":
+                self.get_gpf_instance().reference_genome.resource_id,
+            "gene_models": self.get_gpf_instance().gene_models.resource_id,
+            "include_reference": self.include_reference,
+            "row_group_size": self.get_row_group_size(),
+            "row_group_bytes": self.get_row_group_bytes(),
+        }
+        if "pedigree" in self.import_config["input"]:
+            pedigree_filename, pedigree_params = self.get_pedigree_params()
+            content["pedigree"] = [
+                fingerprint(pedigree_filename), pedigree_params]
+        return hashlib.sha256(
+            json.dumps(content, sort_keys=True, default=str).encode(),
+        ).hexdigest()
+
     def get_variant_params(
         self, loader_type: str,
     ) -> tuple[str | list[str], dict[str, Any]]:
@@ -415,6 +468,14 @@ class ImportProject:
             self.import_config.get("processing_config", {}).get(
                 "include_reference", False))
 
+    @property
+    def append(self) -> bool:
+        """Check if the import should be appended to an existing dataset."""
+        return cast(
+            bool,
+            self.import_config.get("processing_config", {}).get(
+                "append", False))
+
     @property
     def input_dir(self) -> str:
         """Return the path relative to which input files are specified."""
@@ -433,6 +494,11 @@ class ImportProject:
         processing_config = self.import_config.get("processing_config", {})
         return int(processing_config.get("annotation_batch_size", 0))
 
+    def get_processing_annotation_cache(self) -> str | None:
+        """Return the annotation cache filename if configured."""
+        processing_config = self.import_config.get("processing_config", {})
+        return cast(str | None, processing_config.get("annotation_cache"))
+
     def get_processing_parquet_dataset_dir(self) -> str | None:
         """Return processing parquet dataset dir if configured and exists."""
         processing_config = self.import_config.get("processing_config", {})
@@ -496,6 +562,24 @@ class ImportProject:
             .get("parquet_row_group_size", 50_000)
         return cast(int, res)
 
+    def get_row_group_bytes(self) -> int | None:
+        """Return the size in bytes of row groups of the bucket files."""
+        res = self.import_config \
+            .get("processing_config", {}) \
+            .get("parquet_row_group_bytes")
+        return cast(int | None, res)
+
+    def get_parquet_merge_config(self) -> dict[str, Any]:
+        """Return the configuration for merging of the parquet files."""
+        merge_config = self.import_config \
+            .get("processing_config", {}) \
+            .get("parquet_merge", {})
+        return {
+            "sort": merge_config.get("sort", False),
+            "threads": merge_config.get("threads", 1),
+            "memory_limit": merge_config.get("memory_limit", "4G"),
+        }
+
     def _storage_type(self) -> str:
         if not self._has_destination():
             # get default storage schema from GPF instance
@@ -585,13 +669,21 @@ class ImportProject:
         elif len(processing_config) == 0:
             mode = "single_bucket"  # default mode when missing config
 
+        processing_regions: dict[str, list[str]] | None = None
         if mode == "single_bucket":
-            processing_regions: dict[str, list[str]] = {"all": []}
+            processing_regions = {"all": []}
         elif mode == "chromosome":
             processing_regions = {
                 chrom: [chrom] for chrom in loader_chromosomes}
         else:
             assert mode is None
+            if "buckets" in processing_config:
+                processing_regions = self._balanced_region_bins(
+                    loader, loader_chromosomes,
+                    reference_genome.get_all_chrom_lengths(),
+                    processing_config["buckets"],
+                )
+        if processing_regions is None:
             processing_regions = {
                 chrom: [str(r) for r in regions]
                 for chrom, regions in processing_descriptor
@@ -615,6 +707,28 @@ class ImportProject:
                 bucket_index,
             )
 
+    @staticmethod
+    def _balanced_region_bins(
+        loader: VariantsGenotypesLoader,
+        chromosomes: list[str],
+        chromosome_lengths: dict[str, int],
+        buckets_count: int,
+    ) -> dict[str, list[str]] | None:
+        """Split the input into buckets with similar number of variants."""
+        density = loader_density(loader)
+        if density is None:
+            logger.warning(
+                "unable to estimate variants density of %s input; "
+                "using fixed length region bins",
+                loader.get_attribute("source_type"))
+            return None
+        buckets = plan_balanced_buckets(
+            density, chromosomes, chromosome_lengths, buckets_count)
+        return {
+            f"balanced_{index}": [str(region) for region in regions]
+            for index, regions in enumerate(buckets)
+        }
+
     def _get_processing_region_length(self, loader_type: str) -> int | None:
         processing_config = self._get_loader_processing_config(loader_type)
         if isinstance(processing_config, str):
@@ -760,6 +874,11 @@ class ImportConfigNormalizer:
             else:
                 config["processing_config"]["parquet_row_group_size"] = \
                     self._int_shorthand(group_size_config)
+        if config.get("processing_config", {}).get(
+                "parquet_row_group_bytes") is not None:
+            config["processing_config"]["parquet_row_group_bytes"] = \
+                self._int_shorthand(
+                    config["processing_config"]["parquet_row_group_bytes"])
         return config, base_input_dir, external_files
 
     @classmethod
@@ -944,6 +1063,37 @@ def save_study_config(
     config_file.write_text(study_config)
 
 
+def file_fingerprint(filename: str) -> str:
+    """Return a fingerprint of the content of an input file.
+
+    Files indexed with tabix are fingerprinted by their size, modification
+    time and the content of their index; other files by their full content.
+    Directories are fingerprinted by the names, sizes and modification times
+    of the files in them.
+    """
+    def modified(info: dict[str, Any]) -> Any:
+        for key in ("mtime", "LastModified", "updated", "ETag"):
+            if key in info:
+                return info[key]
+        return None
+
+    fs, path = fsspec.core.url_to_fs(filename)
+    hasher = hashlib.sha256()
+    if fs.isdir(path):
+        for name, info in sorted(fs.find(path, detail=True).items()):
+            hasher.update(
+                f"{name}:{info['size']}:{modified(info)}\n".encode())
+        return hasher.hexdigest()
+
+    info = fs.info(path)
+    hasher.update(f"{info['size']}:{modified(info)}\n".encode())
+    index_filename = fs_utils.tabix_index_filename(filename)
+    with fsspec.open(index_filename or filename, "rb") as infile:
+        while chunk := infile.read(1 << 20):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
 def construct_import_annotation_pipeline_config(
     gpf_instance: GPFInstance,
     annotation_configfile: str | None = None,
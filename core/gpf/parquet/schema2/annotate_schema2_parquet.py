@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import argparse
 import itertools
+import json
 import logging
 import operator
 import os
 import pathlib
 import shutil
 import sys
+import threading
 from datetime import datetime
-from typing import Any
+from typing import Any, cast
 
 import yaml
 from gain.annotation.annotate_utils import (
@@ -50,11 +52,16 @@ from gpf.parquet.parquet_writer import (
     serialize_summary_schema,
 )
 from gpf.parquet.partition_descriptor import PartitionDescriptor
+from gpf.parquet.schema2.annotation_cache import (
+    AnnotationCache,
+    annotation_pipeline_fingerprint,
+)
 from gpf.parquet.schema2.loader import ParquetLoader
 from gpf.parquet.schema2.merge_parquet import merge_variants_parquets
 from gpf.parquet.schema2.processing_pipeline import (
     AnnotationPipelineVariantsBatchFilter,
     AnnotationPipelineVariantsFilter,
+    CachedAnnotationVariantsBatchFilter,
     DeleteAttributesFromVariantFilter,
     DeleteAttributesFromVariantsBatchFilter,
     Schema2SummaryVariantsBatchSource,
@@ -141,9 +148,24 @@ def produce_schema2_annotation_tasks(  # pylint:disable=R0917
     raw_pipeline: RawPipelineConfig,
     grr: GenomicResourceRepo,
     target_region: str | None,
-    args: dict[str, Any],
+    args: dict[str, Any], *,
+    task_prefix: str = "",
+    split_regions: bool = True,
 ) -> list[Task]:
-    """Produce TaskGraph tasks for Parquet file annotation."""
+    """Produce TaskGraph tasks for Parquet file annotation.
+
+    The names of the tasks start with `task_prefix`, so tasks of several
+    datasets can share a task graph. If `split_regions` is False, the whole
+    dataset is annotated in a single task.
+    """
+    if not split_regions:
+        return [task_graph.create_task(
+            f"{task_prefix}part_all",
+            process_parquet,
+            args=[loader.layout, raw_pipeline, grr.definition,
+                  output_dir, 0, None, args],
+            deps=[],
+        )]
 
     if "reference_genome" not in loader.meta:
         raise ValueError("No reference genome found in study metadata!")
@@ -159,7 +181,7 @@ def produce_schema2_annotation_tasks(  # pylint:disable=R0917
     tasks = []
     for idx, region in enumerate(regions):
         tasks.append(task_graph.create_task(
-            f"part_{region}",
+            f"{task_prefix}part_{region}",
             process_parquet,
             args=[loader.layout, raw_pipeline, grr.definition,
                   output_dir, idx, Region.from_str(region),
@@ -188,7 +210,8 @@ def produce_schema2_merging_tasks(
     sync_task: Task,
     reference_genome: ReferenceGenome,
     loader: ParquetLoader,
-    output_layout: Schema2DatasetLayout,
+    output_layout: Schema2DatasetLayout, *,
+    task_prefix: str = "",
 ) -> list[Task]:
     """Produce TaskGraph tasks for Parquet file merging."""
 
@@ -206,7 +229,8 @@ def produce_schema2_merging_tasks(
         if len(partitions) == 0:
             continue
         tasks.append(task_graph.create_task(
-            f"merge_parquet_files_summary_region_bin_{region_bin}",
+            f"{task_prefix}merge_parquet_files_summary_region_bin_"
+            f"{region_bin}",
             merge_partitions,
             args=[output_layout.summary, partitions, partition_descriptor],
             deps=[sync_task],
@@ -254,24 +278,56 @@ def write_new_meta(
     append_meta_to_parquet(output_layout.meta, meta_keys, meta_values)
 
 
-def process_parquet(  # pylint:disable=too-many-positional-arguments
-    input_layout: Schema2DatasetLayout,
+_WORKER_STATE = threading.local()
+
+
+def _get_worker_pipeline(
     pipeline_config: RawPipelineConfig,
     grr_definition: dict | None,
-    output_dir: str,
-    bucket_idx: int,
-    region: Region,
     args: dict[str, Any],
-) -> None:
-    """Process a Parquet dataset for annotation."""
-    loader = ParquetLoader(input_layout)
-    grr = build_genomic_resource_repository(definition=grr_definition)
+) -> tuple[GenomicResourceRepo, AnnotationPipeline]:
+    """Return the resources repository and annotation pipeline of a worker.
+
+    The pipeline is built on first use in a worker thread and is kept open
+    for the following annotation tasks with the same configuration.
+    """
+    key = json.dumps(
+        [pipeline_config, grr_definition,
+         args["work_dir"], args["allow_repeated_attributes"]],
+        sort_keys=True, default=str)
+    state = getattr(_WORKER_STATE, "pipeline", None)
+    if state is not None and state[0] == key:
+        return cast(
+            tuple[GenomicResourceRepo, AnnotationPipeline], state[1:])
+    if state is not None:
+        state[2].close()
 
+    grr = build_genomic_resource_repository(definition=grr_definition)
     pipeline = build_annotation_pipeline(
         pipeline_config, grr,
         allow_repeated_attributes=args["allow_repeated_attributes"],
         work_dir=pathlib.Path(args["work_dir"]),
     )
+    _WORKER_STATE.pipeline = (key, grr, pipeline)
+    return grr, pipeline
+
+
+def process_parquet(  # pylint:disable=too-many-positional-arguments
+    input_layout: Schema2DatasetLayout,
+    pipeline_config: RawPipelineConfig,
+    grr_definition: dict | None,
+    output_dir: str,
+    bucket_idx: int,
+    region: Region | None,
+    args: dict[str, Any],
+) -> None:
+    """Process a Parquet dataset for annotation.
+
+    If the region is None, the whole dataset is processed.
+    """
+    loader = ParquetLoader(input_layout)
+    grr, pipeline = _get_worker_pipeline(
+        pipeline_config, grr_definition, args)
 
     pipeline_config_old = loader.meta["annotation_pipeline"] \
         if loader.has_annotation else None
@@ -282,6 +338,13 @@ def process_parquet(  # pylint:disable=too-many-positional-arguments
 
     attributes_to_delete = []
 
+    annotation_cache = None
+    if args.get("annotation_cache") is not None:
+        # cached alleles carry the complete annotation of the new pipeline
+        annotation_cache = AnnotationCache(
+            args["annotation_cache"],
+            annotation_pipeline_fingerprint(pipeline))
+
     if pipeline_previous:
         pipeline = ReannotationPipeline(
             pipeline, pipeline_previous,
@@ -303,23 +366,38 @@ def process_parquet(  # pylint:disable=too-many-positional-arguments
     source: Source
     filters: list[Filter] = []
 
-    if args["batch_size"] <= 0:
+    # the worker pipeline stays open for the following tasks
+    if args["batch_size"] <= 0 and annotation_cache is None:
         source = Schema2SummaryVariantsSource(loader)
         filters.extend([
             DeleteAttributesFromVariantFilter(attributes_to_delete),
-            AnnotationPipelineVariantsFilter(pipeline),
+            AnnotationPipelineVariantsFilter(pipeline, close_pipeline=False),
             Schema2SummaryVariantConsumer(writer),
         ])
     else:
+        annotation_filter: Filter
+        if annotation_cache is None:
+            annotation_filter = AnnotationPipelineVariantsBatchFilter(
+                pipeline, close_pipeline=False)
+        else:
+            annotation_filter = CachedAnnotationVariantsBatchFilter(
+                pipeline, annotation_cache, close_pipeline=False)
         source = Schema2SummaryVariantsBatchSource(loader)
         filters.extend([
             DeleteAttributesFromVariantsBatchFilter(attributes_to_delete),
-            AnnotationPipelineVariantsBatchFilter(pipeline),
+            annotation_filter,
             Schema2SummaryVariantBatchConsumer(writer),
         ])
 
-    with PipelineProcessor(source, filters) as processor:
-        processor.process_region(region)
+    try:
+        with PipelineProcessor(source, filters) as processor:
+            if region is None:
+                processor.process()
+            else:
+                processor.process_region(region)
+    finally:
+        if pipeline_previous is not None:
+            pipeline_previous.close()
 
 
 def _build_argument_parser() -> argparse.ArgumentParser:
@@ -371,6 +449,12 @@ def _build_argument_parser() -> argparse.ArgumentParser:
         default=0,  # 0 = annotate iteratively, no batches
         help="Annotate in batches of",
     )
+    parser.add_argument(
+        "--annotation-cache",
+        default=None,
+        help="Local database file caching the annotation of alleles; "
+        "implies annotation in batches",
+    )
 
     context_providers_add_argparser_arguments(parser)
 
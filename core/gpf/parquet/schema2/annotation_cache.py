@@ -0,0 +1,134 @@
+"""Persistent cache of allele annotations shared between annotation runs."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle  # noqa: S403
+import sqlite3
+from collections.abc import Iterable
+from typing import Any
+
+from gain.annotation.annotation_pipeline import AnnotationPipeline
+
+# (chromosome, position, end position, reference, alternative, allele type)
+AlleleKey = tuple[str, int, int | None, str | None, str | None, str]
+
+
+def _db_key(key: AlleleKey) -> tuple[str, int, int, str, str, str]:
+    chrom, pos, end_pos, ref, alt, allele_type = key
+    return (
+        chrom, pos, end_pos if end_pos is not None else pos,
+        ref or "", alt or "", allele_type,
+    )
+
+
+def annotation_pipeline_fingerprint(pipeline: AnnotationPipeline) -> str:
+    """Return a fingerprint of an annotation pipeline.
+
+    The fingerprint covers the pipeline config and the versions of the
+    genomic resources used by the annotators.
+    """
+    content = {
+        "pipeline": pipeline.raw,
+        "resources": sorted({
+            resource.get_full_id()
+            for annotator in pipeline.annotators
+            for resource in annotator.get_info().resources
+        }),
+    }
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True, default=str).encode(),
+    ).hexdigest()
+
+
+class AnnotationCache:
+    """Annotation results of alleles stored in a local SQLite database.
+
+    Results are keyed by the fingerprint of the annotation pipeline and by
+    the location, reference, alternative and type of an allele; CNV alleles
+    have no reference and alternative and are told apart by type. The database
+    should be on a local file system; several processes can read and
+    populate it at the same time.
+    """
+
+    def __init__(self, filename: str, pipeline_fingerprint: str) -> None:
+        self.filename = filename
+        self.pipeline_fingerprint = pipeline_fingerprint
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Return the connection to the database; open it on first use."""
+        if self._connection is None:
+            dirname = os.path.dirname(self.filename)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            connection = sqlite3.connect(self.filename, timeout=600)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS allele_annotation ("
+                "pipeline TEXT NOT NULL, "
+                "chromosome TEXT NOT NULL, "
+                "position INTEGER NOT NULL, "
+                "end_position INTEGER NOT NULL, "
+                "reference TEXT NOT NULL, "
+                "alternative TEXT NOT NULL, "
+                "allele_type TEXT NOT NULL, "
+                "annotation BLOB NOT NULL, "
+                "PRIMARY KEY (pipeline, chromosome, position, "
+                "end_position, reference, alternative, allele_type)) "
+                "WITHOUT ROWID")
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def get(
+        self, keys: Iterable[AlleleKey],
+    ) -> dict[AlleleKey, dict[str, Any]]:
+        """Look up the annotation of alleles.
+
+        Alleles are looked up with a range query for each chromosome, so
+        batches of nearby alleles are looked up efficiently.
+        """
+        wanted = {_db_key(key): key for key in keys}
+        spans: dict[str, tuple[int, int]] = {}
+        for chrom, pos, *_ in wanted:
+            start, stop = spans.get(chrom, (pos, pos))
+            spans[chrom] = (min(start, pos), max(stop, pos))
+
+        result: dict[AlleleKey, dict[str, Any]] = {}
+        for chrom, (start, stop) in spans.items():
+            cursor = self.connection.execute(
+                "SELECT position, end_position, reference, alternative, "
+                "allele_type, annotation FROM allele_annotation "
+                "WHERE pipeline = ? AND chromosome = ? "
+                "AND position BETWEEN ? AND ?",
+                (self.pipeline_fingerprint, chrom, start, stop))
+            for pos, end_pos, ref, alt, allele_type, annotation in cursor:
+                key = wanted.get((chrom, pos, end_pos, ref, alt, allele_type))
+                if key is not None:
+                    result[key] = pickle.loads(annotation)
+        return result
+
+    def put(self, annotations: dict[AlleleKey, dict[str, Any]]) -> None:
+        """Store the annotation of alleles."""
+        if not annotations:
+            return
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO allele_annotation "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        self.pipeline_fingerprint, *_db_key(key),
+                        pickle.dumps(annotation),
+                    )
+                    for key, annotation in annotations.items()
+                ],
+            )
@@ -1,10 +1,12 @@
 import glob
+import itertools
 import os
 import pathlib
-from collections.abc import Generator, Iterable
+from collections.abc import Generator, Iterable, Iterator
 from typing import ClassVar
 
 import numpy as np
+import pyarrow as pa
 import yaml
 from gain.utils.regions import Region
 from pyarrow import compute as pc
@@ -28,6 +30,22 @@ class ParquetLoaderException(Exception):
     pass
 
 
+def variant_index_keys(table: pa.Table | pa.RecordBatch) -> np.ndarray:
+    """Combine bucket and summary indices into sortable int64 keys."""
+    bucket_index = table.column("bucket_index").to_numpy(
+        zero_copy_only=False).astype(np.int64)
+    summary_index = table.column("summary_index").to_numpy(
+        zero_copy_only=False).astype(np.int64)
+    return (bucket_index << 32) | summary_index
+
+
+def _group_starts(keys: np.ndarray) -> np.ndarray:
+    """Return the positions where a new key begins in sorted keys."""
+    if len(keys) == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+
 class Reader:
     """
     Helper class to incrementally fetch variants.
@@ -44,12 +62,16 @@ class Reader:
         if "summary_index" not in columns or "bucket_index" not in columns:
             raise ValueError
         self.pq_file = pq.ParquetFile(path)
+        self.columns = list(columns)
         self.iterator = self.pq_file.iter_batches(
-            columns=list(columns),
+            columns=self.columns,
             batch_size=batch_size,
         )
-        self.batch: list[dict] = []
+        self.buffer: pa.Table = self.pq_file.schema_arrow \
+            .empty_table().select(self.columns)
+        self.keys: np.ndarray = np.empty(0, dtype=np.int64)
         self.exhausted = False
+        self._groups: Iterator[list[dict]] | None = None
 
     def __del__(self) -> None:
         self.close()
@@ -59,45 +81,96 @@ class Reader:
 
     def __next__(self) -> list[dict]:
         """Return next batch of variants with matching indices."""
-        if self.exhausted:
-            raise StopIteration
-        result: list[dict] = []
-        initial_idx = self.current_idx
-        while self.current_idx == initial_idx:
-            result.append(self._pop())
-        return result
+        if self._groups is None:
+            self._groups = _iter_groups(self.iter_batches())
+        return next(self._groups)
 
-    @property
-    def current_idx(self) -> tuple[int, int]:
-        top = self._peek()
-        if top is None:
-            return (-1, -1)
-        return int(top["bucket_index"]), int(top["summary_index"])
+    def fill(self) -> bool:
+        """Read the next batch into the buffer.
 
-    def _advance(self) -> None:
+        Returns False when the file is exhausted.
+        """
         if self.exhausted:
-            return
+            return False
         try:
-            self.batch = next(self.iterator).to_pylist()
+            batch = next(self.iterator)
         except StopIteration:
             self.exhausted = True
+            return False
+        self.buffer = pa.concat_tables(
+            [self.buffer, pa.Table.from_batches([batch])])
+        self.keys = np.concatenate([self.keys, variant_index_keys(batch)])
+        return True
 
-    def _peek(self) -> dict | None:
-        if not self.batch:
-            self._advance()
-        if self.exhausted:
-            return None
-        return self.batch[0]
+    def take(self, bound: int | None = None) -> tuple[pa.Table, np.ndarray]:
+        """Remove and return buffered rows with keys less than the bound.
 
-    def _pop(self) -> dict:
-        if self._peek() is None:
-            raise IndexError
-        return self.batch.pop(0)
+        If the bound is None, all buffered rows are returned.
+        """
+        end = len(self.keys) if bound is None else int(
+            np.searchsorted(self.keys, bound, side="left"))
+        table, keys = self.buffer.slice(0, end), self.keys[:end]
+        self.buffer, self.keys = self.buffer.slice(end), self.keys[end:]
+        return table, keys
+
+    def iter_batches(self) -> Generator[pa.Table, None, None]:
+        """Iterate over tables of complete variants from this file."""
+        yield from _merge_batches((self,))
 
     def close(self) -> None:
         self.pq_file.close()
 
 
+def _merge_batches(
+    readers: tuple[Reader, ...],
+) -> Generator[pa.Table, None, None]:
+    """K-way merge of readers over whole Arrow batches.
+
+    Rows with a key below the smallest last buffered key of all active
+    readers are complete in every reader, so they are cut off from all
+    buffers with a binary search and emitted together, sorted by key. Each
+    emitted table holds all rows of the variants it contains.
+    """
+    while True:
+        for reader in readers:
+            while len(reader.keys) == 0 and reader.fill():
+                pass
+        active = [reader for reader in readers if not reader.exhausted]
+        bound = min(int(reader.keys[-1]) for reader in active) \
+            if active else None
+
+        parts = [reader.take(bound) for reader in readers]
+        count = sum(len(keys) for _, keys in parts)
+        if count == 0:
+            if bound is None:
+                return
+            for reader in active:
+                if reader.keys[-1] == bound:
+                    reader.fill()
+            continue
+
+        parts = [(table, keys) for table, keys in parts if len(keys) > 0]
+        if len(parts) == 1:
+            yield parts[0][0]
+        else:
+            table = pa.concat_tables([table for table, _ in parts])
+            keys = np.concatenate([keys for _, keys in parts])
+            yield table.take(np.argsort(keys, kind="stable"))
+        if bound is None:
+            return
+
+
+def _iter_groups(
+    batches: Iterable[pa.Table],
+) -> Generator[list[dict], None, None]:
+    """Split merged tables into lists of rows with matching indices."""
+    for table in batches:
+        rows = table.to_pylist()
+        bounds = [*_group_starts(variant_index_keys(table)), len(rows)]
+        for begin, end in itertools.pairwise(bounds):
+            yield rows[begin:end]
+
+
 class MultiReader:
     """
     Incrementally fetch variants from multiple files.
@@ -114,6 +187,7 @@ class MultiReader:
             Reader(path, columns, batch_size=batch_size)
             for path in dirs
         )
+        self._groups: Iterator[list[dict]] | None = None
 
     def __del__(self) -> None:
         self.close()
@@ -122,26 +196,17 @@ class MultiReader:
         return self
 
     def __next__(self) -> list[dict]:
-        if self._exhausted:
-            raise StopIteration
-        result = []
-        iteration_idx = self.current_idx
-        for reader in self.readers:
-            if not reader.exhausted:
-                while reader.current_idx == iteration_idx:
-                    result.extend(next(reader))
-        return result
+        if self._groups is None:
+            self._groups = _iter_groups(self.iter_batches())
+        return next(self._groups)
 
-    @property
-    def _exhausted(self) -> bool:
-        return all(reader.exhausted for reader in self.readers)
+    def iter_batches(self) -> Generator[pa.Table, None, None]:
+        """Iterate over merged tables of variants sorted by their indices.
 
-    @property
-    def current_idx(self) -> tuple[int, int]:
-        if self._exhausted:
-            return (-1, -1)
-        return min(reader.current_idx for reader in self.readers
-                   if not reader.exhausted)
+        Rows of a single variant from all files are always in the same
+        table and are adjacent.
+        """
+        yield from _merge_batches(self.readers)
 
     def close(self) -> None:
         for reader in self.readers:
@@ -304,51 +369,75 @@ class ParquetLoader:
             inheritance_in_members=inheritance_in_members,
         )
 
+    @staticmethod
+    def _region_mask(table: pa.Table, region: Region | None) -> np.ndarray:
+        """Return a mask of the table rows intersecting the region."""
+        if region is None:
+            return np.ones(len(table), dtype=bool)
+        mask = pc.equal(table.column("chromosome"), region.chrom)
+        if region.start is not None:
+            mask = pc.and_(mask, pc.fill_null(pc.greater_equal(
+                table.column("end_position"), region.start), fill_value=True))
+        if region.stop is not None:
+            mask = pc.and_(mask, pc.fill_null(pc.less_equal(
+                table.column("position"), region.stop), fill_value=True))
+        return np.asarray(
+            pc.fill_null(mask, fill_value=False).to_numpy(
+                zero_copy_only=False),
+            dtype=bool)
+
+    def _summary_batches(
+        self, summary_paths: list[str], region: Region | None,
+    ) -> Generator[tuple[np.ndarray, pa.Table, pa.Table], None, None]:
+        """Iterate over batches of summary variants in the region.
+
+        Yields the keys of the summary variants, the first allele record of
+        each summary variant and all allele records of the batch.
+        """
+        summary_reader = MultiReader(
+            summary_paths,
+            self.SUMMARY_COLUMNS,
+            batch_size=self.batch_size,
+        )
+        for table in summary_reader.iter_batches():
+            keys = variant_index_keys(table)
+            starts = _group_starts(keys)
+            first = table.take(starts)
+            selected = self._region_mask(first, region)
+            yield keys[starts][selected], first.filter(selected), table
+        summary_reader.close()
+
+    @staticmethod
+    def _unique_family_records(table: pa.Table) -> pa.Table:
+        """Drop repeated records of the same family variant.
+
+        Family variant records are stored once per allele; only the first
+        record of each family and summary variant is kept.
+        """
+        if len(table) == 0:
+            return table
+        rows = table.select(
+            ["bucket_index", "summary_index", "family_id"],
+        ).append_column("row", pa.array(np.arange(len(table))))
+        first_rows = rows.group_by(
+            ["bucket_index", "summary_index", "family_id"],
+            use_threads=False,
+        ).aggregate([("row", "min")]).column("row_min").to_numpy()
+        return table.take(np.sort(first_rows))
+
     def fetch_summary_variants(
         self, region: Region | None = None,
     ) -> Generator[SummaryVariant, None, None]:
         """Iterate over summary variants."""
-        region_filter = None
-        if region is not None:
-            region_filter = pc.field("chromosome") == region.chrom
-            if region.start is not None:
-                region_filter = (
-                    region_filter & (pc.field("end_position") >= region.start)
-                )
-            if region.stop is not None:
-                region_filter = (
-                    region_filter & (pc.field("position") <= region.stop)
-                )
-
         for summary_paths in self.get_summary_pq_filepaths(region):
             if not summary_paths:
                 continue
 
-            seen = set()
-            summary_reader = MultiReader(
-                summary_paths,
-                self.SUMMARY_COLUMNS,
-                batch_size=self.batch_size,
-            )
-
-            for alleles in summary_reader:
-                rec = alleles[0]
-                sv_idx = (rec["bucket_index"], rec["summary_index"])
-                if sv_idx in seen:
-                    continue
-
-                if region is not None \
-                    and not region.intersects(Region(rec["chromosome"],
-                                                     rec["position"],
-                                                     rec["end_position"])):
-                    continue
-
-                seen.add(sv_idx)
-
-                yield self._deserialize_summary_variant(
-                    rec["summary_variant_data"])
-
-            summary_reader.close()
+            for _, summary_records, _ in self._summary_batches(
+                    summary_paths, region):
+                for record in summary_records.column(
+                        "summary_variant_data").to_pylist():
+                    yield self._deserialize_summary_variant(record)
 
     def fetch_variants(
         self, region: Region | None = None,
@@ -361,45 +450,79 @@ class ParquetLoader:
             for path in summary_paths:
                 family_paths.extend(self.get_family_pq_filepaths(path))
 
-            summary_reader = MultiReader(summary_paths,
-                                         self.SUMMARY_COLUMNS,
-                                         batch_size=self.batch_size)
             family_reader = MultiReader(family_paths,
                                         self.FAMILY_COLUMNS,
                                         batch_size=self.batch_size)
+            yield from self._fetch_batch_variants(
+                summary_paths, family_reader, region)
+            family_reader.close()
 
-            for alleles in summary_reader:
-                rec = alleles[0]
-                if region is not None \
-                    and not region.intersects(Region(rec["chromosome"],
-                                                     rec["position"],
-                                                     rec["end_position"])):
+    def _fetch_batch_variants(
+        self,
+        summary_paths: list[str],
+        family_reader: MultiReader,
+        region: Region | None,
+    ) -> Generator[tuple[SummaryVariant, list[FamilyVariant]], None, None]:
+        family_batches = family_reader.iter_batches()
+        family_tables: list[pa.Table] = []
+        family_keys: list[np.ndarray] = []
+        buffered_key = -1
+        family_exhausted = False
+
+        for summary_keys, summary_records, summary_table in \
+                self._summary_batches(summary_paths, region):
+            if len(summary_table) == 0:
+                continue
+            last_key = int(variant_index_keys(summary_table)[-1])
+            while not family_exhausted and buffered_key < last_key:
+                family_table = next(family_batches, None)
+                if family_table is None:
+                    family_exhausted = True
+                    break
+                if len(family_table) == 0:
+                    continue
+                keys = variant_index_keys(family_table)
+                buffered_key = int(keys[-1])
+                if len(summary_keys) == 0 and buffered_key <= last_key:
+                    # none of the summary variants of the batch is in the
+                    # region, so their family records are not kept
                     continue
+                family_tables.append(family_table)
+                family_keys.append(keys)
+
+            keys = np.concatenate(family_keys) \
+                if family_keys else np.empty(0, dtype=np.int64)
+            end = int(np.searchsorted(keys, last_key, side="right"))
+            family_table = pa.concat_tables(family_tables) \
+                if family_tables else None
+            family_tables = [family_table.slice(end)] \
+                if family_table is not None and end < len(family_table) \
+                else []
+            family_keys = [keys[end:]] if end < len(keys) else []
+            if len(summary_keys) == 0:
+                continue
 
-                sv_idx = (rec["bucket_index"], rec["summary_index"])
-                sv = self._deserialize_summary_variant(
-                    rec["summary_variant_data"])
-
-                fvs: list[dict] = []
-                try:
-                    while sv_idx > family_reader.current_idx:
-                        next(family_reader)
-                    fvs = next(family_reader)
-                except StopIteration:
-                    pass
-
-                seen = set()
-                to_yield = []
-                for fv in fvs:
-                    fv_id = (fv["summary_index"], fv["family_id"])
-                    if fv_id not in seen:
-                        seen.add(fv_id)
-                        to_yield.append(self._deserialize_family_variant(
-                            fv["family_variant_data"], sv))
-                yield (sv, to_yield)
-
-            summary_reader.close()
-            family_reader.close()
+            if family_table is not None:
+                family_table = self._unique_family_records(
+                    family_table.slice(0, end))
+                family_records = family_table.column(
+                    "family_variant_data").to_pylist()
+                unique_keys = variant_index_keys(family_table)
+            else:
+                family_records = []
+                unique_keys = np.empty(0, dtype=np.int64)
+
+            begins = np.searchsorted(unique_keys, summary_keys, side="left")
+            ends = np.searchsorted(unique_keys, summary_keys, side="right")
+            for record, begin, end in zip(
+                    summary_records.column(
+                        "summary_variant_data").to_pylist(),
+                    begins, ends, strict=True):
+                sv = self._deserialize_summary_variant(record)
+                yield (sv, [
+                    self._deserialize_family_variant(fv_record, sv)
+                    for fv_record in family_records[begin:end]
+                ])
 
     def fetch_family_variants(
         self, region: Region | None = None,
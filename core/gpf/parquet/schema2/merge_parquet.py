@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import pathlib
+from collections.abc import Sequence
 from typing import Literal
 
 import duckdb
@@ -13,6 +14,17 @@ from gpf.parquet.partition_descriptor import PartitionDescriptor
 
 logger = logging.getLogger(__name__)
 
+# Sort orders of merged variants files. Readers of the variants (e.g.
+# `ParquetLoader`) expect them ordered by bucket and summary index; within a
+# bucket the summary index follows the variants position, so sorted files
+# have narrow row group statistics on `position` and `summary_index`.
+VARIANTS_SORT_COLUMNS: dict[str, tuple[str, ...]] = {
+    "summary": ("bucket_index", "summary_index", "allele_index"),
+    "family": (
+        "bucket_index", "summary_index", "allele_index", "family_index",
+    ),
+}
+
 
 def _collect_input_parquet_files(
     parquets_dir: str,
@@ -45,18 +57,29 @@ def merge_parquets(
     *,
     delete_in_files: bool = True,
     row_group_size: int = 50_000,
+    sort_by: Sequence[str] | None = None,
+    threads: int = 1,
+    memory_limit: str = "4G",
 ) -> None:
-    """Merge multiple parquet files into a single parquet file."""
+    """Merge multiple parquet files into a single parquet file.
+
+    If `sort_by` columns are passed, the merged rows are sorted by them.
+    DuckDB writes bloom filters for the dictionary encoded columns (e.g.
+    `family_id`) of the merged file.
+    """
     if len(in_files) == 0:
         raise OSError("no input files provided for merging")
     assert len(in_files) > 0
 
     try:
         with duckdb.connect() as con:
-            con.execute("SET memory_limit = '4G';")
-            con.execute("SET threads = 1;")
+            con.execute(f"SET memory_limit = '{memory_limit}';")
+            con.execute(f"SET threads = {int(threads)};")
             con.execute(f"SET temp_directory = '{out_file}.tmp';")
-            con.from_parquet(in_files).to_parquet(
+            rel = con.from_parquet(in_files)
+            if sort_by:
+                rel = rel.order(", ".join(f'"{col}"' for col in sort_by))
+            rel.to_parquet(
                 out_file,
                 row_group_size=row_group_size,
                 overwrite=True,
@@ -84,8 +107,15 @@ def merge_parquet_directory(
     variants_type: Literal["summary", "family"] | None = None,
     row_group_size: int = 50_000,
     delete_in_files: bool = True,
+    sort: bool = False,
+    threads: int = 1,
+    memory_limit: str = "4G",
 ) -> None:
-    """Merge all parquet files from parquets_dir into a single parquet file."""
+    """Merge all parquet files from parquets_dir into a single parquet file.
+
+    If `sort` is set, the merged variants are sorted by the
+    `VARIANTS_SORT_COLUMNS` of the `variants_type`.
+    """
     if isinstance(parquets_dir, pathlib.Path):
         parquets_dir = str(parquets_dir)
 
@@ -101,10 +131,18 @@ def merge_parquet_directory(
         logger.debug(
             "Merging %d files in %s", len(parquet_files), parquets_dir,
         )
+        sort_by = None
+        if sort:
+            if variants_type is None:
+                raise ValueError("sorting requires variants type")
+            sort_by = VARIANTS_SORT_COLUMNS[variants_type]
         merge_parquets(
             parquet_files, output_parquet_filename,
             row_group_size=row_group_size,
-            delete_in_files=delete_in_files)
+            delete_in_files=delete_in_files,
+            sort_by=sort_by,
+            threads=threads,
+            memory_limit=memory_limit)
 
 
 @deprecated(
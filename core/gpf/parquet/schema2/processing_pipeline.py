@@ -5,7 +5,7 @@ import logging
 import traceback
 from collections.abc import Iterable, Sequence
 from types import TracebackType
-from typing import cast
+from typing import Any, cast
 
 from gain.annotation.annotate_utils import stringify
 from gain.annotation.annotation_pipeline import (
@@ -20,9 +20,16 @@ from gain.annotation.processing_pipeline import (
 from gain.effect_annotation.effect import AlleleEffects
 from gain.utils.processing_pipeline import Filter, Source
 from gain.utils.regions import Region
+from pyarrow import dataset as ds
 
+from gpf.parquet.schema2.annotation_cache import AlleleKey, AnnotationCache
 from gpf.parquet.schema2.loader import ParquetLoader
-from gpf.variants.variant import SummaryAllele, SummaryVariant
+from gpf.parquet.schema2.serializers import VariantsDataSerializer
+from gpf.variants.variant import (
+    SummaryAllele,
+    SummaryVariant,
+    SummaryVariantFactory,
+)
 from gpf.variants_loaders.raw.loader import (
     FullVariant,
     VariantsGenotypesLoader,
@@ -35,8 +42,12 @@ class AnnotationPipelineVariantsFilterMixin:
     """Mixin for annotation pipeline filters."""
     # pylint: disable=too-few-public-methods
 
-    def __init__(self, annotation_pipeline: AnnotationPipeline) -> None:
+    def __init__(
+        self, annotation_pipeline: AnnotationPipeline, *,
+        close_pipeline: bool = True,
+    ) -> None:
         self.annotation_pipeline = annotation_pipeline
+        self.close_pipeline = close_pipeline
         self._annotation_internal_attributes = {
             attribute.name
             for attribute in self.annotation_pipeline.get_attributes()
@@ -127,8 +138,11 @@ class AnnotationPipelineVariantsFilter(
 ):
     """Annotation pipeline batched variants filter."""
 
-    def __init__(self, annotation_pipeline: AnnotationPipeline) -> None:
-        super().__init__(annotation_pipeline)
+    def __init__(
+        self, annotation_pipeline: AnnotationPipeline, *,
+        close_pipeline: bool = True,
+    ) -> None:
+        super().__init__(annotation_pipeline, close_pipeline=close_pipeline)
         self.annotatables_filter = AnnotationPipelineAnnotatablesFilter(
             annotation_pipeline)
 
@@ -138,7 +152,8 @@ class AnnotationPipelineVariantsFilter(
         exc_value: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> bool:
-        self.annotation_pipeline.close()
+        if self.close_pipeline:
+            self.annotation_pipeline.close()
         if exc_type is not None:
             logger.error(
                 "exception during annotation: %s, %s, %s",
@@ -173,8 +188,11 @@ class AnnotationPipelineVariantsBatchFilter(
 ):
     """Annotation pipeline batched variants filter."""
 
-    def __init__(self, annotation_pipeline: AnnotationPipeline) -> None:
-        super().__init__(annotation_pipeline)
+    def __init__(
+        self, annotation_pipeline: AnnotationPipeline, *,
+        close_pipeline: bool = True,
+    ) -> None:
+        super().__init__(annotation_pipeline, close_pipeline=close_pipeline)
         self.annotatables_filter = AnnotationPipelineAnnotatablesBatchFilter(
             annotation_pipeline)
 
@@ -184,7 +202,8 @@ class AnnotationPipelineVariantsBatchFilter(
         exc_value: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> bool:
-        self.annotation_pipeline.close()
+        if self.close_pipeline:
+            self.annotation_pipeline.close()
         if exc_type is not None:
             logger.error(
                 "exception during annotation: %s, %s, %s",
@@ -224,6 +243,195 @@ class AnnotationPipelineVariantsBatchFilter(
         return result
 
 
+def _allele_key(allele: SummaryAllele) -> AlleleKey:
+    # CNV alleles have no reference and alternative; the allele type tells
+    # a deletion from a duplication with the same breakpoints
+    return (
+        allele.chromosome, allele.position, allele.end_position,
+        allele.reference, allele.alternative, allele.allele_type.name,
+    )
+
+
+class StoredAnnotationVariantsBatchFilter(Filter):
+    """Reuse the annotation of alleles stored in summary parquet files.
+
+    Alleles of a batch that are found in the stored summary variants get
+    their stored annotation attributes and effects. Variants with alleles
+    that are not stored are annotated by the wrapped annotation filter.
+    """
+
+    def __init__(
+        self,
+        annotation_filter: AnnotationPipelineVariantsBatchFilter,
+        summary_filenames: Sequence[str],
+    ) -> None:
+        self.annotation_filter = annotation_filter
+        self.summary_filenames = list(summary_filenames)
+        self.attributes = [
+            attribute.name
+            for attribute in
+            annotation_filter.annotation_pipeline.get_attributes()
+            if not attribute.internal
+        ]
+        self.serializer = VariantsDataSerializer.build_serializer()
+        self._dataset: ds.Dataset | None = None
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> bool:
+        return self.annotation_filter.__exit__(exc_type, exc_value, exc_tb)
+
+    def _stored_alleles(
+        self, data: Sequence[FullVariant],
+    ) -> dict[AlleleKey, SummaryAllele]:
+        """Load the stored alleles in the region of a batch of variants."""
+        if not self.summary_filenames:
+            return {}
+        if self._dataset is None:
+            self._dataset = ds.dataset(self.summary_filenames, format="parquet")
+
+        spans: dict[str, tuple[int, int]] = {}
+        for variant in data:
+            summary_variant = variant.summary_variant
+            start, stop = spans.get(
+                summary_variant.chromosome,
+                (summary_variant.position, summary_variant.position))
+            spans[summary_variant.chromosome] = (
+                min(start, summary_variant.position),
+                max(stop, summary_variant.position))
+
+        result: dict[AlleleKey, SummaryAllele] = {}
+        for chrom, (start, stop) in spans.items():
+            table = self._dataset.to_table(
+                columns=["summary_variant_data"],
+                filter=(ds.field("chromosome") == chrom)
+                & (ds.field("position") >= start)
+                & (ds.field("position") <= stop),
+            )
+            # the summary variant data is repeated for each stored allele
+            for record in set(
+                    table.column("summary_variant_data").to_pylist()):
+                summary_variant = \
+                    SummaryVariantFactory.summary_variant_from_records(
+                        self.serializer.deserialize_summary_record(record))
+                for allele in summary_variant.alt_alleles:
+                    result[_allele_key(allele)] = allele
+        return result
+
+    def filter(
+        self, data: Sequence[FullVariant],
+    ) -> Sequence[FullVariant]:
+        """Annotate variants in batches reusing the stored annotation."""
+        stored = self._stored_alleles(data)
+        to_annotate = []
+        for variant in data:
+            alleles = variant.summary_variant.alt_alleles
+            if not all(_allele_key(sa) in stored for sa in alleles):
+                to_annotate.append(variant)
+                continue
+            for summary_allele in alleles:
+                stored_allele = stored[_allele_key(summary_allele)]
+                summary_allele.update_attributes({
+                    name: stored_allele.get_attribute(name)
+                    for name in self.attributes
+                })
+                if stored_allele.effects is not None:
+                    # pylint: disable=protected-access
+                    summary_allele._effects = \
+                        stored_allele.effects  # noqa: SLF001
+        if to_annotate:
+            self.annotation_filter.filter(to_annotate)
+        logger.debug(
+            "reused stored annotation of %s out of %s variants",
+            len(data) - len(to_annotate), len(data))
+        return data
+
+
+class CachedAnnotationVariantsBatchFilter(
+    AnnotationPipelineVariantsBatchFilter,
+):
+    """Annotation pipeline batched variants filter with an annotation cache.
+
+    Alleles of a batch are looked up in the cache first. Variants with
+    alleles that are not in the cache are annotated by the pipeline and the
+    annotation of their alleles is stored in the cache.
+    """
+
+    def __init__(
+        self,
+        annotation_pipeline: AnnotationPipeline,
+        cache: AnnotationCache, *,
+        close_pipeline: bool = True,
+    ) -> None:
+        super().__init__(annotation_pipeline, close_pipeline=close_pipeline)
+        self.cache = cache
+        attributes = annotation_pipeline.get_attributes()
+        self._cached_attributes = [
+            attribute.name for attribute in attributes
+            if not attribute.internal
+        ]
+        self._cache_effects = any(
+            attribute.name == "allele_effects" for attribute in attributes)
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> bool:
+        self.cache.close()
+        return super().__exit__(exc_type, exc_value, exc_tb)
+
+    def _allele_annotation(
+        self, summary_allele: SummaryAllele,
+    ) -> dict[str, Any]:
+        result = {
+            name: summary_allele.get_attribute(name)
+            for name in self._cached_attributes
+        }
+        if self._cache_effects and summary_allele.effects is not None:
+            result["allele_effects"] = summary_allele.effects
+        return result
+
+    def filter(
+        self, data: Sequence[FullVariant],
+    ) -> Sequence[FullVariant]:
+        """Annotate variants in batches reusing the cached annotation."""
+        cached = self.cache.get(
+            _allele_key(summary_allele)
+            for variant in data
+            for summary_allele in variant.summary_variant.alt_alleles)
+        to_annotate = []
+        for variant in data:
+            alleles = variant.summary_variant.alt_alleles
+            if not all(_allele_key(sa) in cached for sa in alleles):
+                to_annotate.append(variant)
+                continue
+            for summary_allele in alleles:
+                assert isinstance(summary_allele, SummaryAllele)
+                self._apply_annotation_to_allele(
+                    summary_allele,
+                    Annotation(
+                        summary_allele.get_annotatable(),
+                        dict(cached[_allele_key(summary_allele)])),
+                )
+        if to_annotate:
+            super().filter(to_annotate)
+            self.cache.put({
+                _allele_key(summary_allele):
+                    self._allele_annotation(summary_allele)
+                for variant in to_annotate
+                for summary_allele in variant.summary_variant.alt_alleles
+            })
+        logger.debug(
+            "reused cached annotation of %s out of %s variants",
+            len(data) - len(to_annotate), len(data))
+        return data
+
+
 class VariantsLoaderSource(Source):
     """A source that can fetch variants from a loader."""
 
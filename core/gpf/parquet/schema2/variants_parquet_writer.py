@@ -4,6 +4,7 @@ import functools
 import logging
 import os
 import pathlib
+import resource
 import time
 import traceback
 from collections.abc import Sequence
@@ -42,11 +43,29 @@ from gpf.variants_loaders.raw.loader import (
 logger = logging.getLogger(__name__)
 
 
+def _estimate_row_bytes(schema: pa.Schema) -> int:
+    """Estimate the in-memory size of a row without the variant blob."""
+    result = 0
+    for field in schema:
+        try:
+            result += max(field.type.bit_width // 8, 1)
+        except ValueError:
+            # variable width values: offsets plus a short value
+            result += 16
+    return result
+
+
 class ContinuousParquetFileWriter:
     """A continous parquet writer.
 
     Class that automatically writes to a given parquet file when supplied
-    enough data. Automatically dumps leftover data when closing into the file
+    enough data. Automatically dumps leftover data when closing into the file.
+
+    Rows are accumulated in a list of values for each column and converted
+    to Arrow arrays when a row group is written. A row group is written
+    when the buffer reaches `row_group_size` rows or, if `row_group_bytes`
+    is set, when the estimated size of the buffered rows reaches
+    `row_group_bytes` bytes.
     """
 
     DEFAULT_COMPRESSION = "SNAPPY"
@@ -56,6 +75,7 @@ class ContinuousParquetFileWriter:
         filepath: str,
         allele_serializer: AlleleParquetSerializer,
         row_group_size: int = 10_000,
+        row_group_bytes: int | None = None,
     ) -> None:
 
         self.filepath = filepath
@@ -86,43 +106,71 @@ class ContinuousParquetFileWriter:
             write_page_index=True,
         )
         self.row_group_size = row_group_size
+        self.row_group_bytes = row_group_bytes
+        self._row_bytes = _estimate_row_bytes(self.schema)
+        self.rows_written = 0
+        self.estimated_bytes = 0
         self._data: dict[str, list]
+        self._columns: list[tuple[str, list]]
+        self._data_bytes = 0
         self._data_reset()
 
     def _data_reset(self) -> None:
         self._data = {name: [] for name in self.schema.names}
+        self._columns = list(self._data.items())
+        self._data_bytes = 0
 
     def size(self) -> int:
         return len(self._data["bucket_index"])
 
+    def _is_full(self) -> bool:
+        if self.size() >= self.row_group_size:
+            return True
+        return self.row_group_bytes is not None \
+            and self._data_bytes >= self.row_group_bytes
+
     def _flush(self) -> None:
         if self.size() == 0:
             return
 
-        batch = pa.RecordBatch.from_pydict(self._data, self.schema)
-        table = pa.Table.from_batches([batch], self.schema)
-        self._writer.write_table(table)
+        batch = pa.RecordBatch.from_arrays(
+            [
+                pa.array(self._data[field.name], type=field.type)
+                for field in self.schema
+            ],
+            schema=self.schema,
+        )
+        self._writer.write_batch(batch, row_group_size=batch.num_rows)
+        self.rows_written += batch.num_rows
+        self.estimated_bytes += self._data_bytes
 
     def append_allele(
         self, allele: SummaryAllele | FamilyAllele,
         variant_blob: bytes,
     ) -> None:
         """Append the data for entire allele to the correct partition file."""
-        assert self._data is not None
+        self.append_alleles([allele], variant_blob)
 
-        data = self.serializer.build_allele_record_dict(
-            allele, variant_blob,
-        )
-
-        for k, v in self._data.items():
-            v.append(data[k])
+    def append_alleles(
+        self, alleles: Sequence[SummaryAllele | FamilyAllele],
+        variant_blob: bytes,
+    ) -> None:
+        """Append the data of alleles sharing a variant blob."""
+        row_bytes = self._row_bytes + len(variant_blob)
+        for allele in alleles:
+            data = self.serializer.build_allele_record_dict(
+                allele, variant_blob,
+            )
+            for name, values in self._columns:
+                values.append(data[name])
+            self._data_bytes += row_bytes
 
-        if self.size() >= self.row_group_size:
-            logger.debug(
-                "parquet writer %s create summary batch at len %s",
-                self.filepath, self.size())
-            self._flush()
-            self._data_reset()
+            if self._is_full():
+                logger.debug(
+                    "parquet writer %s create batch at len %s (%s bytes)",
+                    self.filepath, self.size(), self._data_bytes)
+                self._flush()
+                self._data_reset()
 
     def close(self) -> None:
         """Close the parquet writer and write any remaining data."""
@@ -131,6 +179,7 @@ class ContinuousParquetFileWriter:
             self.filepath, self.size())
 
         self._flush()
+        self._data_reset()
         self._writer.close()
 
 
@@ -146,6 +195,7 @@ class VariantsParquetWriter(AbstractContextManager):
         blob_serializer: VariantsDataSerializer | None = None,
         bucket_index: int = 1,
         row_group_size: int = 10_000,
+        row_group_bytes: int | None = None,
         include_reference: bool = False,
     ) -> None:
         self.out_dir = str(out_dir)
@@ -154,11 +204,14 @@ class VariantsParquetWriter(AbstractContextManager):
         assert self.bucket_index < 1_000_000, "bad bucket index"
 
         self.row_group_size = row_group_size
+        self.row_group_bytes = row_group_bytes
 
         self.include_reference = include_reference
 
         self.start = time.time()
         self.data_writers: dict[str, ContinuousParquetFileWriter] = {}
+        self._partition_writers: dict[
+            tuple, ContinuousParquetFileWriter] = {}
         assert isinstance(partition_descriptor, PartitionDescriptor)
         self.partition_descriptor = partition_descriptor
         self.annotation_schema = annotation_schema
@@ -189,11 +242,8 @@ class VariantsParquetWriter(AbstractContextManager):
         return exc_type is None
 
     def _build_family_filename(
-        self, allele: FamilyAllele, *,
-        seen_as_denovo: bool,
+        self, partition: list[tuple[str, str]],
     ) -> str:
-        partition = self.partition_descriptor.family_partition(
-            allele, seen_as_denovo=seen_as_denovo)
         partition_directory = self.partition_descriptor.partition_directory(
             fs_utils.join(self.out_dir, "family"), partition)
         partition_filename = self.partition_descriptor.partition_filename(
@@ -201,48 +251,58 @@ class VariantsParquetWriter(AbstractContextManager):
         return fs_utils.join(partition_directory, partition_filename)
 
     def _build_summary_filename(
-        self, allele: SummaryAllele, *,
-        seen_as_denovo: bool,
+        self, partition: list[tuple[str, str]],
     ) -> str:
-        partition = self.partition_descriptor.summary_partition(
-            allele, seen_as_denovo=seen_as_denovo)
         partition_directory = self.partition_descriptor.partition_directory(
             fs_utils.join(self.out_dir, "summary"), partition)
         partition_filename = self.partition_descriptor.partition_filename(
             "summary", partition, self.bucket_index)
         return fs_utils.join(partition_directory, partition_filename)
 
-    def _get_bin_writer_family(
-        self, allele: FamilyAllele, *,
-        seen_as_denovo: bool,
+    def _get_writer(
+        self, filename: str,
+        serializer: AlleleParquetSerializer,
     ) -> ContinuousParquetFileWriter:
-        filename = self._build_family_filename(
-            allele, seen_as_denovo=seen_as_denovo)
-
         if filename not in self.data_writers:
             self.data_writers[filename] = ContinuousParquetFileWriter(
                 filename,
-                self.family_serializer,
+                serializer,
                 row_group_size=self.row_group_size,
+                row_group_bytes=self.row_group_bytes,
             )
-
         return self.data_writers[filename]
 
+    def _get_bin_writer_family(
+        self, allele: FamilyAllele, *,
+        seen_as_denovo: bool,
+    ) -> ContinuousParquetFileWriter:
+        partition = self.partition_descriptor.family_partition(
+            allele, seen_as_denovo=seen_as_denovo)
+        # writers are looked up by partition to avoid building file names
+        # for each allele
+        key = ("family", *partition)
+        writer = self._partition_writers.get(key)
+        if writer is None:
+            writer = self._get_writer(
+                self._build_family_filename(partition),
+                self.family_serializer)
+            self._partition_writers[key] = writer
+        return writer
+
     def _get_bin_writer_summary(
         self, allele: SummaryAllele, *,
         seen_as_denovo: bool,
     ) -> ContinuousParquetFileWriter:
-        filename = self._build_summary_filename(
+        partition = self.partition_descriptor.summary_partition(
             allele, seen_as_denovo=seen_as_denovo)
-
-        if filename not in self.data_writers:
-            self.data_writers[filename] = ContinuousParquetFileWriter(
-                filename,
-                self.summary_serializer,
-                row_group_size=self.row_group_size,
-            )
-
-        return self.data_writers[filename]
+        key = ("summary", *partition)
+        writer = self._partition_writers.get(key)
+        if writer is None:
+            writer = self._get_writer(
+                self._build_summary_filename(partition),
+                self.summary_serializer)
+            self._partition_writers[key] = writer
+        return writer
 
     def _calc_sj_base_index(self, summary_index: int) -> int:
         return (
@@ -323,6 +383,8 @@ class VariantsParquetWriter(AbstractContextManager):
 
             family_alleles.extend(fv.alt_alleles)
 
+            writer_alleles: dict[
+                ContinuousParquetFileWriter, list[FamilyAllele]] = {}
             for aa in family_alleles:
                 fa = cast(FamilyAllele, aa)
                 seen_in_status[fa.allele_index] = functools.reduce(
@@ -349,12 +411,15 @@ class VariantsParquetWriter(AbstractContextManager):
                     family_bin_writer.serializer,
                     FamilyAlleleParquetSerializer)
 
-                family_bin_writer.append_allele(
-                    fa, family_variant_blob)
+                writer_alleles.setdefault(family_bin_writer, []).append(fa)
 
                 family_variants_count[fa.allele_index] += 1
                 num_fam_alleles_written += 1
 
+            for family_bin_writer, alleles in writer_alleles.items():
+                family_bin_writer.append_alleles(
+                    alleles, family_variant_blob)
+
         # don't store summary alleles withouth family ones
         if num_fam_alleles_written > 0:
             summary_variant.summary_index = summary_index
@@ -370,9 +435,24 @@ class VariantsParquetWriter(AbstractContextManager):
         return family_index, num_fam_alleles_written
 
     def close(self) -> None:
+        """Close the parquet files and log the write statistics."""
         for bin_writer in self.data_writers.values():
             bin_writer.close()
 
+        elapsed = time.time() - self.start
+        rows = sum(w.rows_written for w in self.data_writers.values())
+        size = sum(w.estimated_bytes for w in self.data_writers.values())
+        # peak resident memory of the whole process since it started, in
+        # kilobytes on Linux; not specific to this bucket
+        peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        logger.info(
+            "bucket %s: wrote %d rows (estimated %.1f MB in memory) to %d "
+            "parquet files in %.2f sec (%.0f rows/sec); "
+            "process peak RSS %.1f MB",
+            self.bucket_index, rows, size / 1_000_000,
+            len(self.data_writers), elapsed, rows / max(elapsed, 1e-6),
+            peak_memory / 1_000)
+
     def write_summary_variant(
         self, summary_variant: SummaryVariant,
         sj_base_index: int | None = None,
@@ -394,12 +474,16 @@ class VariantsParquetWriter(AbstractContextManager):
         else:
             stored_alleles = summary_variant.alt_alleles
 
+        writer_alleles: dict[
+            ContinuousParquetFileWriter, list[SummaryAllele]] = {}
         for summary_allele in stored_alleles:
             seen_as_denovo = summary_allele.get_attribute("seen_as_denovo")
             summary_writer = self._get_bin_writer_summary(
                 summary_allele, seen_as_denovo=seen_as_denovo)
-            summary_writer.append_allele(
-                summary_allele, summary_blobs_json)
+            writer_alleles.setdefault(summary_writer, []).append(
+                summary_allele)
+        for summary_writer, alleles in writer_alleles.items():
+            summary_writer.append_alleles(alleles, summary_blobs_json)
 
 
 class Schema2VariantConsumer(Filter):
@@ -123,6 +123,8 @@ class FamiliesData(Mapping[str, Family]):
         self.persons: dict[tuple[str, str], Person] = {}
         self._broken: dict[str, Family] = {}
         self._real_persons: dict[tuple[str, str], Person] | None = None
+        # index of the families built by `get_families_index`
+        self.families_index: Any = None
 
     def __deepcopy__(self, memo: dict[int, Any]) -> FamiliesData:
         families_data = FamiliesData()
@@ -143,6 +145,7 @@ class FamiliesData(Mapping[str, Family]):
         self.persons = {}
         self._broken = {}
         self._real_persons = None
+        self.families_index = None
 
     def redefine(self) -> None:
         """Rebuild all families."""
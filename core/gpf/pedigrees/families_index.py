@@ -0,0 +1,133 @@
+"""Index of families data for tag queries and pedigree downloads."""
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+
+from gpf.pedigrees.families_data import FamiliesData
+from gpf.pedigrees.family import FamilyTag
+from gpf.pedigrees.family_tag_builder import check_tag
+from gpf.pedigrees.loader import FamiliesLoader
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(
+        f"Unserializable object {obj} of type {type(obj)}",
+    )
+
+
+class FamiliesIndex:
+    """Precomputed lookups over the families of a study.
+
+    The pedigree of all families is rendered as TSV once and every family
+    keeps the range of its lines, so the pedigree of any subset of
+    families is assembled from the rendered lines. Families carrying a tag
+    are collected on the first query for that tag. The JSON details of a
+    family are encoded on first use and kept for the following requests.
+    """
+
+    def __init__(self, families: FamiliesData) -> None:
+        self._families = families
+        ped_df = families.ped_df
+        self._ped_df = ped_df
+
+        tsv = FamiliesLoader.to_tsv(families)
+        self._lines = [f"{line}\n" for line in tsv.rstrip("\n").split("\n")]
+
+        self._family_rows: dict[str, tuple[int, int]] = {}
+        for row, family_id in enumerate(ped_df["family_id"], start=1):
+            start, _ = self._family_rows.get(family_id, (row, row))
+            self._family_rows[family_id] = (start, row + 1)
+
+        self._tagged: dict[FamilyTag, frozenset[str]] = {}
+        self._details_json: dict[str, str] = {}
+
+    def is_built_for(self, families: FamiliesData) -> bool:
+        return self._families is families \
+            and self._ped_df is families.ped_df
+
+    def tagged_family_ids(self, tag: FamilyTag) -> frozenset[str]:
+        """Return the ids of families carrying a tag."""
+        result = self._tagged.get(tag)
+        if result is None:
+            result = frozenset(
+                family_id
+                for family_id, family in self._families.items()
+                if check_tag(family, tag)
+            )
+            self._tagged[tag] = result
+        return result
+
+    def query_tags(
+        self, *,
+        or_mode: bool,
+        include_tags: set[FamilyTag],
+        exclude_tags: set[FamilyTag],
+    ) -> list[str]:
+        """Return ids of families passing a tags query.
+
+        The query has the semantics of `check_family_tags_query`.
+        """
+        all_families = frozenset(self._families.keys())
+        included = [self.tagged_family_ids(tag) for tag in include_tags]
+        not_excluded = [
+            all_families - self.tagged_family_ids(tag)
+            for tag in exclude_tags
+        ]
+        if or_mode:
+            selected = frozenset().union(*included, *not_excluded)
+        else:
+            selected = all_families.intersection(*included, *not_excluded)
+        return [
+            family_id for family_id in self._families
+            if family_id in selected
+        ]
+
+    def tsv_lines(self, family_ids: Iterable[str] | None = None) -> list[str]:
+        """Return the pedigree TSV lines of the specified families.
+
+        If no families are specified, returns the pedigree of all families.
+        """
+        if family_ids is None:
+            return list(self._lines)
+        result = [self._lines[0]]
+        for family_id in family_ids:
+            start, end = self._family_rows[family_id]
+            result.extend(self._lines[start:end])
+        return result
+
+    def family_details_json(self, family_id: str) -> str:
+        """Return the JSON encoded details of a family and its members."""
+        result = self._details_json.get(family_id)
+        if result is None:
+            family = self._families[family_id]
+            details = family.to_json()
+            details["members"] = [
+                member.to_json() for member in family.members_in_order
+            ]
+            result = json.dumps(
+                details, default=_json_default,
+                separators=(",", ":"), allow_nan=False,
+            )
+            self._details_json[family_id] = result
+        return result
+
+
+def get_families_index(families: FamiliesData) -> FamiliesIndex:
+    """Return the index of a families data; build it on first use.
+
+    The index is kept on the families data, so it is dropped together
+    with it when the instance is reloaded.
+    """
+    index = families.families_index
+    if index is None or not index.is_built_for(families):
+        index = FamiliesIndex(families)
+        families.families_index = index
+    return index
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import enum
 import logging
+import sys
 from collections.abc import Iterable
-from typing import Any, cast
+from typing import Any, ClassVar, cast
 
 from gain.utils.helpers import isnan
 
@@ -122,22 +123,89 @@ ALL_FAMILY_TAGS = set(_TAG2LABEL.keys())
 ALL_FAMILY_TAG_LABELS = set(_LABEL2TAG.keys())
 
 
+def _intern(value: Any) -> Any:
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def _tags_from_mask(tag_mask: int) -> set[FamilyTag]:
+    return {tag for tag in ALL_FAMILY_TAGS if tag_mask & (1 << tag)}
+
+
+class _AttributesLayout:
+    """Shared layout of person attribute names.
+
+    Persons loaded from the same pedigree have the same attribute names. The
+    names and their positions are kept in an interned layout shared by all
+    such persons, so each person stores only a compact list of values.
+    """
+
+    __slots__ = ("_extended", "index", "keys")
+
+    _interned: ClassVar[dict[tuple[str, ...], _AttributesLayout]] = {}
+
+    def __init__(self, keys: tuple[str, ...]) -> None:
+        self.keys = keys
+        self.index = {key: pos for pos, key in enumerate(keys)}
+        self._extended: dict[str, _AttributesLayout] = {}
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_AttributesLayout.get, (self.keys,))
+
+    @staticmethod
+    def get(keys: tuple[str, ...]) -> _AttributesLayout:
+        """Return the interned layout for the given attribute names."""
+        layout = _AttributesLayout._interned.get(keys)
+        if layout is None:
+            layout = _AttributesLayout(tuple(_intern(key) for key in keys))
+            _AttributesLayout._interned[keys] = layout
+        return layout
+
+    def extend(self, key: str) -> _AttributesLayout:
+        """Return the layout with an additional attribute name appended."""
+        layout = self._extended.get(key)
+        if layout is None:
+            layout = _AttributesLayout.get((*self.keys, key))
+            self._extended[key] = layout
+        return layout
+
+
 class Person:
-    """Class to represent an individual."""
+    """Class to represent an individual.
+
+    Persons are slotted and keep their attributes as a list of values laid
+    out by a shared :class:`_AttributesLayout`; family and person ids are
+    interned. This keeps the per-person overhead low for large pedigrees.
+    """
+
+    __slots__ = (
+        "_layout", "_role", "_sex", "_status", "_tag_mask", "_values",
+        "dad_id", "family_id", "fpid", "is_child", "is_parent",
+        "mom_id", "person_id", "sample_id",
+    )
+
+    family_id: str
+    person_id: str
+    fpid: tuple[str, str]
+    sample_id: str
+    mom_id: str | None
+    dad_id: str | None
+    is_child: bool
+    is_parent: bool
 
-    # pylint: disable=too-many-instance-attributes
     def __init__(self, **attributes: Any):
         tags = {
             tag: attributes.get(tag.label, False)
             for tag in ALL_FAMILY_TAGS
         }
-        self._attributes = {
+        self._store_attributes({
             key: value
             for key, value in attributes.items()
             if key not in ALL_FAMILY_TAG_LABELS
             and key != "tag_family_type_full"
-        }
-        self._tags: set[FamilyTag] = set()
+        })
+        self._tag_mask = 0
         for tag, tag_value in tags.items():
             if isinstance(tag_value, bool) and tag_value:
                 self.set_tag(tag)
@@ -148,59 +216,80 @@ class Person:
 
             self.unset_tag(tag)
         self.redefine()
-        self.is_child: bool = False
-        self.is_parent: bool = False
+        self.is_child = False
+        self.is_parent = False
+
+    def _store_attributes(self, attributes: dict[str, Any]) -> None:
+        self._layout = _AttributesLayout.get(tuple(attributes))
+        self._values = list(attributes.values())
+
+    @property
+    def _attributes(self) -> dict[str, Any]:
+        """Return a copy of all attributes of the person as a dict."""
+        return dict(zip(self._layout.keys, self._values, strict=True))
+
+    def _get(self, key: str, default: Any = None) -> Any:
+        pos = self._layout.index.get(key)
+        if pos is None:
+            return default
+        return self._values[pos]
 
     def redefine(self) -> None:
         # pylint: disable=too-many-branches
         """Extract attributes and turns them into properties."""
-        self.family_id: str = self._attributes["family_id"]
-        self.person_id: str = self._attributes["person_id"]
-        self.fpid: tuple[str, str] = (self.family_id, self.person_id)
-
-        self.sample_id: str = self._attributes.get("sample_id", self.person_id)
-
-        self._sex = Sex.from_name(self._attributes["sex"])
-        if "role" not in self._attributes:
+        attributes = self._attributes
+        self.family_id = _intern(attributes["family_id"])
+        self.person_id = _intern(attributes["person_id"])
+        self.fpid = (self.family_id, self.person_id)
+        attributes["family_id"] = self.family_id
+        attributes["person_id"] = self.person_id
+
+        self.sample_id = _intern(attributes.get("sample_id", self.person_id))
+        if "sample_id" in attributes:
+            attributes["sample_id"] = self.sample_id
+
+        self._sex = Sex.from_name(attributes["sex"])
+        if "role" not in attributes:
             self._role = None
         else:
-            self._role = Role.from_name(self._attributes.get("role"))
+            self._role = Role.from_name(attributes.get("role"))
 
-        self._status = Status.from_name(self._attributes["status"])
+        self._status = Status.from_name(attributes["status"])
 
-        self._attributes["sex"] = self._sex
-        self._attributes["role"] = self._role
-        self._attributes["status"] = self._status
+        attributes["sex"] = self._sex
+        attributes["role"] = self._role
+        attributes["status"] = self._status
 
-        self.mom_id: str | None = self.get_attr("mom_id")
+        self.mom_id = _intern(attributes.get("mom_id"))
         if self.mom_id == "0":
             self.mom_id = None
-            self._attributes["mom_id"] = None
-        self.dad_id: str | None = self.get_attr("dad_id")
+            attributes["mom_id"] = None
+        self.dad_id = _intern(attributes.get("dad_id"))
         if self.dad_id == "0":
             self.dad_id = None
-            self._attributes["dad_id"] = None
+            attributes["dad_id"] = None
         assert self.mom_id is None or isinstance(self.mom_id, str), \
-            (self, self._attributes)
+            (self, attributes)
         assert self.dad_id is None or isinstance(self.dad_id, str), \
-            (self, self._attributes)
-        if self._attributes.get("not_sequenced"):
-            value = self._attributes.get("not_sequenced")
+            (self, attributes)
+        if attributes.get("not_sequenced"):
+            value = attributes.get("not_sequenced")
             if value in {"None", "0", "False"}:
-                self._attributes["not_sequenced"] = None
-        if self._attributes.get("generated"):
-            value = self._attributes.get("generated")
+                attributes["not_sequenced"] = None
+        if attributes.get("generated"):
+            value = attributes.get("generated")
             if value in {True, "True", "1", "yes"}:
-                self._attributes["generated"] = True
+                attributes["generated"] = True
             else:
-                self._attributes["generated"] = False
+                attributes["generated"] = False
 
-        if self._attributes.get("missing"):
-            value = self._attributes.get("missing")
+        if attributes.get("missing"):
+            value = attributes.get("missing")
             if value in {True, "True", "1", "yes"}:
-                self._attributes["missing"] = True
+                attributes["missing"] = True
             else:
-                self._attributes["missing"] = None
+                attributes["missing"] = None
+        self._store_attributes(attributes)
 
     def __repr__(self) -> str:
         decorator = ""
@@ -234,7 +323,7 @@ class Person:
 
     @property
     def member_index(self) -> int:
-        return int(self._attributes.get("member_index", -1))
+        return int(self._get("member_index", -1))
 
     @property
     def role(self) -> Role | None:
@@ -250,59 +339,63 @@ class Person:
 
     @property
     def layout(self) -> str | None:
-        return cast(str | None, self._attributes.get("layout", None))
+        return cast(str | None, self._get("layout"))
 
     @property
     def generated(self) -> bool:
-        return cast(bool, self._attributes.get("generated", False))
+        return cast(bool, self._get("generated", default=False))
 
     @property
     def not_sequenced(self) -> bool:
         return self.generated or \
-            self._attributes.get("not_sequenced", False)
+            self._get("not_sequenced", default=False)
 
     @property
     def missing(self) -> bool:
         return bool(
             self.generated or self.not_sequenced
-            or self._attributes.get("missing", False))
+            or self._get("missing", default=False))
 
     @property
     def family_bin(self) -> int | None:
-        return cast(int | None, self._attributes.get("family_bin", None))
+        return cast(int | None, self._get("family_bin"))
 
     @property
     def sample_index(self) -> int | None:
-        return cast(int | None, self._attributes.get("sample_index", None))
+        return cast(int | None, self._get("sample_index"))
 
     def has_attr(self, key: str) -> bool:
-        return key in self._attributes
+        return key in self._layout.index
 
     def get_attr(self, key: str, default: Any = None) -> Any:
-        res = self._attributes.get(key, default)
+        res = self._get(key, default)
         if isinstance(res, float) and isnan(res):
             return None
         return res
 
     def set_attr(self, key: str, value: Any) -> None:
-        self._attributes[key] = value
+        pos = self._layout.index.get(key)
+        if pos is None:
+            self._layout = self._layout.extend(key)
+            self._values.append(value)
+        else:
+            self._values[pos] = value
 
     def set_tag(self, tag: FamilyTag) -> None:
-        self._tags.add(tag)
+        self._tag_mask |= 1 << tag
 
     def unset_tag(self, tag: FamilyTag) -> None:
-        if tag in self._tags:
-            self._tags.remove(tag)
+        self._tag_mask &= ~(1 << tag)
 
     def has_tag(self, tag: FamilyTag) -> bool:
-        return tag in self._tags
+        return bool(self._tag_mask & (1 << tag))
 
     def all_tag_labels(self) -> dict[str, bool]:
         return {tag.label: self.has_tag(tag) for tag in ALL_FAMILY_TAGS}
 
     @property
     def tags(self) -> set[FamilyTag]:
-        return self._tags
+        return _tags_from_mask(self._tag_mask)
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, Person):
@@ -372,28 +465,32 @@ def get_pedigree_column_names(column_names: set[str]) -> list[str]:
 class Family:
     """Defines class to represent a family."""
 
+    __slots__ = (
+        "_members_in_order", "_samples_index", "_tag_mask", "_trios",
+        "family_id", "persons",
+    )
+
     def __init__(self, family_id: str):
-        self.family_id = family_id
+        self.family_id = _intern(family_id)
         self.persons: dict[str, Person] = {}
         self._samples_index: tuple[int | None, ...] | None = None
         self._members_in_order: list[Person] | None = None
         self._trios: dict[str, tuple[str, str, str]] | None = None
-        self._tags: set[FamilyTag] = set()
+        self._tag_mask = 0
 
     def set_tag(self, tag: FamilyTag) -> None:
-        self._tags.add(tag)
+        self._tag_mask |= 1 << tag
 
     def unset_tag(self, tag: FamilyTag) -> None:
-        if tag in self._tags:
-            self._tags.remove(tag)
+        self._tag_mask &= ~(1 << tag)
 
     @property
     def tags(self) -> set[FamilyTag]:
-        return self._tags
+        return _tags_from_mask(self._tag_mask)
 
     @property
     def tag_labels(self) -> set[str]:
-        return {tag.label for tag in self._tags}
+        return {tag.label for tag in self.tags}
 
     def _connect_family(self) -> None:
         index = 0
@@ -421,9 +518,9 @@ class Family:
                     f"multiple person with the same person id "
                     f"{person.person_id} in family {family_id}")
             family.persons[person.person_id] = person
-            family._tags |= person.tags
+            # pylint: disable=protected-access
+            family._tag_mask |= person._tag_mask  # noqa: SLF001
 
-        # pylint: disable=protected-access
         family._connect_family()
 
         return family
@@ -455,7 +552,7 @@ class Family:
         """Collect list of columns for representing a family as data frame."""
         column_names = set(
             self.members_in_order[0]  # noqa: SLF001
-                ._attributes.keys())
+                ._layout.keys)
         return get_pedigree_column_names(column_names)
 
     def add_members(self, persons: list[Person]) -> None:
@@ -73,7 +73,7 @@ class FamilyRoleBuilder:  # pylint: disable=too-few-public-methods
 
         # pylint: disable=protected-access
         person._role = role  # noqa: SLF001
-        person._attributes["role"] = role  # noqa: SLF001
+        person.set_attr("role", role)
 
     def _get_family_proband(self) -> Person | None:
         probands = self.family.get_members_with_roles([Role.prb])
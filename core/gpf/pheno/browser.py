@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import textwrap
 from collections.abc import Iterator
-from functools import reduce
 from typing import Any
 
 import duckdb
+import pyarrow as pa
 import sqlglot
 from duckdb import (
     ConstraintException,
@@ -24,6 +24,7 @@ from sqlglot.expressions import (
 )
 
 from gpf.pheno.common import MeasureType
+from gpf.pheno.measures_search import MeasuresSearchIndex
 from gpf.utils.sql_utils import to_duckdb_transpile
 
 
@@ -31,6 +32,7 @@ class PhenoBrowser:
     """Class for handling saving and loading of phenotype browser data."""
 
     PAGE_SIZE = 1001
+    KEYWORD_MATCHES_TABLE = "measures_keyword_matches"
 
     def __init__(
         self, dbfile: str, *, read_only: bool = True,
@@ -47,6 +49,7 @@ class PhenoBrowser:
         self.measure_descriptions = table_("measure_descriptions")
         self.is_legacy = self._is_browser_legacy()
         self._closed = False
+        self._search_index: MeasuresSearchIndex | None = None
 
     def _is_browser_legacy(self) -> bool:
         """Handle legacy databases."""
@@ -151,8 +154,16 @@ class PhenoBrowser:
             for query in queries:
                 cursor.execute(to_duckdb_transpile(query))
 
+    @property
+    def search_index(self) -> MeasuresSearchIndex:
+        """Return the keyword search index; build it on first use."""
+        if self._search_index is None:
+            self._search_index = MeasuresSearchIndex.load(self.connection)
+        return self._search_index
+
     def save(self, v: dict[str, Any]) -> None:
         """Save measure values into the database."""
+        self._search_index = None
         with self.connection.cursor() as cursor:
             if not self.is_legacy:
                 instrument_desc_query = to_duckdb_transpile(insert(
@@ -253,11 +264,6 @@ class PhenoBrowser:
             with self.connection.cursor() as cursor:
                 cursor.execute(update_query)
 
-    def _build_ilike(
-            self,
-            keyword: str, col: expressions.Column) -> expressions.Escape:
-        return expressions.Escape(this=col.ilike(keyword), expression="'/'")
-
     def _build_measures_query(
         self,
         instrument_name: str | None = None,
@@ -363,9 +369,7 @@ class PhenoBrowser:
         query = query.distinct()
 
         if keyword:
-            query = self._measures_query_by_keyword(
-                query, keyword, instrument_name,
-            )
+            query = self._measures_query_by_keyword(query)
 
         if instrument_name:
             query = query.where(
@@ -412,9 +416,8 @@ class PhenoBrowser:
     def _build_measures_count_query(
         self,
         instrument_name: str | None = None,
-        keyword: str | None = None,
     ) -> expressions.Select:
-        """Count measures by keyword search."""
+        """Count measures of an instrument or all measures."""
 
         count = Count(this="*")
 
@@ -422,11 +425,6 @@ class PhenoBrowser:
 
         query = query.distinct()
 
-        if keyword:
-            query = self._measures_query_by_keyword(
-                query, keyword, instrument_name,
-            )
-
         if instrument_name:
             query = query.where(
                 f"variable_browser.instrument_name = '{instrument_name}'",
@@ -437,35 +435,26 @@ class PhenoBrowser:
     def _measures_query_by_keyword(
         self,
         query: expressions.Select,
-        keyword: str,
-        instrument_name: str | None = None,
     ) -> expressions.Select:
-        column_filters = []
-        keyword = keyword.replace("/", "//")\
-            .replace("%", r"/%").replace("_", r"/_")
-        keyword = f"%{keyword}%"
-        if not instrument_name:
-            column_filters.append(
-                self._build_ilike(
-                    keyword,
-                    column("instrument_name", table="variable_browser"),
-                ),
-            )
-        column_filters.extend((
-            self._build_ilike(
-                keyword,
-                column("measure_id", table="variable_browser"),
+        """Restrict the query to the measures matched by the search index.
+
+        The ids of the matching measures are registered as a table on the
+        cursor that executes the query.
+        """
+        return query.where(
+            column("measure_id", table="variable_browser").isin(
+                query=select("measure_id").from_(self.KEYWORD_MATCHES_TABLE),
             ),
-            self._build_ilike(
-                keyword,
-                column("measure_name", table="variable_browser"),
-            ),
-        ))
+        )
 
-        return query.where(reduce(
-            lambda left, right: left.or_(right),  # type: ignore
-            column_filters,
-        ))
+    def _keyword_matches(
+        self, keyword: str, instrument_name: str | None,
+    ) -> pa.Table:
+        return pa.table({
+            "measure_id": pa.array(
+                self.search_index.match_measure_ids(keyword, instrument_name),
+                type=pa.string()),
+        })
 
     def search_measures(
         self,
@@ -494,6 +483,10 @@ class PhenoBrowser:
         query_str = to_duckdb_transpile(query)
 
         with self.connection.cursor() as cursor:
+            if keyword:
+                cursor.register(
+                    self.KEYWORD_MATCHES_TABLE,
+                    self._keyword_matches(keyword, instrument_name))
             rows = cursor.execute(query_str).fetchall()
             for row in rows:
                 yield {
@@ -515,15 +508,21 @@ class PhenoBrowser:
         keyword: str | None = None,
         page: int | None = None,
     ) -> int:
-        """Find measures by keyword search."""
-        query = self._build_measures_count_query(
-            instrument_name,
-            keyword,
-        )
+        """Count measures matching the keyword search.
 
+        Keyword counts are answered by the search index without querying
+        the database.
+        """
         if page is None:
             page = 1
 
+        if keyword:
+            if page > 1:
+                return 0
+            return len(self.search_index.match(keyword, instrument_name))
+
+        query = self._build_measures_count_query(instrument_name)
+
         query = query.limit(self.PAGE_SIZE).offset(
             self.PAGE_SIZE * (page - 1),
         )
@@ -534,6 +533,30 @@ class PhenoBrowser:
             rows = cursor.execute(query_str).fetchall()
             return int(rows[0][0]) if rows else 0
 
+    def search_measure_ids(
+        self,
+        instrument_name: str | None = None,
+        keyword: str | None = None,
+    ) -> list[str]:
+        """Return ids of all measures matching the search, without paging."""
+        if keyword:
+            return sorted(
+                self.search_index.match_measure_ids(keyword, instrument_name))
+
+        query = select(
+            column("measure_id", self.variable_browser.alias_or_name),
+        ).from_(self.variable_browser)
+        if instrument_name:
+            query = query.where(
+                column("instrument_name", self.variable_browser.alias_or_name)
+                .eq(instrument_name),
+            )
+        query = query.order_by("variable_browser.measure_id ASC")
+
+        with self.connection.cursor() as cursor:
+            rows = cursor.execute(to_duckdb_transpile(query)).fetchall()
+            return [row[0] for row in rows]
+
     def save_descriptions(
         self,
         table: Table,
@@ -6,6 +6,7 @@ from typing import Any, cast
 
 import duckdb
 import pandas as pd
+import pyarrow as pa
 import sqlglot
 from sqlglot import column, expressions, select
 from sqlglot.expressions import (
@@ -22,6 +23,8 @@ from gpf.pheno.common import MeasureType
 from gpf.utils.sql_utils import glot_and, to_duckdb_transpile
 from gpf.variants.attributes import Role, Sex, Status
 
+MEASURE_VALUES_BATCH_SIZE = 1_024
+
 
 class PhenoDb:  # pylint: disable=too-many-instance-attributes
     """Class that manages access to phenotype databases."""
@@ -263,42 +266,32 @@ class PhenoDb:  # pylint: disable=too-many-instance-attributes
             column("sex", instrument_people.alias_or_name),
         ]
 
-        query = select(*output_cols).from_(instrument_people)
-        joined = set()
+        measure_cols = []
         for measure_id in measure_ids:
             instrument, measure = measure_id.split(".", maxsplit=1)
             instrument_table = instrument_tables[instrument]
-            if instrument not in joined:
-                left_col = person_id_col.sql()
-                right_col = column(
-                    "person_id", instrument_table.alias_or_name,
-                ).sql()
-                measure_col = column(
-                    safe_db_name(measure),
-                    instrument_table.alias_or_name,
-                    quoted=True,
-                ).as_(measure_id)
-                query = query.select(
-                    measure_col,
-                ).join(
-                    instrument_table,
-                    on=f"{left_col} = {right_col}",
-                    join_type="FULL OUTER",
-                )
-                joined.add(instrument)
-                output_cols.append(cast(expressions.Column, measure_col))
-            else:
-                assert query is not None
-                measure_col = column(
-                    safe_db_name(measure),
-                    instrument_table.alias_or_name,
-                ).as_(measure_id)
-                query = query.select(
-                    measure_col,
-                )
-                output_cols.append(cast(expressions.Column, measure_col))
-
-        assert query is not None
+            measure_cols.append(column(
+                safe_db_name(measure),
+                instrument_table.alias_or_name,
+                quoted=True,
+            ).as_(measure_id))
+
+        # all columns are selected at once; adding them one by one makes
+        # building queries for thousands of measures quadratic
+        query = select(*output_cols, *measure_cols).from_(instrument_people)
+        for instrument_table in instrument_tables.values():
+            left_col = person_id_col.sql()
+            right_col = column(
+                "person_id", instrument_table.alias_or_name,
+            ).sql()
+            query = query.join(
+                instrument_table,
+                on=f"{left_col} = {right_col}",
+                join_type="FULL OUTER",
+                copy=False,
+            )
+        output_cols.extend(
+            cast(list[expressions.Column], measure_cols))
 
         empty_result = False
         cols_in = []
@@ -364,6 +357,26 @@ class PhenoDb:  # pylint: disable=too-many-instance-attributes
                 output["sex"] = Sex.to_name(output["sex"])
                 yield output
 
+    def get_people_measure_values_batches(
+        self,
+        measure_ids: list[str],
+        person_ids: list[str] | None = None,
+        family_ids: list[str] | None = None,
+        roles: list[Role] | None = None,
+        batch_size: int = MEASURE_VALUES_BATCH_SIZE,
+    ) -> Generator[pa.RecordBatch, None, None]:
+        """Yield measure values as Arrow record batches.
+
+        The batches have columns `person_id`, `family_id`, `role`,
+        `status` and `sex` followed by a column for each measure, named
+        by the measure id. Role, status and sex are kept as stored values.
+        """
+        query, _ = self._get_measure_values_query(
+            measure_ids, person_ids, family_ids, roles,
+        )
+        with self.connection.cursor() as cursor:
+            yield from cursor.execute(query).fetch_record_batch(batch_size)
+
     def get_people_measure_values_df(
         self,
         measure_ids: list[str],
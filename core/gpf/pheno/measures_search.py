@@ -0,0 +1,171 @@
+"""Trigram index for keyword search over pheno browser measures."""
+from __future__ import annotations
+
+import re
+
+import duckdb
+import numpy as np
+
+TRIGRAM_SIZE = 3
+_SEPARATOR = "\0"
+
+
+def _code_points(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32) \
+        .astype(np.int64)
+
+
+def _trigram_codes(code_points: np.ndarray) -> np.ndarray:
+    """Encode all consecutive trigrams of code points as int64 values."""
+    return (code_points[:-2] << 42) | (code_points[1:-1] << 21) \
+        | code_points[2:]
+
+
+class MeasuresSearchIndex:
+    """Case-insensitive substring index of pheno browser measures.
+
+    Measure ids and measure names of all measures are lower-cased and
+    concatenated into a single text. The index keeps sorted trigram
+    postings over that text, so a keyword of three or more characters is
+    looked up by intersecting the postings of its trigrams and checking
+    only the few remaining candidates. Shorter keywords are searched
+    directly in the concatenated text. Instrument names are few and are
+    matched separately.
+
+    Matching follows the `ILIKE '%keyword%'` semantics of the browser
+    queries.
+    """
+
+    def __init__(
+        self,
+        measure_ids: list[str],
+        measure_names: list[str],
+        instrument_names: list[str],
+    ) -> None:
+        self.measure_ids = measure_ids
+        self._instruments: dict[str, int] = {}
+        self._instrument_codes = np.fromiter(
+            (self._instruments.setdefault(name, len(self._instruments))
+             for name in instrument_names),
+            dtype=np.int64, count=len(instrument_names))
+
+        texts = [
+            f"{measure_id}{_SEPARATOR}{measure_name}{_SEPARATOR}".lower()
+            for measure_id, measure_name in zip(
+                measure_ids, measure_names, strict=True)
+        ]
+        self._texts = texts
+        self._text = "".join(texts)
+        lengths = np.fromiter(
+            (len(text) for text in texts), dtype=np.int64, count=len(texts))
+        self._offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+        self._build_postings()
+
+    def _build_postings(self) -> None:
+        code_points = _code_points(self._text)
+        if len(code_points) < TRIGRAM_SIZE:
+            self._keys = np.empty(0, dtype=np.int64)
+            self._starts = np.zeros(1, dtype=np.int64)
+            self._rows = np.empty(0, dtype=np.int64)
+            return
+        codes = _trigram_codes(code_points)
+        separators = code_points == ord(_SEPARATOR)
+        valid = ~(separators[:-2] | separators[1:-1] | separators[2:])
+        positions = np.flatnonzero(valid)
+        rows = np.searchsorted(self._offsets, positions, side="right") - 1
+
+        # positions (and rows) are ascending, so a stable sort by trigram
+        # keeps the postings of every trigram sorted by row
+        order = np.argsort(codes[positions], kind="stable")
+        codes, rows = codes[positions][order], rows[order]
+        keep = np.ones(len(codes), dtype=bool)
+        keep[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        codes, rows = codes[keep], rows[keep]
+
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+        self._keys = codes[starts]
+        self._starts = np.append(starts, len(codes))
+        self._rows = rows
+
+    @staticmethod
+    def load(connection: duckdb.DuckDBPyConnection) -> MeasuresSearchIndex:
+        """Build the index from the variable browser table."""
+        with connection.cursor() as cursor:
+            rows = cursor.execute(
+                "SELECT measure_id, measure_name, instrument_name "
+                "FROM variable_browser",
+            ).fetchall()
+        return MeasuresSearchIndex(
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+            [row[2] for row in rows],
+        )
+
+    def __len__(self) -> int:
+        return len(self.measure_ids)
+
+    def _postings(self, code: int) -> np.ndarray:
+        index = int(np.searchsorted(self._keys, code))
+        if index == len(self._keys) or self._keys[index] != code:
+            return np.empty(0, dtype=np.int64)
+        return self._rows[self._starts[index]:self._starts[index + 1]]
+
+    def _match_measures(self, keyword: str) -> np.ndarray:
+        if len(keyword) < TRIGRAM_SIZE:
+            positions = np.fromiter(
+                (match.start() for match in re.finditer(
+                    re.escape(keyword), self._text)),
+                dtype=np.int64)
+            rows = np.searchsorted(self._offsets, positions, side="right") - 1
+            return np.unique(rows)
+
+        postings = sorted(
+            (self._postings(int(code))
+             for code in np.unique(_trigram_codes(_code_points(keyword)))),
+            key=len,
+        )
+        candidates = postings[0]
+        for posting in postings[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = np.intersect1d(
+                candidates, posting, assume_unique=True)
+        return np.array(
+            [row for row in candidates if keyword in self._texts[row]],
+            dtype=np.int64,
+        )
+
+    def match(
+        self, keyword: str, instrument_name: str | None = None,
+    ) -> np.ndarray:
+        """Return sorted row numbers of the measures matching the keyword.
+
+        If an instrument is given, only its measures are matched and the
+        keyword is not matched against the instrument name.
+        """
+        keyword = keyword.lower()
+        rows = self._match_measures(keyword)
+        if instrument_name:
+            code = self._instruments.get(instrument_name)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            return rows[self._instrument_codes[rows] == code]
+
+        instrument_codes = [
+            code for name, code in self._instruments.items()
+            if keyword in name.lower()
+        ]
+        if not instrument_codes:
+            return rows
+        return np.union1d(rows, np.flatnonzero(
+            np.isin(self._instrument_codes, instrument_codes)))
+
+    def match_measure_ids(
+        self, keyword: str, instrument_name: str | None = None,
+    ) -> list[str]:
+        """Return ids of the measures matching the keyword."""
+        return [
+            self.measure_ids[row]
+            for row in self.match(keyword, instrument_name)
+        ]
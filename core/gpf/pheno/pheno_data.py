@@ -15,6 +15,7 @@ from typing import Any, cast
 
 import duckdb
 import pandas as pd
+import pyarrow as pa
 from box import Box
 from gain.genomic_resources.histogram import (
     CategoricalHistogram,
@@ -507,6 +508,16 @@ class PhenotypeData(CommonStudyMixin, ABC):
         """Count measures in the DB according to filters."""
         raise NotImplementedError
 
+    def search_measure_ids(
+        self,
+        instrument: str | None,
+        search_term: str | None,
+    ) -> list[str]:
+        """Return ids of all measures in the DB according to filters."""
+        if self.browser is None:
+            return []
+        return self.browser.search_measure_ids(instrument, search_term)
+
     def has_measure(self, measure_id: str) -> bool:
         """Check if phenotype DB contains a measure by ID."""
         return measure_id in self._measures
@@ -622,6 +633,22 @@ class PhenotypeData(CommonStudyMixin, ABC):
         """
         raise NotImplementedError
 
+    def get_people_measure_values_batches(
+        self,
+        measure_ids: list[str],
+        person_ids: list[str] | None = None,
+        family_ids: list[str] | None = None,
+        roles: list[Role] | None = None,
+    ) -> Generator[pa.RecordBatch, None, None]:
+        """
+        Collect the values of the given measures as Arrow record batches.
+
+        Every batch has columns `person_id`, `family_id`, `role`, `status`
+        and `sex` followed by a column for each of the `measure_ids`.
+        Filters are the same as in `get_people_measure_values`.
+        """
+        raise NotImplementedError
+
     def get_people_measure_values_df(
         self,
         measure_ids: list[str],
@@ -879,6 +906,17 @@ class PhenotypeStudy(PhenotypeData):
             measure_ids, person_ids, family_ids, roles,
         )
 
+    def get_people_measure_values_batches(
+        self,
+        measure_ids: list[str],
+        person_ids: list[str] | None = None,
+        family_ids: list[str] | None = None,
+        roles: list[Role] | None = None,
+    ) -> Generator[pa.RecordBatch, None, None]:
+        yield from self.db.get_people_measure_values_batches(
+            measure_ids, person_ids, family_ids, roles,
+        )
+
     def get_people_measure_values_df(
         self,
         measure_ids: list[str],
@@ -1119,6 +1157,38 @@ class PhenotypeGroup(PhenotypeData):
             chain.from_iterable(generators),
         )
 
+    def get_people_measure_values_batches(
+        self,
+        measure_ids: list[str],
+        person_ids: list[str] | None = None,
+        family_ids: list[str] | None = None,
+        roles: list[Role] | None = None,
+    ) -> Generator[pa.RecordBatch, None, None]:
+        """Yield the batches of all children one after another.
+
+        Measures missing in a child are filled with nulls, so all batches
+        have the same columns.
+        """
+        names = ["person_id", "family_id", "role", "status", "sex",
+                 *measure_ids]
+        for child in self.children:
+            measures_in_child = list(
+                filter(child.has_measure, measure_ids))
+            if len(measures_in_child) == 0:
+                continue
+            for batch in child.get_people_measure_values_batches(
+                measures_in_child,
+                person_ids,
+                family_ids,
+                roles,
+            ):
+                yield pa.RecordBatch.from_arrays([
+                    batch.column(name)
+                    if name in batch.schema.names
+                    else pa.nulls(batch.num_rows)
+                    for name in names
+                ], names=names)
+
     def get_people_measure_values_df(
         self,
         measure_ids: list[str],
@@ -1,15 +1,23 @@
+import dataclasses
 import itertools
+import json
 import logging
 import operator
 import os
 import pathlib
-from typing import Literal
+import re
+from typing import Any, Literal, cast
 
+import fsspec
 import yaml
+from fsspec.core import url_to_fs
+from gain.annotation.annotation_pipeline import AnnotationPipeline
 from gain.task_graph.graph import Task, TaskGraph, sync_tasks
 from gain.utils import fs_utils
 from gain.utils.processing_pipeline import Filter, PipelineProcessor, Source
 from gain.utils.regions import Region
+from pyarrow import compute as pc
+from pyarrow import dataset as ds
 from pyarrow import parquet as pq
 
 from gpf.gpf_instance.gpf_instance import GPFInstance
@@ -18,6 +26,7 @@ from gpf.import_tools.import_tools import (
     ImportProject,
     ImportStorage,
     construct_import_annotation_pipeline,
+    file_fingerprint,
 )
 from gpf.parquet.parquet_writer import (
     append_meta_to_parquet,
@@ -36,11 +45,17 @@ from gpf.parquet.schema2.annotate_schema2_parquet import (
     produce_schema2_merging_tasks,
     write_new_meta,
 )
+from gpf.parquet.schema2.annotation_cache import (
+    AnnotationCache,
+    annotation_pipeline_fingerprint,
+)
 from gpf.parquet.schema2.loader import ParquetLoader
 from gpf.parquet.schema2.merge_parquet import merge_parquet_directory
 from gpf.parquet.schema2.processing_pipeline import (
     AnnotationPipelineVariantsBatchFilter,
     AnnotationPipelineVariantsFilter,
+    CachedAnnotationVariantsBatchFilter,
+    StoredAnnotationVariantsBatchFilter,
     VariantsLoaderBatchSource,
     VariantsLoaderSource,
 )
@@ -53,6 +68,7 @@ from gpf.parquet.schema2.variants_parquet_writer import (
     Schema2VariantConsumer,
     VariantsParquetWriter,
 )
+from gpf.pedigrees.families_data import FamiliesData
 from gpf.schema2_storage.schema2_layout import (
     Schema2DatasetLayout,
     create_schema2_dataset_layout,
@@ -80,10 +96,141 @@ class Schema2ImportStorage(ImportStorage):
         out_dir = out_dir or project.work_dir
         return project.get_partition_descriptor()
 
+    @staticmethod
+    def _append_state_dir(project: ImportProject) -> str:
+        return fs_utils.join(project.work_dir, ".append", project.study_id)
+
     @classmethod
-    def _do_write_pedigree(cls, project: ImportProject) -> None:
+    def _load_append_state(cls, project: ImportProject) -> dict[str, Any]:
+        state_filename = fs_utils.join(
+            cls._append_state_dir(project), "state.json")
+        with fsspec.open(state_filename, "rt") as infile:
+            return cast(dict[str, Any], json.load(infile))
+
+    @classmethod
+    def _prepare_append(cls, project: ImportProject) -> int:
+        """Prepare appending of the project families to an existing dataset.
+
+        The pedigree of the existing dataset is kept aside, so repeated runs
+        of the same append start from the same dataset. Returns the index of
+        the first appended bucket.
+        """
+        layout = schema2_project_dataset_layout(project)
+        if not fs_utils.exists(layout.pedigree):
+            raise ValueError(
+                f"no dataset to append to found in {layout.study}")
+        state_dir = cls._append_state_dir(project)
+        pedigree_fingerprint = file_fingerprint(
+            project.get_pedigree_filename())
+        if fs_utils.exists(fs_utils.join(state_dir, "state.json")):
+            state = cls._load_append_state(project)
+            if state["pedigree"] == pedigree_fingerprint:
+                return cast(int, state["bucket_index"])
+
+        meta = cls.load_meta(project)
+        study_config = yaml.safe_load(meta.get("study", "")) or {}
+        if study_config.get("has_transmitted") \
+                or {"dae", "vcf"} & project.get_variant_loader_types():
+            # allele frequencies of the stored and of the appended variants
+            # would cover only a part of the families
+            raise ValueError(
+                f"unable to append transmitted variants to {layout.study}; "
+                f"allele frequencies can not be updated in place")
+        if yaml.safe_load(meta.get("annotation_pipeline", "")) \
+                != project.get_annotation_pipeline_config():
+            raise ValueError(
+                f"annotation pipeline of the appended families differs "
+                f"from the annotation pipeline of {layout.study}")
+        if meta.get("partition_description", "").strip() != \
+                cls._get_partition_description(project).serialize().strip():
+            raise ValueError(
+                f"partition description of the appended families differs "
+                f"from the partition description of {layout.study}")
+
+        existing = ParquetLoader._load_families(  # noqa: SLF001
+            layout.pedigree)
+        duplicated = sorted(set(existing) & set(project.get_pedigree()))
+        if duplicated:
+            raise ValueError(
+                f"families already in {layout.study}: {duplicated}")
+
+        bucket_index = 0
+        if fs_utils.exists(layout.summary) and fs_utils.glob(
+                fs_utils.join(layout.summary, "**", "*.parquet")):
+            bucket_indexes = ds.dataset(
+                layout.summary, format="parquet",
+            ).to_table(columns=["bucket_index"]).column("bucket_index")
+            if len(bucket_indexes) > 0:
+                bucket_index = pc.max(bucket_indexes).as_py() + 1
+
+        with fsspec.open(layout.pedigree, "rb") as infile, \
+                fsspec.open(
+                    fs_utils.join(state_dir, "pedigree.parquet"), "wb",
+                    auto_mkdir=True) as outfile:
+            outfile.write(infile.read())
+        with fsspec.open(
+                fs_utils.join(state_dir, "state.json"), "wt",
+                auto_mkdir=True) as outfile:
+            json.dump({
+                "pedigree": pedigree_fingerprint,
+                "bucket_index": bucket_index,
+            }, outfile, indent=2)
+        return bucket_index
+
+    @classmethod
+    def _append_buckets(
+        cls, project: ImportProject, buckets: list[Bucket],
+    ) -> list[Bucket]:
+        """Renumber buckets to follow the buckets of the existing dataset."""
+        bucket_index = cls._prepare_append(project)
+        if bucket_index + len(buckets) >= 1_000_000:
+            raise ValueError(
+                f"too many buckets to append to {project.study_id}")
+        return [
+            dataclasses.replace(bucket, index=bucket_index + index)
+            for index, bucket in enumerate(buckets)
+        ]
+
+    @staticmethod
+    def _filename_bucket_index(filename: str) -> int | None:
+        match = re.search(r"_bucket_index_(\d+)\.parquet$", filename)
+        if match is None:
+            return None
+        return int(match.group(1))
+
+    @classmethod
+    def _stored_summary_filenames(cls, project: ImportProject) -> list[str]:
+        """Return the summary files stored before the appended buckets."""
         layout = schema2_project_dataset_layout(project)
+        bucket_index = cls._load_append_state(project)["bucket_index"]
+        result = []
+        for filename in sorted(fs_utils.glob(
+                fs_utils.join(layout.study, "summary", "**", "*.parquet"))):
+            index = cls._filename_bucket_index(filename)
+            if index is None or index < bucket_index:
+                result.append(filename)
+        return result
+
+    @classmethod
+    def _get_dataset_families(cls, project: ImportProject) -> FamiliesData:
+        """Return the families of the imported dataset.
+
+        When appending, these are the existing families followed by the
+        families of the project.
+        """
         families = project.get_pedigree()
+        if not project.append:
+            return families
+        existing = ParquetLoader._load_families(  # noqa: SLF001
+            fs_utils.join(cls._append_state_dir(project), "pedigree.parquet"))
+        return FamiliesData.from_families({
+            **dict(existing.items()), **dict(families.items()),
+        })
+
+    @classmethod
+    def _do_write_pedigree(cls, project: ImportProject) -> None:
+        layout = schema2_project_dataset_layout(project)
+        families = cls._get_dataset_families(project)
         partition_descriptor = cls._get_partition_description(project)
         fill_family_bins(families, partition_descriptor)
         dirname = os.path.dirname(layout.pedigree)
@@ -115,7 +262,7 @@ class Schema2ImportStorage(ImportStorage):
 
     @classmethod
     def _serialize_pedigree_schema(cls, project: ImportProject) -> str:
-        families = project.get_pedigree()
+        families = cls._get_dataset_families(project)
         partition_descriptor = cls._get_partition_description(project)
         fill_family_bins(families, partition_descriptor)
 
@@ -124,8 +271,44 @@ class Schema2ImportStorage(ImportStorage):
         return "\n".join([
             f"{f.name}|{f.type}" for f in pedigree_schema])
 
+    @classmethod
+    def _do_append_meta(cls, project: ImportProject) -> None:
+        """Update the meta data of a dataset with the appended families."""
+        layout = schema2_project_dataset_layout(project)
+        meta = cls.load_meta(project)
+
+        variants_types = project.get_variant_loader_types()
+        study_config = yaml.safe_load(meta["study"])
+        study_config["has_denovo"] = bool(study_config.get("has_denovo")) \
+            or project.has_denovo_variants()
+        study_config["has_cnv"] = bool(study_config.get("has_cnv")) \
+            or "cnv" in variants_types
+        study_config["has_transmitted"] = \
+            bool(study_config.get("has_transmitted")) \
+            or bool({"dae", "vcf"} & variants_types)
+
+        contigs = dict(
+            contig.split("=")
+            for contig in meta.get("contigs", "").split(",") if contig)
+        contigs.update({
+            chrom: str(length) for chrom, length
+            in project.get_variant_loader_chrom_lens().items()
+        })
+
+        append_meta_to_parquet(
+            layout.meta,
+            ["pedigree_schema", "study", "contigs"],
+            [
+                cls._serialize_pedigree_schema(project),
+                yaml.dump(study_config),
+                ",".join(f"{k}={v}" for k, v in contigs.items()),
+            ])
+
     @classmethod
     def _do_write_meta(cls, project: ImportProject) -> None:
+        if project.append:
+            cls._do_append_meta(project)
+            return
         layout = schema2_project_dataset_layout(project)
         gpf_instance = project.get_gpf_instance()
 
@@ -203,30 +386,122 @@ class Schema2ImportStorage(ImportStorage):
             blob_serializer=blob_serializer,
             bucket_index=bucket.index,
             row_group_size=row_group_size,
+            row_group_bytes=project.get_row_group_bytes(),
             include_reference=project.include_reference,
         )
 
+        annotation_cache = project.get_processing_annotation_cache()
+
         source: Source
         filters: list[Filter] = []
-        if batch_size == 0:
+        if batch_size == 0 and not project.append \
+                and annotation_cache is None:
             source = VariantsLoaderSource(variants_loader)
             filters.extend([
                 AnnotationPipelineVariantsFilter(annotation_pipeline),
                 Schema2VariantConsumer(writer),
             ])
         else:
+            # appended variants and cached annotations are looked up
+            # in batches
             source = VariantsLoaderBatchSource(
-                variants_loader, batch_size=batch_size)
+                variants_loader, batch_size=batch_size or cls.BATCH_SIZE)
+            annotation_filter: Filter = \
+                AnnotationPipelineVariantsBatchFilter(annotation_pipeline)
+            if annotation_cache is not None:
+                annotation_filter = CachedAnnotationVariantsBatchFilter(
+                    annotation_pipeline,
+                    AnnotationCache(
+                        annotation_cache,
+                        annotation_pipeline_fingerprint(annotation_pipeline)),
+                )
+            if project.append:
+                annotation_filter = StoredAnnotationVariantsBatchFilter(
+                    cast(
+                        AnnotationPipelineVariantsBatchFilter,
+                        annotation_filter),
+                    cls._stored_summary_filenames(project),
+                )
             filters.extend([
-                AnnotationPipelineVariantsBatchFilter(annotation_pipeline),
+                annotation_filter,
                 Schema2VariantBatchConsumer(writer),
             ])
 
         return PipelineProcessor(source, filters)
 
+    @staticmethod
+    def _bucket_checkpoint_filename(
+            project: ImportProject, bucket: Bucket) -> str:
+        return fs_utils.join(
+            project.work_dir, ".bucket-checkpoints", project.study_id,
+            f"bucket_index_{bucket.index:0>6}.json")
+
+    @staticmethod
+    def _bucket_output_filenames(
+            project: ImportProject, bucket: Bucket) -> list[str]:
+        layout = schema2_project_dataset_layout(project)
+        # merged files of appended buckets carry a bucket index as well
+        return sorted(
+            filename for filename in fs_utils.glob(fs_utils.join(
+                layout.study, "**",
+                f"*_bucket_index_{bucket.index:0>6}.parquet",
+            ))
+            if os.path.basename(filename).startswith(("summary_", "family_"))
+        )
+
+    @classmethod
+    def _is_bucket_written(
+        cls, project: ImportProject, bucket: Bucket, fingerprint: str,
+    ) -> bool:
+        """Check if a bucket is written with the same fingerprint."""
+        checkpoint_filename = cls._bucket_checkpoint_filename(project, bucket)
+        if not fs_utils.exists(checkpoint_filename):
+            return False
+        with fsspec.open(checkpoint_filename, "rt") as infile:
+            checkpoint = json.load(infile)
+        if checkpoint.get("fingerprint") != fingerprint:
+            return False
+        # outputs of the bucket are removed when they are merged
+        return all(
+            fs_utils.exists(filename)
+            for filename in checkpoint.get("outputs", [])
+        )
+
+    @classmethod
+    def _clean_bucket(cls, project: ImportProject, bucket: Bucket) -> None:
+        """Remove the checkpoint and outputs of a previous bucket write."""
+        checkpoint_filename = cls._bucket_checkpoint_filename(project, bucket)
+        for filename in [
+                checkpoint_filename,
+                *cls._bucket_output_filenames(project, bucket)]:
+            if fs_utils.exists(filename):
+                fs, path = url_to_fs(filename)
+                fs.rm_file(path)
+
+    @classmethod
+    def _write_bucket_checkpoint(
+        cls, project: ImportProject, bucket: Bucket, fingerprint: str,
+    ) -> None:
+        checkpoint_filename = cls._bucket_checkpoint_filename(project, bucket)
+        with fsspec.open(checkpoint_filename, "wt", auto_mkdir=True) as out:
+            json.dump({
+                "bucket": str(bucket),
+                "fingerprint": fingerprint,
+                "outputs": cls._bucket_output_filenames(project, bucket),
+            }, out, indent=2)
+
     @classmethod
     def _do_write_variant(
-            cls, project: ImportProject, bucket: Bucket) -> None:
+            cls, project: ImportProject, bucket: Bucket,
+            fingerprint: str | None = None) -> None:
+        if fingerprint is None:
+            fingerprint = project.get_bucket_fingerprint(bucket)
+        if cls._is_bucket_written(project, bucket, fingerprint):
+            logger.info(
+                "%s is not changed since it was written; skipping", bucket)
+            return
+        cls._clean_bucket(project, bucket)
+
         regions: list[Region] | None = None
         if bucket.region_bin is not None and \
                 bucket.region_bin not in {"none", "all"}:
@@ -241,6 +516,7 @@ class Schema2ImportStorage(ImportStorage):
         )
         with processing_pipeline as pipeline:
             pipeline.process(regions)
+        cls._write_bucket_checkpoint(project, bucket, fingerprint)
 
     @classmethod
     def _merge_parquets(
@@ -252,6 +528,12 @@ class Schema2ImportStorage(ImportStorage):
         partition_descriptor = cls._get_partition_description(project)
         row_group_size = project.get_row_group_size()
         logger.debug("argv.rows: %s", row_group_size)
+        merge_config = project.get_parquet_merge_config()
+        # appended variants are merged next to the existing merged files
+        merged_bucket_index = None
+        if project.append:
+            merged_bucket_index = \
+                cls._load_append_state(project)["bucket_index"]
 
         layout = schema2_project_dataset_layout(project)
 
@@ -264,7 +546,7 @@ class Schema2ImportStorage(ImportStorage):
             output_parquet_file = fs_utils.join(
                 variants_dir,
                 partition_descriptor.partition_filename(
-                    "merged", partition, bucket_index=None,
+                    "merged", partition, bucket_index=merged_bucket_index,
                 ),
             )
 
@@ -272,10 +554,15 @@ class Schema2ImportStorage(ImportStorage):
                 variants_dir, output_parquet_file,
                 row_group_size=row_group_size,
                 variants_type=variants_type,
+                **merge_config,
             )
 
     def _build_all_parquet_tasks(
             self, project: ImportProject, graph: TaskGraph) -> list[Task]:
+        buckets = project.get_import_variants_buckets()
+        if project.append:
+            buckets = self._append_buckets(project, buckets)
+
         pedigree_task = graph.create_task(
             "write_pedigree", self._do_write_pedigree,
             args=[project], deps=[],
@@ -285,24 +572,39 @@ class Schema2ImportStorage(ImportStorage):
             "write_meta", self._do_write_meta,
             args=[project], deps=[])
 
-        bucket_tasks = []
-        for bucket in project.get_import_variants_buckets():
+        reference_genome = project.get_gpf_instance().reference_genome
+        chromosome_lengths = reference_genome.get_all_chrom_lengths()
+        part_desc = project.get_partition_descriptor()
+
+        # inputs are fingerprinted once here instead of in every bucket task
+        file_fingerprints: dict[str, str] = {}
+        bucket_tasks: list[tuple[Task, set[str] | None]] = []
+        for bucket in buckets:
             task = graph.create_task(
                 f"write_variants_{bucket}", self._do_write_variant,
-                args=[project, bucket], deps=[],
+                args=[
+                    project, bucket,
+                    project.get_bucket_fingerprint(bucket, file_fingerprints),
+                ],
+                deps=[],
                 input_files=project.get_input_filenames(bucket),
             )
-            bucket_tasks.append(task)
+            bucket_tasks.append((
+                task,
+                self._bucket_region_bins(
+                    bucket, part_desc, chromosome_lengths),
+            ))
+
+        def region_bin_deps(region_bin: str | None) -> list[Task]:
+            # merging of a region bin waits only for the buckets that
+            # could write variants into it
+            return [
+                task for task, region_bins in bucket_tasks
+                if region_bin is None or region_bins is None
+                or region_bin in region_bins
+            ]
 
         # merge small parquet files into larger ones
-        bucket_sync = graph.create_task(
-            "sync_parquet_write", sync_tasks,
-            args=[], deps=bucket_tasks,
-        )
-
-        reference_genome = project.get_gpf_instance().reference_genome
-        chromosome_lengths = reference_genome.get_all_chrom_lengths()
-        part_desc = project.get_partition_descriptor()
         summary_merge_tasks = []
         for region_bin, group in itertools.groupby(
                 part_desc.build_summary_partitions(chromosome_lengths),
@@ -314,7 +616,7 @@ class Schema2ImportStorage(ImportStorage):
                 f"merge_parquet_files_summary_region_bin_{region_bin}",
                 self._merge_parquets,
                 args=[project, "summary", partitions],
-                deps=[bucket_sync],
+                deps=region_bin_deps(region_bin),
             )
             summary_merge_tasks.append(task)
 
@@ -330,17 +632,51 @@ class Schema2ImportStorage(ImportStorage):
                 f"merge_parquet_files_family_{region_bin}",
                 self._merge_parquets,
                 args=[project, "family", partitions],
-                deps=[bucket_sync],
+                deps=region_bin_deps(region_bin),
             )
             family_merge_tasks.append(task)
 
         all_parquet_task = graph.create_task(
             "all_parquet_tasks", sync_tasks,
             args=[],
-            deps=[*summary_merge_tasks, *family_merge_tasks, bucket_sync],
+            deps=[
+                *summary_merge_tasks, *family_merge_tasks,
+                *(task for task, _ in bucket_tasks),
+            ],
         )
         return [pedigree_task, meta_task, all_parquet_task]
 
+    @staticmethod
+    def _bucket_region_bins(
+        bucket: Bucket,
+        part_desc: PartitionDescriptor,
+        chromosome_lengths: dict[str, int],
+    ) -> set[str] | None:
+        """Return the region bins a bucket could write variants into.
+
+        Returns None when the bucket could write into any region bin.
+        """
+        if not part_desc.has_region_bins() \
+                or bucket.region_bin in {"none", "all"} \
+                or not bucket.regions:
+            return None
+        result: set[str] = set()
+        for region_str in bucket.regions:
+            region = Region.from_str(region_str)
+            chrom_length = chromosome_lengths.get(region.chrom)
+            if chrom_length is None:
+                return None
+            # variants overlapping the start of a region are loaded with it,
+            # so the region bin before the one containing the region start
+            # is included as well; variants are expected to be shorter
+            # than a region bin
+            start = max(1, (region.start or 1) - part_desc.region_length)
+            result.update(part_desc.region_to_region_bins(
+                Region(region.chrom, start, region.stop or chrom_length),
+                chromosome_lengths,
+            ))
+        return result
+
     def generate_import_task_graph(
             self, project: ImportProject) -> TaskGraph:
         graph = TaskGraph()
@@ -358,12 +694,25 @@ class Schema2ImportStorage(ImportStorage):
         *,
         allow_repeated_attributes: bool = False,
         full_reannotation: bool = False,
+        annotation_cache: str | None = None,
+        graph: TaskGraph | None = None,
+        annotation_pipeline: AnnotationPipeline | None = None,
+        task_prefix: str = "",
+        split_regions: bool = True,
     ) -> TaskGraph:
-        """Generate TaskGraph for reannotation of a given study."""
-        graph = TaskGraph()
-
-        pipeline = construct_import_annotation_pipeline(gpf_instance,
-                                                        work_dir=work_dir)
+        """Generate TaskGraph for reannotation of a given study.
+
+        The tasks are added to `graph` when one is passed; their names
+        start with `task_prefix`, so several studies can be reannotated in
+        a single task graph.
+        """
+        if graph is None:
+            graph = TaskGraph()
+
+        pipeline = annotation_pipeline
+        if pipeline is None:
+            pipeline = construct_import_annotation_pipeline(
+                gpf_instance, work_dir=work_dir)
         study_layout = create_schema2_dataset_layout(study_dir)
         backup_layout = backup_schema2_study(study_dir)
         loader = ParquetLoader(backup_layout)
@@ -383,11 +732,14 @@ class Schema2ImportStorage(ImportStorage):
                 "region_size": region_size,
                 "allow_repeated_attributes": allow_repeated_attributes,
                 "full_reannotation": full_reannotation,
+                "annotation_cache": annotation_cache,
             },
+            task_prefix=task_prefix,
+            split_regions=split_regions,
         )
 
         annotation_sync = graph.create_task(
-            "sync_parquet_write", sync_tasks,
+            f"{task_prefix}sync_parquet_write", sync_tasks,
             args=[], deps=annotation_tasks,
         )
 
@@ -397,6 +749,7 @@ class Schema2ImportStorage(ImportStorage):
             gpf_instance.reference_genome,
             loader,
             study_layout,
+            task_prefix=task_prefix,
         )
         return graph
 
@@ -0,0 +1,193 @@
+"""On-disk cache of genotype group families and person sets.
+
+Building the families of a genotype data group combines the families of all
+its child studies, recomputes layouts and tags for every merged family and
+builds the group person set collections. This work is the same for every
+process that loads a GPF instance. The cache stores the result as a pickle
+once per instance version, so other processes (e.g. web server workers)
+unpickle it instead of combining the families again.
+
+The cache saves CPU time only. It is not a shared or memory-mapped
+snapshot: every process still unpickles its own copy, so the memory used by
+each process does not change. The pedigrees of the leaf studies are still
+loaded in every process, and computing the fingerprint reads all persons of
+the leaf studies. Sharing families between worker processes would need a
+columnar representation of FamiliesData and is not implemented.
+
+Snapshots are keyed by a fingerprint of the group configuration, the
+configurations of all its child studies and the pedigree data of the leaf
+studies. Any change to these produces a new fingerprint and a new snapshot.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle  # noqa: S403
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import psutil
+from filelock import FileLock
+
+from gpf import __version__
+from gpf.pedigrees.families_data import FamiliesData
+from gpf.person_sets import (
+    PersonSetCollection,
+    parse_person_set_collections_study_config,
+)
+
+if TYPE_CHECKING:
+    from gpf.studies.study import GenotypeData
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_SUFFIX = ".families.pickle"
+
+
+@dataclass
+class FamiliesSnapshot:
+    """Families and person set collections of a genotype data group."""
+
+    families: FamiliesData
+    person_set_collections: dict[str, PersonSetCollection]
+
+
+def _person_set_collection_ids(config: dict[str, Any]) -> set[str]:
+    if "person_set_collections" not in config:
+        return set()
+    try:
+        return set(parse_person_set_collections_study_config(config))
+    except ValueError:
+        return set()
+
+
+def _update_families_fingerprint(
+    sha256: Any,
+    families: FamiliesData,
+    excluded_attributes: set[str],
+) -> None:
+    for family in families.values():
+        for person in family.full_members:
+            # pylint: disable=protected-access
+            attributes = person._attributes  # noqa: SLF001
+            sha256.update(repr(sorted(
+                (key, str(value))
+                for key, value in attributes.items()
+                if key not in excluded_attributes
+            )).encode())
+
+
+def families_fingerprint(
+    config: dict[str, Any],
+    studies: list[GenotypeData],
+) -> str:
+    """Compute a fingerprint of the inputs of a group families snapshot.
+
+    Covers the GPF version, the group config, the configs of all child
+    studies and groups and the pedigree data of all leaf studies.
+    Attributes assigned while building person set collections are excluded,
+    so the fingerprint does not depend on whether the child person set
+    collections are already built.
+    """
+    sha256 = hashlib.sha256()
+    sha256.update(f"{__version__}:{SNAPSHOT_FORMAT_VERSION}".encode())
+
+    def update_config(study_config: dict[str, Any]) -> None:
+        sha256.update(json.dumps(
+            study_config, sort_keys=True, default=str).encode())
+
+    def to_dict(study_config: Any) -> dict[str, Any]:
+        if hasattr(study_config, "to_dict"):
+            return dict(study_config.to_dict())
+        return dict(study_config)
+
+    update_config(to_dict(config))
+    excluded_attributes = {"member_index"} | _person_set_collection_ids(
+        config)
+
+    leaves: list[GenotypeData] = []
+    pending = list(studies)
+    while pending:
+        study = pending.pop(0)
+        study_config = to_dict(study.config)
+        update_config(study_config)
+        excluded_attributes |= _person_set_collection_ids(study_config)
+        if study.is_group:
+            pending.extend(study.studies)
+        else:
+            leaves.append(study)
+
+    for study in leaves:
+        sha256.update(study.study_id.encode())
+        _update_families_fingerprint(
+            sha256, study.families, excluded_attributes)
+    return sha256.hexdigest()
+
+
+def process_rss_mb() -> float:
+    """Return the resident memory of the current process in MB."""
+    return psutil.Process().memory_info().rss / 1024 / 1024
+
+
+class FamiliesSnapshotCache:
+    """Directory of pickled families snapshots of genotype data groups."""
+
+    def __init__(self, cache_dir: str | Path) -> None:
+        self.cache_dir = Path(cache_dir)
+
+    def snapshot_path(self, study_id: str, fingerprint: str) -> Path:
+        return self.cache_dir / f"{study_id}-{fingerprint}{SNAPSHOT_SUFFIX}"
+
+    @contextmanager
+    def lock(self, study_id: str) -> Iterator[None]:
+        """Serialize building of a group snapshot between processes.
+
+        The first process to take the lock builds and saves the snapshot;
+        the others wait and load it instead of building it again.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with FileLock(self.cache_dir / f"{study_id}.lock"):
+            yield
+
+    def load(
+        self, study_id: str, fingerprint: str,
+    ) -> FamiliesSnapshot | None:
+        """Load a snapshot; return None if missing or unreadable."""
+        path = self.snapshot_path(study_id, fingerprint)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as infile:
+                snapshot = pickle.load(infile)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(
+                "unable to load families snapshot %s; rebuilding", path)
+            return None
+        if not isinstance(snapshot, FamiliesSnapshot):
+            logger.warning("invalid families snapshot %s; rebuilding", path)
+            return None
+        logger.info("loaded families snapshot for %s: %s", study_id, path)
+        return snapshot
+
+    def save(
+        self, study_id: str, fingerprint: str,
+        snapshot: FamiliesSnapshot,
+    ) -> None:
+        """Atomically store a snapshot and drop stale ones of the group."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.snapshot_path(study_id, fingerprint)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as outfile:
+            pickle.dump(snapshot, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+        for stale in self.cache_dir.glob(f"{study_id}-*{SNAPSHOT_SUFFIX}"):
+            if stale != path and stale.name[len(study_id) + 1:-len(
+                    SNAPSHOT_SUFFIX)].isalnum():
+                stale.unlink(missing_ok=True)
+        logger.info("saved families snapshot for %s: %s", study_id, path)
@@ -15,6 +15,7 @@ from gpf.configuration.schemas.study_config import study_config_schema
 from gpf.genotype_storage.genotype_storage_registry import (
     GenotypeStorageRegistry,
 )
+from gpf.studies.families_snapshot import FamiliesSnapshotCache
 from gpf.studies.study import GenotypeData, GenotypeDataGroup, GenotypeDataStudy
 
 logger = logging.getLogger(__name__)
@@ -245,9 +246,11 @@ class VariantsDb:
         gene_models: GeneModels,
         annotation: list[Attribute],
         storage_registry: GenotypeStorageRegistry,
+        families_snapshots: FamiliesSnapshotCache | None = None,
     ) -> None:
 
         self.dae_config = dae_config
+        self.families_snapshots = families_snapshots
 
         assert genome is not None
         assert gene_models is not None
@@ -564,7 +567,8 @@ class VariantsDb:
             assert group_studies
 
             genotype_group = GenotypeDataGroup(
-                self.storage_registry, group_config, group_studies)
+                self.storage_registry, group_config, group_studies,
+                families_snapshots=self.families_snapshots)
             self._genotype_group_cache[group_config.id] = genotype_group
         except Exception:  # pylint: disable=broad-except
             logger.exception(
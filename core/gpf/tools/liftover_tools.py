@@ -1,12 +1,17 @@
 import abc
 import argparse
+import heapq
+import itertools
 import logging
+import os
 import pathlib
+import shutil
 import sys
 import tempfile
 import textwrap
-from contextlib import closing
-from typing import cast
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, closing
+from typing import Any, TextIO, cast
 
 import pysam
 from gain.annotation.annotatable import (
@@ -34,8 +39,14 @@ from gain.genomic_resources.reference_genome import (
 )
 from gain.genomic_resources.repository_factory import (
     GenomicResourceRepo,
+    build_genomic_resource_repository,
 )
-from gain.utils.regions import Region
+from gain.task_graph.cli_tools import (
+    TaskGraphCli,
+    task_graph_run_with_results,
+)
+from gain.task_graph.graph import TaskGraph
+from gain.utils.regions import Region, split_into_regions
 from gain.utils.verbosity_configuration import VerbosityConfiguration
 
 from gpf.pedigrees.loader import FamiliesLoader
@@ -94,6 +105,46 @@ def _region_output_filename(
     return f"{output_prefix}_{region_str}{suffix}"
 
 
+def _split_output(infile: TextIO) -> tuple[list[str], Iterator[str]]:
+    """Split a liftover output into header lines and data lines.
+
+    The first line of every liftover output is a header; VCF outputs
+    continue with further ``#`` lines.
+    """
+    header: list[str] = []
+    for line in infile:
+        if header and not line.startswith("#"):
+            return header, itertools.chain([line], infile)
+        header.append(line)
+    return header, iter([])
+
+
+def _liftover_partition_task(
+    tool_class: type["LiftoverTool"],
+    cli_args: argparse.Namespace,
+    grr: GenomicResourceRepo | dict[str, Any],
+    region: Region,
+) -> list[str]:
+    """Liftover a single source region into sorted partition outputs.
+
+    Runs inside a task graph worker; each worker opens its own copy of the
+    genomes and the liftover chain.
+    """
+    if isinstance(grr, dict):
+        grr = build_genomic_resource_repository(grr)
+    tool = tool_class()
+    tool.cli_args = cli_args
+    tool.partition_mode = True
+    tool.open_resources(grr)
+
+    os.makedirs(os.path.dirname(cli_args.output), exist_ok=True)
+    tool.liftover_variants(region)
+    output_filenames = tool.output_filenames(region)
+    for output_filename in output_filenames:
+        tool.sort_output(output_filename)
+    return output_filenames
+
+
 class LiftoverTool(abc.ABC):
     """Liftover tools base class."""
 
@@ -108,6 +159,7 @@ class LiftoverTool(abc.ABC):
         self.source_genome: ReferenceGenome | None = None
         self.target_genome: ReferenceGenome | None = None
         self.chain: LiftoverChain | None = None
+        self.partition_mode = False
 
     def build_liftover_pipeline(
         self,
@@ -185,8 +237,50 @@ class LiftoverTool(abc.ABC):
             help="mode to use for liftover: 'bcf_liftover' or 'basic_liftover'",
         )
 
+        parser.add_argument(
+            "-j", "--jobs",
+            type=int,
+            default=1,
+            help="number of parallel workers; when greater than 1 the "
+            "source is partitioned by region, each partition is lifted "
+            "over by a separate worker and the sorted partition outputs "
+            "are merged per target contig [default: 1]",
+        )
+
+        parser.add_argument(
+            "--region-size",
+            type=int,
+            default=50_000_000,
+            help="size of the source regions to partition by when running "
+            "with more than one job [default: 50000000]",
+        )
+
+        parser.add_argument(
+            "-w", "--work-dir",
+            type=str,
+            default=None,
+            help="directory to store partition outputs in when running "
+            "with more than one job [default: next to the output]",
+        )
+
         return parser
 
+    def open_resources(self, grr: GenomicResourceRepo) -> None:
+        """Open the source and target genomes and the liftover chain."""
+        self.grr = grr
+
+        self.source_genome = build_reference_genome_from_resource(
+            grr.get_resource(self.cli_args.source_genome))
+        self.source_genome.open()
+
+        self.target_genome = build_reference_genome_from_resource(
+            grr.get_resource(self.cli_args.target_genome))
+        self.target_genome.open()
+
+        self.chain = build_liftover_chain_from_resource(
+            grr.get_resource(self.cli_args.chain))
+        self.chain.open()
+
     def run(self,
         argv: list[str] | None = None,
         grr: GenomicResourceRepo | None = None,
@@ -208,25 +302,101 @@ class LiftoverTool(abc.ABC):
             grr = genomic_context.get_genomic_resources_repository()
         if grr is None:
             raise ValueError("no valid GRR configured")
-        self.grr = grr
-
-        self.source_genome = build_reference_genome_from_resource(
-            grr.get_resource(self.cli_args.source_genome))
-        self.source_genome.open()
-
-        self.target_genome = build_reference_genome_from_resource(
-            grr.get_resource(self.cli_args.target_genome))
-        self.target_genome.open()
-
-        self.chain = build_liftover_chain_from_resource(
-            grr.get_resource(self.cli_args.chain))
-        self.chain.open()
+        self.open_resources(grr)
 
         region = None
         if self.cli_args.region is not None:
             region = Region.from_str(self.cli_args.region)
 
-        self.liftover_variants(region)
+        if self.cli_args.jobs > 1:
+            self.liftover_variants_parallel(region)
+        else:
+            self.liftover_variants(region)
+
+    def source_contigs(self) -> list[str]:
+        """Return the source contigs to partition the input by."""
+        assert self.source_genome is not None
+        return list(self.source_genome.chromosomes)
+
+    def partition_regions(self, region: Region | None = None) -> list[Region]:
+        """Split the source genome into regions lifted over in parallel."""
+        assert self.source_genome is not None
+        region_size = self.cli_args.region_size
+        regions: list[Region] = []
+        for contig in self.source_contigs():
+            contig_length = self.source_genome.get_chrom_length(contig)
+            if region_size <= 0:
+                regions.append(Region(contig, 1, contig_length))
+            else:
+                regions.extend(
+                    split_into_regions(contig, contig_length, region_size))
+        if region is None:
+            return regions
+        if region.start is None or region.stop is None:
+            return [r for r in regions if r.chrom == region.chrom]
+        return list(filter(None, [
+            region.intersection(r) for r in regions]))
+
+    def liftover_variants_parallel(
+        self,
+        region: Region | None = None,
+    ) -> None:
+        """Liftover variants partitioned by region over a task graph.
+
+        Every partition is lifted over by a separate task into its own
+        output, which the task sorts by target position. The sorted
+        partition outputs are then merged per target contig into the
+        final outputs.
+        """
+        assert self.grr is not None
+        output_filenames = self.output_filenames(region)
+        output_dir = os.path.dirname(
+            os.path.abspath(output_filenames[0]))
+        work_dir = self.cli_args.work_dir or output_dir
+        os.makedirs(work_dir, exist_ok=True)
+        partitions_dir = tempfile.mkdtemp(
+            prefix=".liftover-", dir=work_dir)
+        grr_definition = self.grr.definition \
+            if self.grr.definition is not None else self.grr
+
+        graph = TaskGraph()
+        for index, partition in enumerate(self.partition_regions(region)):
+            partition_output = os.path.join(
+                partitions_dir, f"part_{index:06d}",
+                os.path.basename(self.cli_args.output))
+            partition_args = argparse.Namespace(**{
+                **vars(self.cli_args),
+                "output": partition_output,
+                "jobs": 1,
+            })
+            graph.create_task(
+                f"liftover_part_{index:06d}",
+                _liftover_partition_task,
+                args=[type(self), partition_args, grr_definition, partition],
+                deps=[],
+            )
+        logger.info(
+            "lifting over %d partitions in %s",
+            len(graph.tasks), partitions_dir)
+
+        partition_outputs: list[list[str]] = []
+        with TaskGraphCli.create_executor(jobs=self.cli_args.jobs) \
+                as executor:
+            for result in task_graph_run_with_results(graph, executor):
+                if isinstance(result, Exception):
+                    raise result
+                partition_outputs.append(result)
+        # partition directories are numbered in source order, which keeps
+        # the merge stable for variants lifted over to the same position
+        partition_outputs.sort()
+
+        for index, output_filename in enumerate(output_filenames):
+            logger.info("merging partitions into: %s", output_filename)
+            self.merge_outputs(
+                [outputs[index] for outputs in partition_outputs],
+                output_filename,
+            )
+        shutil.rmtree(partitions_dir)
 
     @abc.abstractmethod
     def liftover_variants(
@@ -235,6 +405,57 @@ class LiftoverTool(abc.ABC):
     ) -> None:
         """Liftover variants abstract method."""
 
+    @abc.abstractmethod
+    def output_filenames(self, region: Region | None = None) -> list[str]:
+        """Return the output files produced for a region."""
+
+    def target_locus(self, fields: list[str]) -> tuple[str, int]:
+        """Return the target chromosome and position of an output line."""
+        return fields[0], int(fields[1])
+
+    def _sort_key(
+        self, contig_order: dict[str, int],
+    ) -> Callable[[str], tuple[int, str, int]]:
+        def key(line: str) -> tuple[int, str, int]:
+            chrom, pos = self.target_locus(line.split("\t", 2))
+            return contig_order.get(chrom, len(contig_order)), chrom, pos
+        return key
+
+    def _target_contig_order(self) -> dict[str, int]:
+        assert self.target_genome is not None
+        return {
+            contig: index
+            for index, contig in enumerate(self.target_genome.chromosomes)
+        }
+
+    def sort_output(self, filename: str) -> None:
+        """Sort an output file in place by target contig and position."""
+        with open(filename, "rt") as infile:
+            header, lines = _split_output(infile)
+            data = sorted(
+                lines, key=self._sort_key(self._target_contig_order()))
+        with open(filename, "wt") as outfile:
+            outfile.writelines(header)
+            outfile.writelines(data)
+
+    def merge_outputs(
+        self, filenames: list[str], output_filename: str,
+    ) -> None:
+        """Merge sorted partition outputs into a single sorted output."""
+        with ExitStack() as stack:
+            headers = []
+            streams = []
+            for filename in filenames:
+                infile = stack.enter_context(open(filename, "rt"))
+                header, lines = _split_output(infile)
+                headers.append(header)
+                streams.append(lines)
+            outfile = stack.enter_context(open(output_filename, "wt"))
+            if headers:
+                outfile.writelines(headers[0])
+            outfile.writelines(heapq.merge(
+                *streams, key=self._sort_key(self._target_contig_order())))
+
 
 class CNVLiftoverTool(LiftoverTool):
     """CNV liftover tool class."""
@@ -261,9 +482,7 @@ class CNVLiftoverTool(LiftoverTool):
             CNVLoader, self.cli_args, self.source_genome)
 
         assert isinstance(variants_loader, CNVLoader)
-        output_filename = _region_output_filename(
-            self.cli_args.output, region,
-        )
+        [output_filename] = self.output_filenames(region)
         assert self.grr is not None
         pipeline = self.build_liftover_pipeline(self.grr)
 
@@ -337,6 +556,15 @@ class CNVLiftoverTool(LiftoverTool):
                         output.write("\t".join(line))
                         output.write("\n")
 
+    def output_filenames(self, region: Region | None = None) -> list[str]:
+        """Return the CNV output file produced for a region."""
+        return [_region_output_filename(self.cli_args.output, region)]
+
+    def target_locus(self, fields: list[str]) -> tuple[str, int]:
+        """Return the target location of a CNV output line."""
+        chrom, interval = fields[0].rsplit(":", 1)
+        return chrom, int(interval.split("-", 1)[0])
+
 
 def cnv_liftover_main(
     argv: list[str] | None = None,
@@ -381,15 +609,10 @@ class DaeLiftoverTool(LiftoverTool):
 
         assert isinstance(variants_loader, DaeTransmittedLoader)
 
-        output_prefix = self.cli_args.output
-        summary_filename = f"{output_prefix}.txt"
-        toomany_filename = f"{output_prefix}-TOOMANY.txt"
+        summary_filename, toomany_filename = self.output_filenames(region)
         if region is not None:
             logger.info("resetting regions (region): %s", region)
             variants_loader.reset_regions([region])
-            region_str = str(region).replace(":", "_").replace("-", "_")
-            summary_filename = f"{output_prefix}-{region_str}.txt"
-            toomany_filename = f"{output_prefix}-TOOMANY-{region_str}.txt"
         logger.info("summary output: %s", summary_filename)
         logger.info("toomany output: %s", toomany_filename)
 
@@ -472,6 +695,20 @@ class DaeLiftoverTool(LiftoverTool):
                     output_toomany.write("\t".join(toomany_line))
                     output_toomany.write("\n")
 
+    def output_filenames(self, region: Region | None = None) -> list[str]:
+        """Return the summary and TOOMANY output files for a region."""
+        output_prefix = self.cli_args.output
+        if region is None:
+            return [
+                f"{output_prefix}.txt",
+                f"{output_prefix}-TOOMANY.txt",
+            ]
+        region_str = str(region).replace(":", "_").replace("-", "_")
+        return [
+            f"{output_prefix}-{region_str}.txt",
+            f"{output_prefix}-TOOMANY-{region_str}.txt",
+        ]
+
 
 def dae_liftover_main(
     argv: list[str] | None = None,
@@ -509,9 +746,7 @@ class DenovoLiftoverTool(LiftoverTool):
             DenovoLoader, self.cli_args, self.source_genome)
 
         assert isinstance(variants_loader, DenovoLoader)
-        output_filename = _region_output_filename(
-            self.cli_args.output, region,
-        )
+        [output_filename] = self.output_filenames(region)
         assert self.grr is not None
         pipeline = self.build_liftover_pipeline(self.grr)
 
@@ -572,6 +807,10 @@ class DenovoLiftoverTool(LiftoverTool):
                     output.write("\t".join(line))
                     output.write("\n")
 
+    def output_filenames(self, region: Region | None = None) -> list[str]:
+        """Return the denovo output file produced for a region."""
+        return [_region_output_filename(self.cli_args.output, region)]
+
 
 def denovo_liftover_main(
     argv: list[str] | None = None,
@@ -607,9 +846,7 @@ class VCFLiftoverTool(LiftoverTool):
         """Liftover CNV variants method."""
         assert self.source_genome is not None
 
-        output_filename = _region_output_filename(
-            self.cli_args.output, region,
-        )
+        [output_filename] = self.output_filenames(region)
         assert self.target_genome is not None
         assert self.source_genome is not None
         assert self.chain is not None
@@ -631,6 +868,13 @@ class VCFLiftoverTool(LiftoverTool):
                     output_filename, "w", header=output_header)) as outfile:
             fetch_region = str(region) if region else None
             for vcf_variant in infile.fetch(region=fetch_region):
+                if self.partition_mode and region is not None \
+                        and region.start is not None \
+                        and vcf_variant.pos < region.start:
+                    # fetch returns records overlapping the region; in
+                    # partition mode a record belongs to the partition it
+                    # starts in, so that no record is lifted over twice
+                    continue
                 if vcf_variant.alts is None:
                     logger.warning(
                         "skipping variant without alts: %s", vcf_variant)
@@ -670,6 +914,19 @@ class VCFLiftoverTool(LiftoverTool):
                         self.report_variant(lo_variant))
                     raise
 
+    def output_filenames(self, region: Region | None = None) -> list[str]:
+        """Return the VCF output file produced for a region."""
+        return [_region_output_filename(self.cli_args.output, region)]
+
+    def source_contigs(self) -> list[str]:
+        """Return the source genome contigs present in the input VCF."""
+        with closing(pysam.VariantFile(self.cli_args.vcffile)) as infile:
+            vcf_contigs = set(infile.header.contigs)
+        return [
+            contig for contig in super().source_contigs()
+            if contig in vcf_contigs
+        ]
+
     @staticmethod
     def report_vcf_variant(vcf_variant: pysam.VariantRecord) -> str:
         """Report VCF variant."""
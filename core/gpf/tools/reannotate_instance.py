@@ -1,6 +1,5 @@
 import argparse
 import logging
-import os
 import pathlib
 import sys
 from typing import Any, cast
@@ -12,6 +11,7 @@ from gain.genomic_resources.genomic_context import (
     get_genomic_context,
 )
 from gain.task_graph.cli_tools import TaskGraphCli
+from gain.task_graph.graph import TaskGraph
 from gain.utils.verbosity_configuration import VerbosityConfiguration
 
 from gpf.duckdb_storage.duckdb2_variants import DuckDb2Variants
@@ -22,6 +22,7 @@ from gpf.duckdb_storage.duckdb_storage_helpers import (
     PARQUET_SCAN,
 )
 from gpf.gpf_instance.gpf_instance import GPFInstance
+from gpf.import_tools.import_tools import construct_import_annotation_pipeline
 from gpf.parquet_storage.storage import ParquetLoaderVariants
 from gpf.schema2_storage.schema2_import_storage import Schema2ImportStorage
 from gpf.studies.study import GenotypeData, GenotypeDataStudy
@@ -59,7 +60,9 @@ class ReannotateInstanceTool:
         )
         parser.add_argument(
             "-r", "--region-size", default=300_000_000,
-            type=int, help="region size to parallelize by",
+            type=int,
+            help="region size to parallelize the largest study by; "
+                 "smaller studies use proportionally larger regions",
         )
         parser.add_argument(
             "-w", "--work-dir",
@@ -80,6 +83,12 @@ class ReannotateInstanceTool:
                  " a full reannotation.",
             action="store_true",
         )
+        parser.add_argument(
+            "--annotation-cache",
+            default=None,
+            help="Local database file caching the annotation of alleles "
+                 "across the reannotated studies.",
+        )
 
         TaskGraphCli.add_arguments(parser)
         VerbosityConfiguration.set_arguments(parser)
@@ -168,6 +177,14 @@ class ReannotateInstanceTool:
             path = path.parent
         return str(path.parent)
 
+    @staticmethod
+    def _get_summary_size(study_dir: str) -> int:
+        """Return the size of the summary variants files of a study."""
+        return sum(
+            path.stat().st_size
+            for path in pathlib.Path(study_dir, "summary").rglob("*.parquet")
+        )
+
     def run(self) -> None:
         """Run the tool."""
         if self.gpf_instance is None:
@@ -191,25 +208,45 @@ class ReannotateInstanceTool:
         if self.args.dry_run:
             return
 
-        for study in reannotatable_data:
-            task_status_dir = os.path.join(
-                self.args.work_dir, ".task-progress", study.study_id)
-            task_log_dir = os.path.join(
-                self.args.work_dir, ".task-log", study.study_id)
-            pipeline_work_dir = pathlib.Path(
-                self.args.work_dir, "work", study.study_id)
-            study_dir = self._get_parquet_dir(study, self.gpf_instance)
-            graph = Schema2ImportStorage.generate_reannotate_task_graph(
-                self.gpf_instance, study_dir,
-                self.args.region_size,
-                pipeline_work_dir,
+        work_dir = pathlib.Path(self.args.work_dir)
+        pipeline = construct_import_annotation_pipeline(
+            self.gpf_instance, work_dir=work_dir / "work")
+        genome = self.gpf_instance.reference_genome
+        genome_length = sum(
+            genome.get_chrom_length(chrom) for chrom in genome.chromosomes)
+
+        study_dirs = {
+            study.study_id: self._get_parquet_dir(study, self.gpf_instance)
+            for study in reannotatable_data
+        }
+        sizes = {
+            study_id: self._get_summary_size(study_dir)
+            for study_id, study_dir in study_dirs.items()
+        }
+        largest = max(sizes.values())
+
+        graph = TaskGraph()
+        # the largest studies are scheduled first; smaller studies are split
+        # into larger regions so that all tasks have similar amount of work
+        for study_id in sorted(sizes, key=sizes.__getitem__, reverse=True):
+            region_size = \
+                self.args.region_size * largest // max(sizes[study_id], 1)
+            Schema2ImportStorage.generate_reannotate_task_graph(
+                self.gpf_instance, study_dirs[study_id],
+                region_size,
+                work_dir / "work",
                 allow_repeated_attributes=self.args.allow_repeated_attributes,
                 full_reannotation=self.args.full_reannotation,
+                annotation_cache=self.args.annotation_cache,
+                graph=graph,
+                annotation_pipeline=pipeline,
+                task_prefix=f"{study_id}_",
+                split_regions=region_size < genome_length,
             )
-            kwargs = {**vars(self.args),
-                      "task_status_dir": task_status_dir,
-                      "task_log_dir": task_log_dir}
-            TaskGraphCli.process_graph(graph, **kwargs)
+        kwargs = {**vars(self.args),
+                  "task_status_dir": str(work_dir / ".task-progress"),
+                  "task_log_dir": str(work_dir / ".task-log")}
+        TaskGraphCli.process_graph(graph, **kwargs)
 
 
 def cli(
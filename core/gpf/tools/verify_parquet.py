@@ -5,11 +5,22 @@ import argparse
 import dataclasses
 import datetime
 import functools
+import hashlib
 import json
 import logging
+import multiprocessing
 import os
-from concurrent.futures import ThreadPoolExecutor
+import struct
+import time
+from collections.abc import Iterator
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from dataclasses import dataclass
+from typing import Any
 
 import pyarrow as pa
 import pyarrow.parquet as pq
@@ -20,8 +31,16 @@ EXIT_FAILURES = 1
 EXIT_USAGE = 2
 
 PARQUET_SUFFIX = ".parquet"
+PARQUET_MAGIC = b"PAR1"
 
 DEFAULT_JOBS_CAP = 8
+DEFAULT_DEEP_BATCH_SIZE = 65_536
+
+MANIFEST_VERSION = 1
+
+EXECUTOR_AUTO = "auto"
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
 
 logger = logging.getLogger("verify_parquet")
 
@@ -35,16 +54,70 @@ class FileResult:
     error_class: str | None = None
     message: str | None = None
     row_group: int | None = None
+    size: int | None = None
+    mtime_ns: int | None = None
+    footer_checksum: str | None = None
+    cached: bool | None = None
+
+
+@dataclass
+class ManifestEntry:
+    """Fingerprint of a parquet file that passed verification."""
+
+    size: int
+    mtime_ns: int
+    footer_checksum: str
+    deep: bool
+
+
+def parquet_footer_checksum(path: str) -> str:
+    """Return a SHA-256 hex digest of the parquet footer of a file.
+
+    The footer is the serialized file metadata followed by its 4-byte
+    length and the trailing ``PAR1`` magic. It covers the schema and the
+    offsets and statistics of every row group, so any rewrite of the file
+    changes it. Reading it costs a single seek regardless of the file size.
+    """
+    with open(path, "rb") as infile:
+        infile.seek(0, os.SEEK_END)
+        size = infile.tell()
+        if size < 12:
+            raise OSError(f"file too small to be a parquet file: {path}")
+        infile.seek(size - 8)
+        tail = infile.read(8)
+        if tail[4:] != PARQUET_MAGIC:
+            raise OSError(f"parquet magic bytes not found in footer: {path}")
+        footer_length = struct.unpack("<I", tail[:4])[0]
+        if footer_length + 12 > size:
+            raise OSError(f"invalid parquet footer length: {path}")
+        infile.seek(size - 8 - footer_length)
+        footer = infile.read(footer_length + 8)
+    return hashlib.sha256(footer).hexdigest()
+
+
+def _fingerprint(path: str, result: FileResult) -> FileResult:
+    """Attach size, mtime and footer checksum to a successful result."""
+    try:
+        stat = os.stat(path)
+        result.size = stat.st_size
+        result.mtime_ns = stat.st_mtime_ns
+        result.footer_checksum = parquet_footer_checksum(path)
+    except OSError as err:
+        logger.debug("unable to fingerprint %s: %s", path, err)
+    return result
 
 
 def verify_parquet_file(
     path: str, *, deep: bool = False,
+    batch_size: int = DEFAULT_DEEP_BATCH_SIZE,
 ) -> FileResult:
     """Verify file-level structural integrity of a single parquet file.
 
     Default check opens the file and parses footer + row-group metadata.
     ``deep=True`` additionally decodes every row group, catching data-page
-    corruption that the metadata pass cannot see.
+    corruption that the metadata pass cannot see. Row groups are decoded
+    in batches of at most ``batch_size`` rows, so the memory used by a deep
+    check does not depend on the row group size.
     """
     try:
         pf = pq.ParquetFile(path)
@@ -59,7 +132,10 @@ def verify_parquet_file(
     if deep:
         for i in range(pf.num_row_groups):
             try:
-                pf.read_row_group(i)
+                for _ in pf.iter_batches(
+                        batch_size=batch_size, row_groups=[i],
+                        use_threads=False):
+                    pass
             except (OSError, pa.ArrowException) as err:
                 return FileResult(
                     path=path,
@@ -69,7 +145,104 @@ def verify_parquet_file(
                     row_group=i,
                 )
 
-    return FileResult(path=path, ok=True)
+    return _fingerprint(path, FileResult(path=path, ok=True))
+
+
+def load_manifest(path: str) -> dict[str, ManifestEntry]:
+    """Load a checksum manifest written by a previous run.
+
+    A missing manifest is treated as empty. A manifest in an unknown format
+    is ignored with a warning, which forces a full re-check.
+    """
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as infile:
+            doc = json.load(infile)
+    except (OSError, ValueError) as err:
+        logger.warning("ignoring unreadable manifest %s: %s", path, err)
+        return {}
+    if not isinstance(doc, dict) or doc.get("version") != MANIFEST_VERSION:
+        logger.warning("ignoring manifest %s: unsupported version", path)
+        return {}
+    return {
+        file_path: ManifestEntry(**entry)
+        for file_path, entry in doc.get("files", {}).items()
+    }
+
+
+def save_manifest(path: str, manifest: dict[str, ManifestEntry]) -> None:
+    """Atomically write a checksum manifest."""
+    doc = {
+        "version": MANIFEST_VERSION,
+        "files": {
+            file_path: dataclasses.asdict(entry)
+            for file_path, entry in sorted(manifest.items())
+        },
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as outfile:
+        json.dump(doc, outfile, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _manifest_lookup(
+    path: str, manifest: dict[str, ManifestEntry], *, deep: bool,
+) -> FileResult | None:
+    """Return a cached result when the manifest proves a file unchanged.
+
+    A file is unchanged if its size and mtime match the manifest entry. For
+    a shallow check, a file whose mtime changed (e.g. after a copy) is still
+    accepted when its size and footer checksum match. The footer does not
+    cover the data pages, so a deep check verifies such a file again.
+    Shallow entries do not satisfy a deep check.
+    """
+    entry = manifest.get(path)
+    if entry is None or (deep and not entry.deep):
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if stat.st_size != entry.size:
+        return None
+    if stat.st_mtime_ns != entry.mtime_ns:
+        if deep:
+            return None
+        try:
+            checksum = parquet_footer_checksum(path)
+        except OSError:
+            return None
+        if checksum != entry.footer_checksum:
+            return None
+    return FileResult(
+        path=path, ok=True,
+        size=entry.size, mtime_ns=stat.st_mtime_ns,
+        footer_checksum=entry.footer_checksum,
+        cached=True,
+    )
+
+
+def _update_manifest(
+    manifest: dict[str, ManifestEntry], results: list[FileResult], *,
+    deep: bool,
+) -> None:
+    for result in results:
+        if not result.ok:
+            manifest.pop(result.path, None)
+            continue
+        if result.size is None or result.mtime_ns is None \
+                or result.footer_checksum is None:
+            continue
+        previous = manifest.get(result.path)
+        manifest[result.path] = ManifestEntry(
+            size=result.size,
+            mtime_ns=result.mtime_ns,
+            footer_checksum=result.footer_checksum,
+            deep=deep or (
+                bool(result.cached) and previous is not None
+                and previous.deep),
+        )
 
 
 def _collect_parquet_files(path: str) -> list[str]:
@@ -118,10 +291,40 @@ def _build_argparser() -> argparse.ArgumentParser:
         type=int,
         default=min((os.cpu_count() or 1), DEFAULT_JOBS_CAP),
         help=(
-            "Number of worker threads. "
+            "Number of parallel workers. "
             f"Default min(cpu_count, {DEFAULT_JOBS_CAP})."
         ),
     )
+    parser.add_argument(
+        "--executor",
+        choices=[EXECUTOR_AUTO, EXECUTOR_THREAD, EXECUTOR_PROCESS],
+        default=EXECUTOR_AUTO,
+        help=(
+            "Kind of worker pool used when --jobs is greater than 1. "
+            "'auto' uses processes for --deep (CPU-bound decoding) and "
+            "threads otherwise (I/O-bound footer reads). Default 'auto'."
+        ),
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_DEEP_BATCH_SIZE,
+        help=(
+            "Maximum number of rows decoded at once by --deep. Bounds the "
+            f"memory of each worker. Default {DEFAULT_DEEP_BATCH_SIZE}."
+        ),
+    )
+    parser.add_argument(
+        "--manifest",
+        dest="manifest_path",
+        metavar="PATH",
+        default=None,
+        help=(
+            "Checksum manifest of files that passed verification. Files "
+            "whose size, mtime or footer checksum match the manifest are "
+            "not verified again; the manifest is updated after the run."
+        ),
+    )
     parser.add_argument(
         "--json",
         dest="json_path",
@@ -133,9 +336,64 @@ def _build_argparser() -> argparse.ArgumentParser:
     return parser
 
 
+def _build_executor(jobs: int, executor: str, *, deep: bool) -> Executor:
+    if executor == EXECUTOR_AUTO:
+        executor = EXECUTOR_PROCESS if deep else EXECUTOR_THREAD
+    if executor == EXECUTOR_PROCESS:
+        # Arrow keeps its own thread pools; forking a process that already
+        # runs them can deadlock the children, so workers are spawned.
+        return ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context("spawn"))
+    return ThreadPoolExecutor(max_workers=jobs)
+
+
+def _run_checks(
+    targets: list[str], *,
+    deep: bool, jobs: int, executor: str, batch_size: int,
+) -> Iterator[FileResult]:
+    """Verify files, keeping at most ``2 * jobs`` checks in flight.
+
+    Bounding the number of pending futures keeps memory flat when the
+    number of files runs into the tens of thousands.
+    """
+    check = functools.partial(
+        verify_parquet_file, deep=deep, batch_size=batch_size)
+    if jobs <= 1:
+        yield from (check(p) for p in targets)
+        return
+    max_pending = 2 * jobs
+    with _build_executor(jobs, executor, deep=deep) as pool:
+        pending: list[Future[FileResult]] = []
+        for path in targets:
+            pending.append(pool.submit(check, path))
+            if len(pending) >= max_pending:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def _throughput_stats(
+    results: list[FileResult], elapsed: float,
+) -> dict[str, Any]:
+    verified = [r for r in results if not r.cached]
+    verified_bytes = sum(r.size or 0 for r in verified)
+    return {
+        "verified": len(verified),
+        "skipped": len(results) - len(verified),
+        "bytes_verified": verified_bytes,
+        "elapsed_seconds": round(elapsed, 3),
+        "files_per_second":
+            round(len(verified) / elapsed, 3) if elapsed > 0 else None,
+        "bytes_per_second":
+            round(verified_bytes / elapsed, 3) if elapsed > 0 else None,
+    }
+
+
 def _write_json_report(
     path: str, results: list[FileResult], *,
     deep: bool, started: str, finished: str,
+    stats: dict[str, Any] | None = None,
 ) -> None:
     doc = {
         "tool": "verify_parquet",
@@ -144,6 +402,7 @@ def _write_json_report(
         "failures": sum(1 for r in results if not r.ok),
         "started": started,
         "finished": finished,
+        "stats": stats or {},
         "files": [
             {k: v for k, v in dataclasses.asdict(r).items() if v is not None}
             for r in results
@@ -174,18 +433,32 @@ def main(argv: list[str] | None = None) -> int:
         )
         return EXIT_USAGE
 
+    manifest: dict[str, ManifestEntry] = {}
+    if args.manifest_path is not None:
+        manifest = load_manifest(args.manifest_path)
+
     started = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    check = functools.partial(verify_parquet_file, deep=args.deep)
-    if args.jobs <= 1:
-        results = [check(p) for p in targets]
-    else:
-        with ThreadPoolExecutor(max_workers=args.jobs) as pool:
-            results = list(pool.map(check, targets))
+    start_time = time.monotonic()
+    cached: dict[str, FileResult] = {}
+    for path in targets:
+        hit = _manifest_lookup(path, manifest, deep=args.deep)
+        if hit is not None:
+            cached[path] = hit
+    checked = {
+        r.path: r
+        for r in _run_checks(
+            [p for p in targets if p not in cached],
+            deep=args.deep, jobs=args.jobs,
+            executor=args.executor, batch_size=args.batch_size,
+        )
+    }
+    results = [cached.get(p) or checked[p] for p in targets]
+    elapsed = time.monotonic() - start_time
     finished = datetime.datetime.now(datetime.timezone.utc).isoformat()
     failures = sum(1 for r in results if not r.ok)
     for r in results:
         if r.ok:
-            logger.info("OK %s", r.path)
+            logger.info("%s %s", "CACHED" if r.cached else "OK", r.path)
         else:
             attr = f" (row group {r.row_group})" if r.row_group is not None \
                 else ""
@@ -193,12 +466,23 @@ def main(argv: list[str] | None = None) -> int:
                 "FAIL %s: %s: %s%s",
                 r.path, r.error_class, r.message, attr,
             )
+    stats = _throughput_stats(results, elapsed)
     logger.info("Checked %d files, %d failures", len(results), failures)
+    logger.info(
+        "Verified %d files (%d bytes), skipped %d unchanged, in %.1fs",
+        stats["verified"], stats["bytes_verified"], stats["skipped"],
+        elapsed,
+    )
+
+    if args.manifest_path is not None:
+        _update_manifest(manifest, results, deep=args.deep)
+        save_manifest(args.manifest_path, manifest)
 
     if args.json_path is not None:
         _write_json_report(
             args.json_path, results,
             deep=args.deep, started=started, finished=finished,
+            stats=stats,
         )
 
     return EXIT_OK if failures == 0 else EXIT_FAILURES
@@ -94,6 +94,8 @@ from gpf.variants_loaders.raw.loader import (
     FullVariantsIterator,
     TransmissionType,
     VariantsGenotypesLoader,
+    group_rows,
+    regions_mask,
 )
 
 logger = logging.getLogger(__name__)
@@ -300,18 +302,6 @@ class CNVLoader(VariantsGenotypesLoader):
         ))
         return arguments
 
-    def _is_in_regions(self, summary_variant: SummaryVariant) -> bool:
-        if self.regions == [None]:
-            return True
-        isin = [
-            True if r is None else r.isin(
-                summary_variant.chrom,
-                summary_variant.position,
-            )
-            for r in self.regions
-        ]
-        return any(isin)
-
     def close(self) -> None:
         pass
 
@@ -319,23 +309,45 @@ class CNVLoader(VariantsGenotypesLoader):
         self,
     ) -> Generator[tuple[SummaryVariant, list[FamilyVariant]], None, None]:
         # pylint: disable=too-many-locals
-        group = self.cnv_df.groupby(
-            ["chrom", "position", "end_position", "variant_type"],
-            sort=False).agg(list)
-
-        for num_idx, (idx, values) in enumerate(group.iterrows()):
+        keys, order, bounds = group_rows(
+            self.cnv_df,
+            ["chrom", "position", "end_position", "variant_type"])
+        chroms = np.array(
+            [self._adjust_chrom(chrom) for chrom in keys["chrom"]],
+            dtype=object)
+        positions = keys["position"].to_numpy(dtype=np.int64)
+        end_positions = keys["end_position"].to_numpy(dtype=np.int64)
+        variant_types = keys["variant_type"].to_numpy()
+
+        selected = np.isin(chroms, list(self.genome.chromosomes))
+        for num_idx in np.flatnonzero(~selected):
+            logger.warning(
+                "chromosome %s not found in the reference genome %s; "
+                "skipping variant %s:%s",
+                chroms[num_idx], self.genome.resource.resource_id,
+                chroms[num_idx], positions[num_idx])
+        if self.regions != [None]:
+            selected &= regions_mask(self.regions, chroms, positions)
+
+        # values of the family records ordered by variant
+        family_ids = self.cnv_df["family_id"].to_numpy()[order]
+        best_states = self.cnv_df["best_state"].to_numpy()[order]
+        extra_attributes = {
+            attr: self.cnv_df[attr].to_numpy()[order]
+            for attr in self.cnv_df.columns
+            if attr not in {
+                "chrom", "position", "end_position", "variant_type",
+                "best_state", "family_id",
+            }
+        }
 
-            chrom, position, end_position, variant_type = idx  # type: ignore
-            position: int = int(position)  # type: ignore
-            end_position: int = int(end_position)  # type: ignore
+        for num_idx in np.flatnonzero(selected):
             summary_rec: dict[str, Any] = {
-                "chrom": chrom,  # type: ignore
+                "chrom": chroms[num_idx],
                 "reference": None,
                 "alternative": None,
-                "position": position,  # type: ignore
-                "end_position": end_position,  # type: ignore
-                "summary_index": num_idx,
-                "variant_type": variant_type,  # type: ignore
+                "position": int(positions[num_idx]),
+                "summary_index": int(num_idx),
                 "allele_index": 0,
                 "af_parents_called_count": None,
                 "af_parents_called_percent": None,
@@ -345,51 +357,30 @@ class CNVLoader(VariantsGenotypesLoader):
                 "af_ref_allele_freq": None,
             }
             alt_rec = copy(summary_rec)
-            del summary_rec["end_position"]
-            del summary_rec["variant_type"]
-
             alt_rec["allele_index"] = 1
-            chrom = self._adjust_chrom(summary_rec["chrom"])
-            summary_rec["chrom"] = chrom
-
-            if chrom not in self.genome.chromosomes:
-                logger.warning(
-                    "chromosome %s not found in the reference genome %s; "
-                    "skipping variant %s",
-                    chrom, self.genome.resource.resource_id,
-                    summary_rec)
-                continue
+            alt_rec["end_position"] = int(end_positions[num_idx])
+            alt_rec["variant_type"] = variant_types[num_idx]
 
             svar = SummaryVariantFactory.summary_variant_from_records(
                 [summary_rec, alt_rec], self.transmission_type,
             )
 
-            if not self._is_in_regions(svar):
-                continue
-
             fvs = []
-            extra_attributes_keys = filter(
-                lambda x: x not in ["best_state", "family_id"],
-                values.keys(),
-            )
-            for f_idx, family_id in enumerate(
-                    values.get("family_id")):  # type: ignore
-                best_state = values.get("best_state")[f_idx]  # type: ignore
-                assert best_state is not None
-                assert isinstance(best_state, np.ndarray)
-                family = self.families.get(family_id)
+            for row in range(bounds[num_idx], bounds[num_idx + 1]):
+                family = self.families.get(family_ids[row])
                 if family is None:
                     continue
+                best_state = best_states[row]
+                assert isinstance(best_state, np.ndarray)
                 fvar = FamilyVariant(
                     svar, family,
-                    family_id=family_id,
+                    family_id=family_ids[row],
                     member_ids=family.member_ids,
                     genotype=None, best_state=best_state)
-                extra_attributes = {}
-                for attr in extra_attributes_keys:
-                    attr_val = values.get(attr)[f_idx]  # type: ignore
-                    extra_attributes[attr] = [attr_val]
-                fvar.update_attributes(extra_attributes)
+                fvar.update_attributes({
+                    attr: [values[row]]
+                    for attr, values in extra_attributes.items()
+                })
                 fvs.append(fvar)
             yield svar, fvs
 
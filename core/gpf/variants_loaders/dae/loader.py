@@ -41,6 +41,8 @@ from gpf.variants_loaders.raw.loader import (
     FullVariantsIterator,
     TransmissionType,
     VariantsGenotypesLoader,
+    group_rows,
+    regions_mask,
 )
 
 logger = logging.getLogger(__name__)
@@ -88,31 +90,104 @@ class DenovoLoader(VariantsGenotypesLoader):
         logger.debug(
             "loading denovo variants: %s; %s", denovo_filename, self.params)
 
-        self.denovo_df, extra_attributes = self._flexible_denovo_load_internal(
-            denovo_filename,
-            genome,
-            families=families,
-            **self.params,
-        )
-        self.set_attribute("extra_attributes", extra_attributes)
+        # The input is read once and the location of each record is kept;
+        # records are converted into variants only for the regions that
+        # are iterated.
+        self.denovo_filename = denovo_filename
+        self.sort = sort
+        columns = self._resolve_denovo_columns(**self.params)
+        self._denovo_columns = columns
+        self._raw_df = self._read_denovo_file(denovo_filename, columns)
+        self._raw_chroms, self._raw_positions = self._denovo_file_locations(
+            self._raw_df, columns)
+        self._denovo_df: pd.DataFrame | None = None
+        self._regions_denovo_df: \
+            tuple[list[Region | None], pd.DataFrame] | None = None
+
+        self.set_attribute(
+            "extra_attributes",
+            self._extra_attributes_columns(self._raw_df, columns).tolist())
         self._init_chromosomes()
 
-        if np.all(pd.isna(self.denovo_df["genotype"])):
+        if columns["denovo_person_id"] is None \
+                and columns["denovo_best_state"] is not None:
             self.expect_best_state = True
-        elif np.all(pd.isna(self.denovo_df["best_state"])):
-            self.expect_genotype = True
         else:
-            raise ValueError(
-                "Denovo loader expects either genotype or best_state "
-                "to be missing in the input file")
-        if sort:
-            self.denovo_df = self.denovo_df.sort_values(
+            self.expect_genotype = True
+
+    @property
+    def denovo_df(self) -> pd.DataFrame:
+        """Return the de Novo variants of the whole input."""
+        if self._denovo_df is None:
+            self._denovo_df = self._load_denovo_df(None)
+        return self._denovo_df
+
+    @property
+    def record_locations(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the chromosomes and positions of the input records.
+
+        The records are not converted into variants; positions that are not
+        numbers are -1.
+        """
+        return self._raw_chroms, self._raw_positions
+
+    def _load_denovo_df(self, rows: np.ndarray | None) -> pd.DataFrame:
+        """Convert records of the input into de Novo variants."""
+        raw_df = self._raw_df
+        if rows is not None:
+            raw_df = raw_df.iloc[rows].reset_index(drop=True)
+        denovo_df, _ = self._flexible_denovo_load_internal(
+            self.denovo_filename,
+            self.genome,
+            families=self.families,
+            raw_df=raw_df,
+            **self.params,
+        )
+        if self.sort:
+            denovo_df = denovo_df.sort_values(
                 by=["chrom", "position", "reference", "alternative"])
+        return denovo_df
 
-    def _init_chromosomes(self) -> None:
-        self._chromosomes = list(self.denovo_df.chrom.unique())
+    def _get_regions_denovo_df(self) -> pd.DataFrame:
+        """Return the de Novo variants that could be in the loader regions.
+
+        Only the input records located in the regions are converted. The
+        position of a variant could move by one base when it is normalized,
+        so the regions are extended by one base on both sides.
+        """
+        regions = list(self.regions)
+        if not regions or any(region is None for region in regions) \
+                or self._denovo_df is not None:
+            return self.denovo_df
+        if self._regions_denovo_df is not None \
+                and self._regions_denovo_df[0] == regions:
+            return self._regions_denovo_df[1]
+
+        extended = [
+            Region(
+                region.chrom,
+                max(1, region.start - 1) if region.start else None,
+                region.stop + 1 if region.stop else None)
+            for region in regions if region is not None
+        ]
+        rows = np.flatnonzero(regions_mask(
+            extended, self._raw_chroms, self._raw_positions))
+        logger.debug(
+            "converting %s out of %s de Novo records for regions %s",
+            len(rows), len(self._raw_df), regions)
+        denovo_df = self._load_denovo_df(rows)
+        self._regions_denovo_df = (regions, denovo_df)
+        return denovo_df
 
+    def _init_chromosomes(self) -> None:
         all_chromosomes = self.genome.chromosomes
+        self._chromosomes = list(pd.unique(self._raw_chroms))
+        if self._denovo_columns["denovo_variant"]:
+            # variants on chromosomes missing in the genome are skipped
+            self._chromosomes = [
+                chrom for chrom in self._chromosomes
+                if chrom in set(all_chromosomes)]
+
         if all(chrom in set(all_chromosomes) for chrom in self._chromosomes):
             self._chromosomes = sorted(
                 self._chromosomes,
@@ -122,38 +197,27 @@ class DenovoLoader(VariantsGenotypesLoader):
     def chromosomes(self) -> list[str]:
         return self._chromosomes
 
-    def _is_in_regions(self, summary_variant: SummaryVariant) -> bool:
-        if self.regions is None or len(self.regions) == 0:
-            return True
-        isin = [
-            r.isin(
-                summary_variant.chrom,
-                summary_variant.position,
-            )
-            if r is not None
-            else True
-            for r in self.regions
-        ]
-        return any(isin)
-
     def _produce_family_variants(
         self, svariant: SummaryVariant,
-        values: pd.Series,
+        columns: dict[str, np.ndarray],
+        rows: range,
     ) -> list[FamilyVariant]:
         fvs = []
-        extra_attributes_keys = list(filter(
-            lambda x: x not in ["best_state", "family_id", "genotype"],
-            values.keys(),
-        ))
-        for f_idx, family_id in enumerate(
-                values.get("family_id")):  # type: ignore
-            best_state = values.get("best_state")[f_idx]  # type: ignore
-            genotypes = values.get("genotype")[f_idx]  # type: ignore
+        extra_attributes_keys = [
+            key for key in columns
+            if key not in {"best_state", "family_id", "genotype"}
+        ]
+        for row in rows:
+            family_id = columns["family_id"][row]
             family = self.families.get(family_id)
             if family is None:
                 continue
             family_genotypes = DenovoFamiliesGenotypes(
-                family, genotypes, best_state)
+                family, columns["genotype"][row], columns["best_state"][row])
+            extra_attributes = {
+                attr: [columns[attr][row]]
+                for attr in extra_attributes_keys
+            }
             for fam, genotype, best_state in \
                     family_genotypes.family_genotype_iterator():
                 fv = FamilyVariant(
@@ -162,10 +226,6 @@ class DenovoLoader(VariantsGenotypesLoader):
                     member_ids=family.member_ids,
                     genotype=genotype,
                     best_state=best_state)
-                extra_attributes = {}
-                for attr in extra_attributes_keys:
-                    attr_val = values.get(attr)[f_idx]  # type: ignore
-                    extra_attributes[attr] = [attr_val]
                 if genotype is None:
                     (fv.gt,
                      fv._genetic_model,  # noqa: SLF001
@@ -179,20 +239,33 @@ class DenovoLoader(VariantsGenotypesLoader):
         return fvs
 
     def _full_variants_iterator_impl(self) -> FullVariantsIterator:
-        group = self.denovo_df.groupby(
-            ["chrom", "position", "reference", "alternative"],
-            sort=False).agg(list)
-        for num_idx, (idx, values) in enumerate(group.iterrows()):
-            chrom, position, ref, alts = idx  # type: ignore
-            position = int(position)  # type: ignore
-            summary_records = []
-            for alt_index, alt in enumerate(alts.split(",")):  # type: ignore
-                summary_records.append({
-                    "chrom": chrom,  # type: ignore
-                    "reference": ref,  # type: ignore
+        variant_columns = ["chrom", "position", "reference", "alternative"]
+        denovo_df = self._get_regions_denovo_df()
+        keys, order, bounds = group_rows(denovo_df, variant_columns)
+        chroms = keys["chrom"].to_numpy(dtype=object)
+        positions = keys["position"].to_numpy(dtype=np.int64)
+        references = keys["reference"].to_numpy(dtype=object)
+        alternatives = keys["alternative"].to_numpy(dtype=object)
+
+        selected = np.ones(len(keys), dtype=bool)
+        if self.regions is not None and len(self.regions) > 0:
+            selected = regions_mask(self.regions, chroms, positions)
+
+        # values of the family records ordered by variant
+        columns = {
+            column: denovo_df[column].to_numpy()[order]
+            for column in denovo_df.columns
+            if column not in variant_columns
+        }
+
+        for num_idx in np.flatnonzero(selected):
+            summary_records = [
+                {
+                    "chrom": chroms[num_idx],
+                    "reference": references[num_idx],
                     "alternative": alt,
-                    "position": position,
-                    "summary_index": num_idx,
+                    "position": int(positions[num_idx]),
+                    "summary_index": int(num_idx),
                     "allele_index": alt_index + 1,
                     "af_parents_called_count": None,
                     "af_parents_called_percent": None,
@@ -200,15 +273,17 @@ class DenovoLoader(VariantsGenotypesLoader):
                     "af_allele_freq": None,
                     "af_ref_allele_count": None,
                     "af_ref_allele_freq": None,
-                })
+                }
+                for alt_index, alt in enumerate(
+                    alternatives[num_idx].split(","))
+            ]
 
             svariant = SummaryVariantFactory.summary_variant_from_records(
                 summary_records, self.transmission_type,
             )
-
-            if not self._is_in_regions(svariant):
-                continue
-            fvs = self._produce_family_variants(svariant, values)
+            fvs = self._produce_family_variants(
+                svariant, columns,
+                range(bounds[num_idx], bounds[num_idx + 1]))
             yield svariant, fvs
 
     def full_variants_iterator(
@@ -441,11 +516,8 @@ class DenovoLoader(VariantsGenotypesLoader):
 
         return argv.denovo_file, params
 
-    def _flexible_denovo_load_internal(
-            self,
-            filepath: str,
-            genome: ReferenceGenome,
-            families: FamiliesData, *,
+    @staticmethod
+    def _resolve_denovo_columns(
             denovo_location: str | None = None,
             denovo_variant: str | None = None,
             denovo_chrom: str | None = None,
@@ -456,16 +528,10 @@ class DenovoLoader(VariantsGenotypesLoader):
             denovo_family_id: str | None = None,
             denovo_best_state: str | None = None,
             denovo_genotype: str | None = None,
-            denovo_sep: str = "\t",
-            **_kwargs: Any) -> tuple[pd.DataFrame, Any]:
-        # pylint: disable=too-many-arguments,too-many-branches
-        # pylint: disable=too-many-statements,too-many-locals
-        assert families is not None
-        assert isinstance(
-            families, FamiliesData,
-        ), "families must be an instance of FamiliesData!"
-        assert genome, "You must provide a genome object!"
-
+            denovo_sep: str | None = "\t",
+            **_kwargs: Any) -> dict[str, Any]:
+        """Fill in the default columns of a de Novo file."""
+        # pylint: disable=too-many-arguments
         if not (denovo_location or (denovo_chrom and denovo_pos)):
             denovo_chrom = "chrom"
             denovo_pos = "pos"
@@ -482,6 +548,24 @@ class DenovoLoader(VariantsGenotypesLoader):
         if denovo_sep is None:
             denovo_sep = "\t"
 
+        return {
+            "denovo_location": denovo_location,
+            "denovo_variant": denovo_variant,
+            "denovo_chrom": denovo_chrom,
+            "denovo_pos": denovo_pos,
+            "denovo_ref": denovo_ref,
+            "denovo_alt": denovo_alt,
+            "denovo_person_id": denovo_person_id,
+            "denovo_family_id": denovo_family_id,
+            "denovo_best_state": denovo_best_state,
+            "denovo_genotype": denovo_genotype,
+            "denovo_sep": denovo_sep,
+        }
+
+    @staticmethod
+    def _read_denovo_file(
+        filepath: str, columns: dict[str, Any],
+    ) -> pd.DataFrame:
         with warnings.catch_warnings(record=True) as _:
             warnings.filterwarnings(
                 "ignore",
@@ -489,27 +573,94 @@ class DenovoLoader(VariantsGenotypesLoader):
                 message="Both a converter and dtype were specified",
             )
 
-            raw_df = pd.read_csv(
+            return pd.read_csv(
                 filepath,
-                sep=denovo_sep,
+                sep=columns["denovo_sep"],
                 dtype={
-                    denovo_chrom: str,
-                    denovo_ref: str,
-                    denovo_alt: str,
-                    denovo_person_id: str,
-                    denovo_family_id: str,
-                    denovo_location: str,
+                    columns["denovo_chrom"]: str,
+                    columns["denovo_ref"]: str,
+                    columns["denovo_alt"]: str,
+                    columns["denovo_person_id"]: str,
+                    columns["denovo_family_id"]: str,
+                    columns["denovo_location"]: str,
                 },
                 comment="#",
                 encoding="utf-8",
                 na_filter=False)
 
+    @staticmethod
+    def _extra_attributes_columns(
+        raw_df: pd.DataFrame, columns: dict[str, Any],
+    ) -> pd.Index:
+        return raw_df.columns.difference([
+            value for key, value in columns.items() if key != "denovo_sep"
+        ])
+
+    def _denovo_file_locations(
+        self, raw_df: pd.DataFrame, columns: dict[str, Any],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the chromosomes and positions of the de Novo records.
+
+        Chromosomes are adjusted as the variants chromosomes; positions
+        that are not numbers are set to -1.
+        """
+        if columns["denovo_location"]:
+            locations = raw_df[columns["denovo_location"]].astype(str) \
+                .str.split(":", n=1, expand=True).reindex(columns=[0, 1])
+            chroms, positions = locations[0].fillna(""), locations[1]
+        else:
+            chroms = raw_df[columns["denovo_chrom"]]
+            positions = raw_df[columns["denovo_pos"]]
+        adjusted = {
+            chrom: self._adjust_chrom(chrom) for chrom in pd.unique(chroms)}
+        return (
+            chroms.map(adjusted).to_numpy(dtype=object),
+            pd.to_numeric(positions, errors="coerce")
+            .fillna(-1).to_numpy(dtype=np.int64),
+        )
+
+    def _flexible_denovo_load_internal(
+            self,
+            filepath: str,
+            genome: ReferenceGenome,
+            families: FamiliesData, *,
+            raw_df: pd.DataFrame | None = None,
+            **kwargs: Any) -> tuple[pd.DataFrame, Any]:
+        """Load de Novo variants from a file or from its records.
+
+        If `raw_df` is passed, the records in it are converted instead of
+        the records of the file.
+        """
+        # pylint: disable=too-many-branches
+        # pylint: disable=too-many-statements,too-many-locals
+        assert families is not None
+        assert isinstance(
+            families, FamiliesData,
+        ), "families must be an instance of FamiliesData!"
+        assert genome, "You must provide a genome object!"
+
+        columns = self._resolve_denovo_columns(**kwargs)
+        denovo_location = columns["denovo_location"]
+        denovo_variant = columns["denovo_variant"]
+        denovo_chrom = columns["denovo_chrom"]
+        denovo_pos = columns["denovo_pos"]
+        denovo_ref = columns["denovo_ref"]
+        denovo_alt = columns["denovo_alt"]
+        denovo_person_id = columns["denovo_person_id"]
+        denovo_family_id = columns["denovo_family_id"]
+        denovo_best_state = columns["denovo_best_state"]
+        denovo_genotype = columns["denovo_genotype"]
+
+        if raw_df is None:
+            raw_df = self._read_denovo_file(filepath, columns)
+
         if denovo_location:
-            chrom_col, pos_col = zip(
-                *map(self.split_location,
-                     raw_df[denovo_location]),
-                strict=True,
-            )
+            locations = [
+                self.split_location(location)
+                for location in raw_df[denovo_location]
+            ]
+            chrom_col = [chrom for chrom, _ in locations]
+            pos_col = [pos for _, pos in locations]
         else:
             assert denovo_chrom is not None
             assert denovo_pos is not None
@@ -538,7 +689,9 @@ class DenovoLoader(VariantsGenotypesLoader):
                 )
                 ref_alt_tuples.append(res)  # type: ignore
 
-            pos_col, ref_col, alt_col = zip(*ref_alt_tuples, strict=True)
+            pos_col = [pos for pos, _, _ in ref_alt_tuples]
+            ref_col = [ref for _, ref, _ in ref_alt_tuples]
+            alt_col = [alt for _, _, alt in ref_alt_tuples]
 
         else:
             assert denovo_ref is not None
@@ -546,11 +699,8 @@ class DenovoLoader(VariantsGenotypesLoader):
             ref_col = raw_df.loc[:, denovo_ref]  # type: ignore
             alt_col = raw_df.loc[:, denovo_alt]  # type: ignore
 
-        extra_attributes_cols = raw_df.columns.difference([
-            denovo_location, denovo_variant, denovo_chrom, denovo_pos,
-            denovo_ref, denovo_alt, denovo_person_id, denovo_family_id,
-            denovo_best_state, denovo_genotype,
-        ])
+        extra_attributes_cols = self._extra_attributes_columns(
+            raw_df, columns)
 
         if denovo_person_id:
             if denovo_family_id in raw_df.columns:
@@ -642,7 +792,11 @@ class DenovoLoader(VariantsGenotypesLoader):
 
                     result.append({**family_dict, **extra_attributes})
 
-            denovo_df = pd.DataFrame(result)
+            denovo_df = pd.DataFrame(result, columns=[
+                "chrom", "position", "reference", "alternative",
+                "family_id", "genotype", "best_state",
+                *extra_attributes_cols,
+            ])
 
         else:
             family_col = raw_df.loc[:, denovo_family_id]
@@ -13,6 +13,7 @@ from typing import (
 )
 
 import numpy as np
+import pandas as pd
 from gain.annotation.annotation_config import Attribute
 from gain.genomic_resources.reference_genome import ReferenceGenome
 from gain.utils.regions import Region
@@ -57,6 +58,48 @@ FullVariantsIterable = Iterable[FullVariant]
 FamilyVariantsIterable = Iterable[FamilyVariant]
 
 
+def group_rows(
+    data: pd.DataFrame, by: list[str],
+) -> tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """Group the rows of a data frame by key columns.
+
+    Groups are numbered in the order of their first appearance, the same as
+    in `data.groupby(by, sort=False)`; rows with missing keys are dropped.
+    Returns the keys of the groups, the positions of the rows ordered by
+    group and the bounds of the groups in that order: the rows of group `i`
+    are `order[bounds[i]:bounds[i + 1]]`.
+    """
+    codes = data.groupby(by, sort=False).ngroup() \
+        .fillna(-1).to_numpy(dtype=np.int64)
+    order = np.argsort(codes, kind="stable")
+    order = order[codes[order] >= 0]
+    groups_count = int(codes.max()) + 1 if len(codes) > 0 else 0
+    bounds = np.searchsorted(
+        codes[order], np.arange(groups_count + 1), side="left")
+    keys = data[by].iloc[order[bounds[:-1]]].reset_index(drop=True)
+    return keys, order, bounds
+
+
+def regions_mask(
+    regions: Sequence[Region | None],
+    chroms: np.ndarray,
+    positions: np.ndarray,
+) -> np.ndarray:
+    """Return a mask of the positions inside any of the regions."""
+    result = np.zeros(len(chroms), dtype=bool)
+    for region in regions:
+        if region is None:
+            result[:] = True
+            break
+        inside = chroms == region.chrom
+        if region.start is not None:
+            inside &= positions >= region.start
+        if region.stop is not None:
+            inside &= positions <= region.stop
+        result |= inside
+    return result
+
+
 class CLIArgument:
     """Defines class for handling CLI arguments in variant loaders.
 
@@ -86,7 +86,7 @@ def t4c8_instance(
     return t4c8_gpf(root_path, grr=grr_fixture)
 
 
-def t4c8_study(instance: GPFInstance) -> str:
+def t4c8_study(instance: GPFInstance, study_id: str = "study") -> str:
     pedigree = textwrap.dedent("""
         familyId personId dadId momId sex status role
         f1.1     mom1     0     0     2   1      mom
@@ -143,19 +143,19 @@ def t4c8_study(instance: GPFInstance) -> str:
 
     root_path = pathlib.Path(instance.dae_dir)
     ped_path = setup_pedigree(
-        root_path / "study" / "pedigree" / "in.ped",
+        root_path / study_id / "pedigree" / "in.ped",
         pedigree,
     )
     vcf_path = setup_vcf(
-        root_path / "study" / "vcf" / "in.vcf.gz",
+        root_path / study_id / "vcf" / "in.vcf.gz",
         variants,
     )
     vcf_study(
-        root_path, "study",
+        root_path, study_id,
         ped_path, [vcf_path],
         gpf_instance=instance,
         project_config_overwrite=project_config_update,
         project_config_update=project_config,
     )
     instance.reload()
-    return f"{root_path}/work_dir/study"
+    return f"{root_path}/work_dir/{study_id}"
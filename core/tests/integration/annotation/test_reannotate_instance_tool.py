@@ -2,6 +2,9 @@
 import pathlib
 import textwrap
 
+import pytest_mock
+from gain.task_graph.cli_tools import TaskGraphCli
+
 from gpf.gpf_instance import GPFInstance
 from gpf.tools.reannotate_instance import cli
 from tests.integration.annotation.conftest import t4c8_study
@@ -56,3 +59,45 @@ def test_reannotate_instance_tool(
 
     assert all(v.has_attribute("score_two") for v in vs)
     assert not any(v.has_attribute("score_one") for v in vs)
+
+
+def test_reannotate_instance_tool_studies_in_one_graph(
+    t4c8_instance: GPFInstance,
+    tmp_path: pathlib.Path,
+    mocker: pytest_mock.MockerFixture,
+) -> None:
+    t4c8_study(t4c8_instance, "study_a")
+    t4c8_study(t4c8_instance, "study_b")
+
+    instance_path = pathlib.Path(t4c8_instance.dae_dir)
+    (instance_path / "annotation.yaml").write_text(
+        textwrap.dedent(
+            """- position_score:
+                    resource_id: two
+            """),
+    )
+    with open(instance_path / "gpf_instance.yaml", "a") as f:
+        f.write(
+            textwrap.dedent(
+                """
+                annotation:
+                    conf_file: annotation.yaml
+                """,
+            ),
+        )
+    process_graph = mocker.spy(TaskGraphCli, "process_graph")
+
+    cli([
+        "-j", "1",
+        "--work-dir", str(tmp_path),
+        "-i", str(instance_path / "gpf_instance.yaml"),
+    ])
+    t4c8_instance.reload()
+
+    assert process_graph.call_count == 1
+    for study_id in ["study_a", "study_b"]:
+        study = t4c8_instance.get_genotype_data(study_id)
+        vs = list(study.query_variants())
+        assert len(vs) > 0
+        assert all(v.has_attribute("score_two") for v in vs)
+        assert not any(v.has_attribute("score_one") for v in vs)
@@ -1,6 +1,11 @@
 # pylint: disable=W0621,C0114,C0116,W0212,W0613
+import json
+import os
+import pathlib
+
 import pytest_mock
 
+from gpf.common_reports.common_report import CommonReport
 from gpf.common_reports.denovo_report import DenovoReport
 from gpf.studies.study import GenotypeDataStudy
 
@@ -58,3 +63,41 @@ def test_common_report_empty_denovo(
     assert len(common_report.to_dict()) == 15
     assert common_report.to_dict()["denovo_report"] is not None
     print(common_report.to_dict())
+
+
+def test_common_report_load_is_cached(
+    t4c8_study_4: GenotypeDataStudy,
+    tmp_path: pathlib.Path,
+) -> None:
+    report_filename = str(tmp_path / "reports" / "common_report.json")
+    t4c8_study_4.build_report().save(report_filename)
+
+    common_report = CommonReport.load(report_filename)
+    assert common_report is not None
+    assert CommonReport.load(report_filename) is common_report
+    assert common_report.get_dict() is common_report.get_dict()
+    assert common_report.get_dict(full=True) == \
+        common_report.to_dict(full=True)
+
+
+def test_common_report_load_detects_changes(
+    t4c8_study_4: GenotypeDataStudy,
+    tmp_path: pathlib.Path,
+) -> None:
+    report_filename = str(tmp_path / "reports" / "common_report.json")
+    t4c8_study_4.build_report().save(report_filename)
+    common_report = CommonReport.load(report_filename)
+    assert common_report is not None
+
+    data = common_report.to_dict(full=True)
+    data["study_name"] = "changed study name"
+    with open(report_filename, "w", encoding="utf8") as outfile:
+        json.dump(data, outfile)
+
+    reloaded = CommonReport.load(report_filename)
+    assert reloaded is not None
+    assert reloaded is not common_report
+    assert reloaded.study_name == "changed study name"
+
+    os.remove(report_filename)
+    assert CommonReport.load(report_filename) is None
@@ -5,7 +5,7 @@ import box
 import duckdb
 import pytest
 
-from gpf.gene_profile.db import GeneProfileDBWriter
+from gpf.gene_profile.db import GeneProfileDBWriter, _ReadOnlyConnections
 from gpf.gene_profile.statistic import GPStatistic
 from gpf.gpf_instance import GPFInstance
 
@@ -159,3 +159,93 @@ def test_gpdb_symbol_search(
     all_symbols = gp_gpf_instance._gene_profile_db.list_symbols(1, "TEST")
     assert len(all_symbols) == 1
     assert all_symbols[0] == "TESTCHD"
+
+
+def test_gpdb_sorted_pages(
+        gp_gpf_instance: GPFInstance,
+        gpdb_write: GeneProfileDBWriter,
+        sample_gp: GPStatistic) -> None:
+    gpdb = gp_gpf_instance._gene_profile_db
+    gps = []
+    for index in range(120):
+        sample_gp.gene_symbol = f"G{index:03d}"
+        sample_gp.gene_scores["protection_scores"]["SFARI gene score"] = \
+            index % 7
+        gps.append(GPStatistic(
+            sample_gp.gene_symbol, sample_gp.gene_sets,
+            {
+                category: dict(scores)
+                for category, scores in sample_gp.gene_scores.items()
+            },
+            sample_gp.variant_counts,
+        ))
+    gpdb_write.insert_gps(gps)
+
+    pages = [
+        gpdb.query_gps(
+            page, sort_by="protection_scores_SFARI gene score", order="asc")
+        for page in range(1, 5)
+    ]
+    assert [len(rows) for rows in pages] == [50, 50, 20, 0]
+
+    rows = [row for page in pages for row in page]
+    assert [
+        (row["protection_scores_SFARI gene score"], row["symbol_name"])
+        for row in rows
+    ] == sorted(
+        (index % 7, f"G{index:03d}") for index in range(120)
+    )
+    assert gpdb.query_gps(
+        None, sort_by="protection_scores_SFARI gene score", order="asc",
+    ) == rows
+
+    matched = gpdb.query_gps(1, "g11")
+    assert [row["symbol_name"] for row in matched] == [
+        f"G{index}" for index in range(110, 120)
+    ]
+
+
+def test_gpdb_query_after_write(
+        gp_gpf_instance: GPFInstance,
+        gpdb_write: GeneProfileDBWriter,
+        sample_gp: GPStatistic) -> None:
+    gpdb = gp_gpf_instance._gene_profile_db
+    gpdb_write.insert_gp(sample_gp)
+    assert gpdb.list_symbols(1) == ["CHD8"]
+    assert len(gpdb.query_gps(1, sort_by="autism_scores_RVIS")) == 1
+
+    sample_gp.gene_symbol = "CHD7"
+    gpdb_write.insert_gp(sample_gp)
+    assert gpdb.list_symbols(1) == ["CHD7", "CHD8"]
+    assert [
+        row["symbol_name"]
+        for row in gpdb.query_gps(1, sort_by="autism_scores_RVIS")
+    ] == ["CHD7", "CHD8"]
+
+
+def test_read_only_connections_are_closed_after_each_request(
+    tmp_path: pathlib.Path,
+) -> None:
+    dbfile = str(tmp_path / "gpdb")
+    with duckdb.connect(dbfile) as connection:
+        connection.execute("CREATE TABLE t AS SELECT 1 AS a")
+    connections = _ReadOnlyConnections()
+
+    with connections.cursor(dbfile) as (signature, cursor):
+        assert cursor.execute("SELECT a FROM t").fetchall() == [(1,)]
+    with pytest.raises(duckdb.ConnectionException):
+        cursor.execute("SELECT 1")
+
+    # a writer can open the file between requests
+    with duckdb.connect(dbfile) as connection:
+        connection.execute("INSERT INTO t VALUES (2)")
+
+    with connections.cursor(dbfile) as (changed, cursor):
+        assert cursor.execute(
+            "SELECT a FROM t ORDER BY a").fetchall() == [(1,), (2,)]
+    assert changed != signature
+
+    connections.close(dbfile)
+    with connections.cursor(dbfile) as (written, _):
+        pass
+    assert written != changed
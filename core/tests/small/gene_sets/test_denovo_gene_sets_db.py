@@ -178,3 +178,16 @@ def test_get_denovo_gene_sets_t4c8_study_4_autism_unaffected_genes(
             checked = True
             break
     assert checked, "condition not checked"
+
+
+def test_denovo_gene_sets_cache_version(
+    t4c8_denovo_gene_sets_db: DenovoGeneSetsDb,
+) -> None:
+    version = t4c8_denovo_gene_sets_db.cache_version
+    assert version
+
+    t4c8_denovo_gene_sets_db.reload()
+    assert t4c8_denovo_gene_sets_db.cache_version == version
+
+    t4c8_denovo_gene_sets_db.update_cache({})
+    assert t4c8_denovo_gene_sets_db.cache_version != version
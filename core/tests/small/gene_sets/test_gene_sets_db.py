@@ -1,4 +1,7 @@
 # pylint: disable=W0621,C0114,C0116,W0212,W0613
+from typing import Any
+
+import pytest
 from gain.gene_sets.gene_set import (
     GeneSetCollection,
     build_gene_set_collection_from_resource_id,
@@ -6,6 +9,7 @@ from gain.gene_sets.gene_set import (
 from gain.genomic_resources.repository import (
     GenomicResourceRepo,
 )
+from gain.genomic_resources.testing import build_inmemory_test_repository
 
 from gpf.gene_sets.gene_sets_db import GeneSetsDb
 
@@ -226,3 +230,55 @@ def test_build_gene_set_collection_from_resource_id(
         "PCSK2",
     }
     assert gene_set["desc"] == "Main Candidates"
+
+
+@pytest.mark.parametrize("query, limit, expected", [
+    (None, None, ["alt_candidates", "main_candidates"]),
+    (None, 1, ["alt_candidates"]),
+    ("CAND", None, ["alt_candidates", "main_candidates"]),
+    ("main", None, ["main_candidates"]),
+    ("main_candidates", None, ["main_candidates"]),
+    ("alt cand", None, ["alt_candidates"]),
+    ("xyz", None, []),
+])
+def test_search_gene_sets(
+    gene_sets_db: GeneSetsDb,
+    query: str | None, limit: int | None, expected: list[str],
+) -> None:
+    gene_sets = gene_sets_db.search_gene_sets("main", query, limit)
+    assert [gs["name"] for gs in gene_sets] == expected
+
+
+def test_search_gene_sets_ranks_name_matches_first(
+    gene_sets_db: GeneSetsDb,
+) -> None:
+    gene_sets = gene_sets_db.search_gene_sets("test_mapping", "t")
+    assert [gs["name"] for gs in gene_sets] == [
+        "test:01", "test:02", "test:03",
+    ]
+    gene_sets = gene_sets_db.search_gene_sets("test_mapping", "third")
+    assert [gs["name"] for gs in gene_sets] == ["test:03"]
+    gene_sets = gene_sets_db.search_gene_sets("test_gmt", "SET2", 1)
+    assert [gs["name"] for gs in gene_sets] == ["TEST_GENE_SET2"]
+
+
+def test_get_gene_set_version(
+    gene_sets_db: GeneSetsDb,
+    grr_contents: dict[str, Any],
+) -> None:
+    version = gene_sets_db.get_gene_set_version("main", "main_candidates")
+    assert gene_sets_db.get_gene_set_version(
+        "main", "main_candidates") == version
+    assert gene_sets_db.get_gene_set_version(
+        "test_gmt", "TEST_GENE_SET1") != version
+
+    repo = build_inmemory_test_repository(grr_contents)
+    same_db = GeneSetsDb([GeneSetCollection(repo.get_resource("main"))])
+    assert same_db.get_gene_set_version(
+        "main", "main_candidates") == version
+
+    grr_contents["main"]["GeneSets"]["alt_candidates.txt"] += "CHD8\n"
+    repo = build_inmemory_test_repository(grr_contents)
+    updated_db = GeneSetsDb([GeneSetCollection(repo.get_resource("main"))])
+    assert updated_db.get_gene_set_version(
+        "main", "main_candidates") != version
@@ -0,0 +1,34 @@
+# pylint: disable=W0621,C0114,C0116,W0212,W0613
+import pytest
+
+from gpf.gene_sets.gene_sets_search import GeneSetsSearchIndex
+
+
+@pytest.fixture
+def index() -> GeneSetsSearchIndex:
+    return GeneSetsSearchIndex([
+        ("HALLMARK_APOPTOSIS", "Genes mediating programmed cell death"),
+        ("KEGG_APOPTOSIS", "Apoptosis pathway"),
+        ("APOPTOSIS", "Apoptosis"),
+        ("APOPTOSIS_UP", "Up-regulated in apoptosis"),
+        ("CELL_CYCLE", "Cell cycle genes"),
+        ("DNA_REPAIR", None),
+    ])
+
+
+@pytest.mark.parametrize("query, limit, expected", [
+    ("apoptosis", None, [2, 3, 1, 0]),
+    ("Apoptosis", 2, [2, 3]),
+    ("cell", None, [4, 0]),
+    ("death", None, [0]),
+    ("ap", None, [2, 3, 1, 0]),
+    ("repair", None, [5]),
+    ("nothing", None, []),
+    (None, 3, [0, 1, 2]),
+    ("", None, [0, 1, 2, 3, 4, 5]),
+])
+def test_gene_sets_search_index(
+    index: GeneSetsSearchIndex,
+    query: str | None, limit: int | None, expected: list[int],
+) -> None:
+    assert index.search(query, limit) == expected
@@ -0,0 +1,113 @@
+# pylint: disable=W0621,C0114,C0116,W0212,W0613
+import gc
+from collections.abc import Iterator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gpf.gpf_instance.gene_score_index import (
+    _INDEXES,
+    GeneScoreIndex,
+    get_gene_score_index,
+)
+
+
+class FakeGeneScore:
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+        self.to_tsv_calls = 0
+
+    def get_score_df(self, score_id: str) -> pd.DataFrame:
+        return self.df[["gene", score_id]]
+
+    def to_tsv(self, score_id: str) -> Iterator[str]:
+        self.to_tsv_calls += 1
+        yield f"gene\t{score_id}\n"
+        for gene, value in zip(
+                self.df["gene"], self.df[score_id], strict=True):
+            yield f"{gene}\t{value}\n"
+
+
+@pytest.fixture
+def gene_score() -> FakeGeneScore:
+    return FakeGeneScore(pd.DataFrame({
+        "gene": ["G1", "G2", "G3", "G4", "G5", "G6"],
+        "score": [3.0, 1.0, np.nan, 2.0, 5.0, 2.0],
+        "category": ["a", "b", "a", "c", "b", "a"],
+    }))
+
+
+@pytest.fixture
+def index(gene_score: FakeGeneScore) -> GeneScoreIndex:
+    return GeneScoreIndex.build(gene_score, "score")
+
+
+@pytest.mark.parametrize("score_min, score_max, expected", [
+    (2.0, 3.0, (1, 3, 1)),
+    (0.0, 10.0, (0, 5, 0)),
+    (1.5, 1.7, (1, 0, 4)),
+    (3.0, 2.0, (3, 0, 2)),
+    (-np.inf, np.inf, (0, 5, 0)),
+])
+def test_count_partitions(
+    index: GeneScoreIndex,
+    score_min: float, score_max: float,
+    expected: tuple[int, int, int],
+) -> None:
+    assert index.total == 6
+    assert index.count_partitions(score_min, score_max) == expected
+
+
+@pytest.mark.parametrize("score_min, score_max, expected", [
+    (2.0, 3.0, {"G4", "G6"}),
+    (2.0, 3.5, {"G1", "G4", "G6"}),
+    (None, 2.0, {"G2"}),
+    (3.0, None, {"G1", "G5"}),
+    (None, None, {"G1", "G2", "G4", "G5", "G6"}),
+    (-np.inf, np.inf, {"G1", "G2", "G4", "G5", "G6"}),
+    (3.0, 2.0, set()),
+])
+def test_get_genes(
+    index: GeneScoreIndex,
+    score_min: float | None, score_max: float | None,
+    expected: set[str],
+) -> None:
+    assert index.get_genes(score_min, score_max) == expected
+
+
+def test_categorical_score(gene_score: FakeGeneScore) -> None:
+    index = GeneScoreIndex.build(gene_score, "category")
+
+    assert not index.is_numeric
+    with pytest.raises(ValueError, match="not numeric"):
+        index.count_partitions(1.0, 2.0)
+    with pytest.raises(ValueError, match="not numeric"):
+        index.get_genes(1.0, 2.0)
+
+
+def test_tsv_lines_are_cached(gene_score: FakeGeneScore) -> None:
+    index = get_gene_score_index(gene_score, "score")
+
+    assert index.tsv_lines[0] == "gene\tscore\n"
+    assert len(index.tsv_lines) == 7
+    assert get_gene_score_index(gene_score, "score") is index
+    assert index.tsv_lines == get_gene_score_index(
+        gene_score, "score").tsv_lines
+    assert gene_score.to_tsv_calls == 1
+
+
+def test_indexes_are_dropped_with_the_gene_score(
+    gene_score: FakeGeneScore,
+) -> None:
+    index = get_gene_score_index(gene_score, "score")
+
+    other = FakeGeneScore(gene_score.df)
+    assert get_gene_score_index(other, "score") is not index
+    assert other in _INDEXES
+    count = len(_INDEXES)
+
+    del other
+    gc.collect()
+    assert len(_INDEXES) == count - 1
+    assert gene_score in _INDEXES
@@ -0,0 +1,77 @@
+# pylint: disable=W0621,C0114,C0116,W0212,W0613
+import pytest
+
+from gpf.gpf_instance.gene_symbols_index import GeneSymbolsIndex
+
+
+@pytest.fixture
+def index() -> GeneSymbolsIndex:
+    return GeneSymbolsIndex.build({
+        "CHD8": [], "CHD2": [], "CHD1L": [], "CHDH": [], "chd8": [],
+        "ACHD": [], "XCHD8": [], "ZZCHD": [], "T4": [], "C8orf4": [],
+    })
+
+
+@pytest.mark.parametrize("term, limit, expected", [
+    ("chd", None, ["CHD1L", "CHD2", "CHD8", "chd8", "CHDH"]),
+    ("CHD8", None, ["CHD8", "chd8"]),
+    ("chd", 2, ["CHD1L", "CHD2"]),
+    ("zz", None, ["ZZCHD"]),
+    ("chdx", None, []),
+    ("", 3, ["ACHD", "C8orf4", "CHD1L"]),
+])
+def test_prefix_search(
+    index: GeneSymbolsIndex,
+    term: str, limit: int | None, expected: list[str],
+) -> None:
+    assert index.prefix_search(term, limit) == expected
+
+
+@pytest.mark.parametrize("term, expected", [
+    ("chd", ["ACHD", "XCHD8", "ZZCHD"]),
+    ("chd8", ["XCHD8"]),
+    ("8", ["C8orf4", "CHD8", "chd8", "XCHD8"]),
+    ("h", ["CHD2", "CHD8", "chd8", "CHDH", "CHD1L", "ACHD", "XCHD8",
+           "ZZCHD"]),
+    ("qq", []),
+])
+def test_substring_search(
+    index: GeneSymbolsIndex, term: str, expected: list[str],
+) -> None:
+    assert index.substring_search(term) == expected
+
+
+def test_search_ranks_prefix_matches_first(index: GeneSymbolsIndex) -> None:
+    assert index.search("chd8", 10) == ["CHD8", "chd8", "XCHD8"]
+    assert index.search("chd", 6) == [
+        "CHD1L", "CHD2", "CHD8", "chd8", "CHDH", "ACHD"]
+
+
+@pytest.mark.parametrize("symbol, expected", [
+    ("CHD8", "CHD8"),
+    ("chd8", "chd8"),
+    ("Chd8", "CHD8"),
+    ("t4", "T4"),
+    ("CHD9", None),
+])
+def test_resolve(
+    index: GeneSymbolsIndex, symbol: str, expected: str | None,
+) -> None:
+    assert index.resolve(symbol) == expected
+
+
+def test_is_built_for() -> None:
+    gene_models: dict[str, list] = {"CHD8": [], "CHD2": []}
+    index = GeneSymbolsIndex.build(gene_models)
+
+    assert index.is_built_for(gene_models)
+    assert not index.is_built_for(dict(gene_models))
+
+    gene_models["CHD1"] = []
+    assert not index.is_built_for(gene_models)
+
+
+def test_contains_is_case_sensitive(index: GeneSymbolsIndex) -> None:
+    assert "CHD2" in index
+    assert "chd2" not in index
+    assert "CHD9" not in index
@@ -0,0 +1,129 @@
+# pylint: disable=W0621,C0114,C0116,W0212,W0613
+import itertools
+import pathlib
+
+import numpy as np
+import pysam
+import pytest
+from gain.utils.regions import Region
+
+from gpf.import_tools.bucket_planning import (
+    DENSITY_WINDOW,
+    Density,
+    index_density,
+    merge_densities,
+    plan_balanced_buckets,
+    positions_density,
+)
+
+
+def _density(windows: dict[str, list[tuple[int, float]]]) -> Density:
+    return {
+        chrom: (
+            np.array([start for start, _ in values], dtype=np.int64),
+            np.array([weight for _, weight in values], dtype=np.float64),
+        )
+        for chrom, values in windows.items()
+    }
+
+
+def test_positions_density() -> None:
+    density = positions_density(
+        ["1", "1", "1", "2"],
+        [1, DENSITY_WINDOW, DENSITY_WINDOW + 1, 10],
+    )
+
+    assert set(density) == {"1", "2"}
+    assert list(density["1"][0]) == [0, DENSITY_WINDOW]
+    assert list(density["1"][1]) == [2, 1]
+    assert list(density["2"][0]) == [0]
+    assert list(density["2"][1]) == [1]
+
+
+def test_merge_densities() -> None:
+    density = merge_densities([
+        _density({"1": [(0, 1.0), (100, 2.0)]}),
+        _density({"chr1": [(100, 3.0), (200, 4.0)]}),
+    ], lambda chrom: chrom.removeprefix("chr"))
+
+    assert list(density["1"][0]) == [0, 100, 200]
+    assert list(density["1"][1]) == [1.0, 5.0, 4.0]
+
+
+def test_plan_balanced_buckets_splits_dense_regions() -> None:
+    density = _density({
+        "1": [(0, 10.0), (1000, 10.0), (2000, 10.0), (3000, 10.0)],
+    })
+
+    buckets = plan_balanced_buckets(
+        density, ["1", "2", "3"], {"1": 5000, "2": 100, "3": 100}, 4)
+
+    assert buckets == [
+        [Region("1", 1, 1000)],
+        [Region("1", 1001, 2000)],
+        [Region("1", 2001, 3000)],
+        [Region("1", 3001, 5000), Region("2"), Region("3")],
+    ]
+
+
+def test_plan_balanced_buckets_groups_sparse_chromosomes() -> None:
+    density = _density({
+        "1": [(0, 10.0)],
+        "2": [(0, 5.0)],
+        "3": [(0, 5.0)],
+    })
+
+    buckets = plan_balanced_buckets(
+        density, ["1", "2", "3", "4"],
+        {"1": 100, "2": 100, "3": 100, "4": 100}, 2)
+
+    assert buckets == [
+        [Region("1")],
+        [Region("2"), Region("3"), Region("4")],
+    ]
+
+
+@pytest.mark.parametrize("buckets_count", [1, 10])
+def test_plan_balanced_buckets_covers_chromosomes(buckets_count: int) -> None:
+    density = positions_density(
+        ["1"] * 1000 + ["2"] * 10,
+        list(range(1, 100_001, 100)) + list(range(1, 11)),
+    )
+
+    buckets = plan_balanced_buckets(
+        density, ["1", "2"], {"1": 100_000, "2": 100}, buckets_count)
+
+    assert len(buckets) <= buckets_count
+    regions = [region for bucket in buckets for region in bucket]
+    assert regions[0].start in {None, 1}
+    for prev, curr in itertools.pairwise(regions):
+        if prev.chrom == curr.chrom:
+            assert prev.stop is not None
+            assert curr.start == prev.stop + 1
+
+
+def test_plan_balanced_buckets_without_variants() -> None:
+    buckets = plan_balanced_buckets({}, ["1", "2"], {"1": 100, "2": 100}, 5)
+
+    assert buckets == [[Region("1"), Region("2")]]
+
+
+def test_index_density(tmp_path: pathlib.Path) -> None:
+    lines = [
+        f"{chrom}\t{pos}\t{pos}\tA\n"
+        for chrom, count in [("chr1", 20_000), ("chr2", 10)]
+        for pos in range(1, count * 100, 100)
+    ]
+    filename = tmp_path / "variants.txt"
+    filename.write_text("".join(lines))
+    tabix_filename = pysam.tabix_index(
+        str(filename), seq_col=0, start_col=1, end_col=2)
+
+    density = index_density(f"{tabix_filename}.tbi")
+
+    assert set(density) == {"chr1", "chr2"}
+    starts, weights = density["chr1"]
+    assert np.all(weights > 0)
+    assert starts.min() == 0
+    assert starts.max() < 20_000 * 100
+    assert weights.sum() > density["chr2"][1].sum()
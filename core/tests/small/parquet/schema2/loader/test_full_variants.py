@@ -2,6 +2,7 @@
 import pathlib
 
 import pytest
+import pytest_mock
 from gain.genomic_resources.testing import (
     setup_pedigree,
     setup_vcf,
@@ -10,6 +11,7 @@ from gain.utils.regions import Region
 
 from gpf.gpf_instance import GPFInstance
 from gpf.parquet.schema2.loader import ParquetLoader
+from gpf.schema2_storage.schema2_layout import load_schema2_dataset_layout
 from gpf.testing.import_helpers import vcf_study
 
 
@@ -79,6 +81,42 @@ chr1   100  .  T   G    .    .      .    GT     0/1  0/1  0/1 0/0  0/0  0/0 0/1
     return f"{root_path}/work_dir/study_odd"
 
 
+@pytest.fixture(scope="module")
+def acgt_study_many(acgt_instance: GPFInstance) -> str:
+    """Study with 90 summary variants, each of them in both families."""
+    root_path = pathlib.Path(acgt_instance.dae_dir)
+    ped_path = setup_pedigree(
+        root_path / "study_many" / "pedigree" / "in.ped",
+        """
+familyId personId dadId momId sex status role
+f1       mom1     0     0     2   1      mom
+f1       dad1     0     0     1   1      dad
+f1       ch1      dad1  mom1  2   2      prb
+f2       mom2     0     0     2   1      mom
+f2       dad2     0     0     1   1      dad
+f2       ch2      dad2  mom2  2   2      prb
+        """)
+    records = "\n".join(
+        f"chr1 {pos} . A G . . . GT 0/1 0/0 0/1 0/0 0/1 0/1"
+        for pos in range(1, 91))
+    vcf_path = setup_vcf(
+        root_path / "study_many" / "vcf" / "in.vcf.gz",
+        f"""
+##fileformat=VCFv4.2
+##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+##contig=<ID=chr1>
+#CHROM POS ID REF ALT QUAL FILTER INFO FORMAT mom1 dad1 ch1 mom2 dad2 ch2
+{records}
+        """)
+    vcf_study(
+        root_path,
+        "study_many", ped_path, [vcf_path],
+        gpf_instance=acgt_instance,
+        project_config_overwrite={"destination": {"storage_type": "schema2"}},
+    )
+    return f"{root_path}/work_dir/study_many"
+
+
 def test_fetch_variants_count_nonpartitioned(
     t4c8_study_nonpartitioned: str,
 ) -> None:
@@ -155,3 +193,25 @@ def test_fetch_variants_pedigree_only(
     assert len(vs) == 0
     # family variants
     assert sum(len(fvs) for _, fvs in vs) == 0
+
+
+def test_fetch_variants_region_deep_in_multi_batch_file(
+    acgt_study_many: str,
+    mocker: pytest_mock.MockerFixture,
+) -> None:
+    loader = ParquetLoader(
+        load_schema2_dataset_layout(acgt_study_many), batch_size=4)
+    unique_records = mocker.spy(ParquetLoader, "_unique_family_records")
+
+    vs = list(loader.fetch_variants(region=Region("chr1", 81, 90)))
+
+    assert [sv.position for sv, _ in vs] == list(range(81, 91))
+    for sv, fvs in vs:
+        assert [fv.family_id for fv in fvs] == ["f1", "f2"]
+        for fv in fvs:
+            assert fv.position == sv.position
+    # family records before the region are not buffered
+    assert unique_records.call_count > 0
+    assert max(
+        len(call.args[0]) for call in unique_records.call_args_list
+    ) <= 16
@@ -5,7 +5,7 @@ import pyarrow as pa
 import pyarrow.parquet as pq
 import pytest
 
-from gpf.parquet.schema2.loader import MultiReader, Reader
+from gpf.parquet.schema2.loader import MultiReader, Reader, variant_index_keys
 
 
 def test_reader(tmp_path: pathlib.Path) -> None:
@@ -69,3 +69,43 @@ def test_multi_reader(tmp_path: pathlib.Path) -> None:
         [{"bucket_index": 1, "summary_index": 4},
          {"bucket_index": 1, "summary_index": 4}],
     ]
+
+
+def test_multi_reader_iter_batches(tmp_path: pathlib.Path) -> None:
+    file_path_a = str(tmp_path / "file_a.parquet")
+    pq.write_table(pa.table({"bucket_index": [0, 0, 0, 1, 1, 1],
+                             "summary_index": [1, 1, 2, 1, 2, 2],
+                             "source": ["a"] * 6}),
+                   file_path_a)
+    file_path_b = str(tmp_path / "file_b.parquet")
+    pq.write_table(pa.table({"bucket_index": [0, 0, 0, 1, 1, 1],
+                             "summary_index": [2, 2, 3, 2, 3, 3],
+                             "source": ["b"] * 6}),
+                   file_path_b)
+    reader = MultiReader((file_path_a, file_path_b),
+                         columns=("bucket_index", "summary_index", "source"),
+                         batch_size=2)
+
+    batches = list(reader.iter_batches())
+    assert len(batches) > 1
+
+    seen: set[int] = set()
+    rows = []
+    for batch in batches:
+        keys = set(variant_index_keys(batch).tolist())
+        # all records of a variant are in a single batch
+        assert not keys & seen
+        seen |= keys
+        rows.extend(batch.to_pylist())
+
+    assert [
+        (row["bucket_index"], row["summary_index"], row["source"])
+        for row in rows
+    ] == [
+        (0, 1, "a"), (0, 1, "a"),
+        (0, 2, "a"), (0, 2, "b"), (0, 2, "b"),
+        (0, 3, "b"),
+        (1, 1, "a"),
+        (1, 2, "a"), (1, 2, "a"), (1, 2, "b"),
+        (1, 3, "b"), (1, 3, "b"),
+    ]
@@ -218,3 +218,71 @@ def test_explore_merging_parquet_using_duckdb(
 
     data = merged.read().to_pandas()
     assert len(data) == 20000
+
+
+@pytest.fixture
+def summary_parquet_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Fixture to create summary parquet files with shuffled rows."""
+    rng = random.Random(0)  # noqa: S311
+    for bucket_index, chrom in enumerate(["chr1", "chr2"]):
+        rows = list(range(10_000))
+        rng.shuffle(rows)
+        table = pa.table({
+            "bucket_index": [bucket_index] * 10_000,
+            "summary_index": rows,
+            "allele_index": [1] * 10_000,
+            "chromosome": [chrom] * 10_000,
+            "position": [row + 1 for row in rows],
+        })
+        pq.write_table(
+            table, str(tmp_path / f"summary_{1 - bucket_index}.parquet"))
+    return tmp_path
+
+
+def test_merge_parquet_directory_sorted(
+    summary_parquet_dir: pathlib.Path,
+) -> None:
+    out_file = str(summary_parquet_dir / "merged.parquet")
+    merge_parquet_directory(
+        summary_parquet_dir, out_file,
+        variants_type="summary", row_group_size=5_000,
+        sort=True, threads=2, memory_limit="1G")
+
+    merged = pq.ParquetFile(out_file)
+    data = merged.read().to_pandas()
+    assert len(data) == 20_000
+    assert data.bucket_index.tolist() == [0] * 10_000 + [1] * 10_000
+    assert data.chromosome.tolist() == ["chr1"] * 10_000 + ["chr2"] * 10_000
+    assert data.summary_index.tolist() == list(range(10_000)) * 2
+    assert data.position.tolist() == list(range(1, 10_001)) * 2
+
+    assert merged.num_row_groups > 1
+    first_stats = merged.metadata.row_group(0).column(4).statistics
+    assert first_stats.min == 1
+    assert first_stats.max < 10_000
+
+
+def test_merge_parquet_directory_sort_requires_variants_type(
+    summary_parquet_dir: pathlib.Path,
+) -> None:
+    out_file = str(summary_parquet_dir / "merged.parquet")
+    with pytest.raises(ValueError, match="variants type"):
+        merge_parquet_directory(summary_parquet_dir, out_file, sort=True)
+
+
+def test_merge_parquets_family_id_bloom_filter(tmp_path: pathlib.Path) -> None:
+    in_file = str(tmp_path / "family_0.parquet")
+    pq.write_table(pa.table({
+        "family_id": [f"f{i % 100}" for i in range(10_000)],
+        "summary_index": list(range(10_000)),
+    }), in_file)
+    out_file = str(tmp_path / "merged.parquet")
+
+    merge_parquet.merge_parquets([in_file], out_file)
+
+    blooms = duckdb.execute(
+        "SELECT path_in_schema, bloom_filter_offset "
+        "FROM parquet_metadata(?)", [out_file],
+    ).fetchall()
+    assert ("family_id", None) not in blooms
+    assert any(path == "family_id" for path, _ in blooms)
@@ -1,5 +1,6 @@
 # pylint: disable=W0621,C0114,C0115,C0116,W0212,W0613
 
+import pathlib
 from collections.abc import Sequence
 from types import TracebackType
 
@@ -9,12 +10,17 @@ from gain.annotation.annotation_pipeline import (
 )
 from gain.utils.processing_pipeline import Filter, PipelineProcessor
 
+from gpf.parquet.schema2.annotation_cache import AnnotationCache
 from gpf.parquet.schema2.processing_pipeline import (
     AnnotationPipelineVariantsBatchFilter,
     AnnotationPipelineVariantsFilter,
+    CachedAnnotationVariantsBatchFilter,
     VariantsLoaderBatchSource,
     VariantsLoaderSource,
+    _allele_key,
 )
+from gpf.variants.core import Allele
+from gpf.variants.variant import SummaryAllele
 from gpf.variants_loaders.raw.loader import (
     FullVariant,
     VariantsGenotypesLoader,
@@ -85,6 +91,60 @@ def test_dummy_annotation_pipeline_variants_filter(
     assert index == 11
 
 
+def test_cached_annotation_pipeline_variants_batch_filter(
+    dummy_annotation_pipeline: AnnotationPipeline,
+    study_1_loader: VariantsGenotypesLoader,
+    tmp_path: pathlib.Path,
+) -> None:
+    cache_filename = str(tmp_path / "cache" / "annotation.db")
+    annotator = dummy_annotation_pipeline.annotators[0]
+
+    batch_filter = CachedAnnotationVariantsBatchFilter(
+        dummy_annotation_pipeline, AnnotationCache(cache_filename, "dummy"))
+    batch_filter.filter(list(study_1_loader.fetch()))
+    assert annotator.index == 11
+
+    batch_filter = CachedAnnotationVariantsBatchFilter(
+        dummy_annotation_pipeline, AnnotationCache(cache_filename, "dummy"))
+    result = batch_filter.filter(list(study_1_loader.fetch()))
+    assert annotator.index == 11
+    assert [
+        sa.attributes["index"]
+        for full_variant in result
+        for sa in full_variant.summary_variant.alt_alleles
+    ] == list(range(1, 12))
+
+    batch_filter = CachedAnnotationVariantsBatchFilter(
+        dummy_annotation_pipeline, AnnotationCache(cache_filename, "other"))
+    batch_filter.filter(list(study_1_loader.fetch()))
+    assert annotator.index == 22
+
+
+def test_annotation_cache_keeps_cnv_types_apart(
+    tmp_path: pathlib.Path,
+) -> None:
+    deletion = SummaryAllele(
+        "chr16", 29_500_000, None, None, end_position=30_200_000,
+        allele_type=Allele.Type.large_deletion)
+    duplication = SummaryAllele(
+        "chr16", 29_500_000, None, None, end_position=30_200_000,
+        allele_type=Allele.Type.large_duplication)
+    assert _allele_key(deletion) != _allele_key(duplication)
+
+    cache = AnnotationCache(str(tmp_path / "annotation.db"), "dummy")
+    cache.put({
+        _allele_key(deletion): {"effect": "CNV-"},
+        _allele_key(duplication): {"effect": "CNV+"},
+    })
+    cached = cache.get([_allele_key(deletion), _allele_key(duplication)])
+    cache.close()
+
+    assert cached == {
+        _allele_key(deletion): {"effect": "CNV-"},
+        _allele_key(duplication): {"effect": "CNV+"},
+    }
+
+
 @pytest.mark.parametrize(
     "batch_size, expected_batches",
     [
@@ -100,6 +100,42 @@ def test_variants_parquet_writer_row_group_size(
     assert pq_metadata.num_row_groups == expected_row_groups
 
 
+@pytest.mark.parametrize(
+    "row_group_bytes, expected_row_groups",
+    [
+        (1, 11),
+        (100_000_000, 1),
+    ],
+)
+def test_variants_parquet_writer_row_group_bytes(
+    study_1_loader: VariantsGenotypesLoader,
+    tmp_path: pathlib.Path,
+    row_group_bytes: int,
+    expected_row_groups: int,
+) -> None:
+    output_path = tmp_path / "output"
+    with VariantsParquetWriter(
+        output_path,
+        annotation_schema=[],
+        partition_descriptor=PartitionDescriptor(),
+        row_group_bytes=row_group_bytes,
+    ) as variants_writer:
+        for variant in VariantsLoaderSource(study_1_loader).fetch():
+            variants_writer.write(variant)
+
+    [summary_writer] = [
+        writer for filename, writer in variants_writer.data_writers.items()
+        if filename.endswith("summary_bucket_index_000001.parquet")
+    ]
+    assert summary_writer.rows_written == 11
+    assert summary_writer.estimated_bytes > 0
+
+    pq_metadata = pq.read_metadata(
+        output_path / "summary" / "summary_bucket_index_000001.parquet")
+    assert pq_metadata.num_rows == 11
+    assert pq_metadata.num_row_groups == expected_row_groups
+
+
 def test_variants_parquet_writer_no_blob(
     study_1_loader: VariantsGenotypesLoader,
     tmp_path: pathlib.Path,
@@ -0,0 +1,107 @@
+# pylint: disable=W0621,C0114,C0116,W0212,W0613
+import json
+
+import pytest
+
+from gpf.pedigrees.families_data import FamiliesData, tag_families_data
+from gpf.pedigrees.families_index import FamiliesIndex, get_families_index
+from gpf.pedigrees.family import FamilyTag
+from gpf.pedigrees.family_tag_builder import check_family_tags_query
+from gpf.pedigrees.loader import FamiliesLoader
+from gpf.pedigrees.testing import build_families_data
+
+
+@pytest.fixture
+def families() -> FamiliesData:
+    families = build_families_data("""
+        familyId personId dadId	 momId	sex status role
+        f1       m1       0      0      2   1      mom
+        f1       d1       0      0      1   1      dad
+        f1       p1       d1     m1     2   2      prb
+        f1       s1       d1     m1     2   1      sib
+        f2       m2       0      0      2   1      mom
+        f2       d2       0      0      1   1      dad
+        f2       p2       d2     m2     1   2      prb
+        f3       m3       0      0      2   1      mom
+        f3       p3       0      m3     2   2      prb
+    """)
+    tag_families_data(families)
+    return families
+
+
+def _expected_tsv(families: FamiliesData, family_ids: list[str]) -> list[str]:
+    tsv = FamiliesLoader.to_tsv(FamiliesData.from_families({
+        family_id: families[family_id] for family_id in family_ids
+    }))
+    return [f"{line}\n" for line in tsv.rstrip("\n").split("\n")]
+
+
+def test_families_index_tsv_lines(families: FamiliesData) -> None:
+    index = FamiliesIndex(families)
+
+    assert index.tsv_lines() == _expected_tsv(families, ["f1", "f2", "f3"])
+    assert index.tsv_lines(["f3", "f1"]) == \
+        _expected_tsv(families, ["f3", "f1"])
+    assert index.tsv_lines([]) == index.tsv_lines()[:1]
+
+
+def test_families_index_tagged_family_ids(families: FamiliesData) -> None:
+    index = FamiliesIndex(families)
+
+    assert index.tagged_family_ids(FamilyTag.QUAD) == {"f1"}
+    assert index.tagged_family_ids(FamilyTag.TRIO) == {"f2"}
+    assert index.tagged_family_ids(FamilyTag.MISSING_DAD) == {"f3"}
+
+
+@pytest.mark.parametrize("or_mode", [True, False])
+@pytest.mark.parametrize("include_tags,exclude_tags", [
+    (set(), set()),
+    ({FamilyTag.NUCLEAR}, set()),
+    ({FamilyTag.NUCLEAR, FamilyTag.FEMALE_PRB}, set()),
+    (set(), {FamilyTag.QUAD}),
+    ({FamilyTag.FEMALE_PRB}, {FamilyTag.MISSING_DAD}),
+])
+def test_families_index_query_tags(
+    families: FamiliesData, *,
+    or_mode: bool,
+    include_tags: set[FamilyTag],
+    exclude_tags: set[FamilyTag],
+) -> None:
+    index = FamiliesIndex(families)
+
+    assert index.query_tags(
+        or_mode=or_mode,
+        include_tags=include_tags,
+        exclude_tags=exclude_tags,
+    ) == [
+        family_id for family_id, family in families.items()
+        if check_family_tags_query(
+            family, or_mode=or_mode,
+            include_tags=include_tags,
+            exclude_tags=exclude_tags,
+        )
+    ]
+
+
+def test_get_families_index_is_cached(families: FamiliesData) -> None:
+    index = get_families_index(families)
+    assert get_families_index(families) is index
+    assert families.families_index is index
+
+    families.redefine()
+    assert get_families_index(families) is not index
+
+
+def test_families_index_family_details_json(families: FamiliesData) -> None:
+    index = FamiliesIndex(families)
+    family = families["f1"]
+
+    details = json.loads(index.family_details_json("f1"))
+
+    assert details["family_id"] == "f1"
+    assert details["person_ids"] == ["m1", "d1", "p1", "s1"]
+    assert details["tags"] == sorted(family.to_json()["tags"])
+    assert details["members"] == [
+        member.to_json() for member in family.members_in_order
+    ]
+    assert index.family_details_json("f1") is index.family_details_json("f1")
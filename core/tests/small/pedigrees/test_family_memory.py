@@ -0,0 +1,103 @@
+# pylint: disable=W0621,C0114,C0116,W0212,W0613
+import copy
+import gc
+import pickle  # noqa: S403
+import tracemalloc
+
+from gpf.pedigrees.family import Family, FamilyTag, Person
+
+
+def _build_families(count: int) -> list[Family]:
+    families = []
+    for index in range(count):
+        fid = f"f{index}"
+        families.append(Family.from_persons([
+            Person(
+                family_id=fid, person_id=f"{fid}.mom",
+                mom_id="0", dad_id="0",
+                sex="F", status="unaffected", role="mom",
+                layout="1:10,10"),
+            Person(
+                family_id=fid, person_id=f"{fid}.dad",
+                mom_id="0", dad_id="0",
+                sex="M", status="unaffected", role="dad",
+                layout="1:10,20"),
+            Person(
+                family_id=fid, person_id=f"{fid}.p1",
+                mom_id=f"{fid}.mom", dad_id=f"{fid}.dad",
+                sex="M", status="affected", role="prb",
+                layout="2:10,10", tag_simplex_family="True"),
+            Person(
+                family_id=fid, person_id=f"{fid}.s1",
+                mom_id=f"{fid}.mom", dad_id=f"{fid}.dad",
+                sex="F", status="unaffected", role="sib",
+                layout="2:10,20"),
+        ]))
+    return families
+
+
+def test_person_and_family_are_slotted() -> None:
+    family = _build_families(1)[0]
+    person = family.persons["f0.p1"]
+
+    assert not hasattr(person, "__dict__")
+    assert not hasattr(family, "__dict__")
+
+
+def test_persons_share_attributes_layout() -> None:
+    families = _build_families(2)
+    first = families[0].persons["f0.p1"]
+    second = families[1].persons["f1.p1"]
+
+    assert first._layout is second._layout
+
+    first.set_attr("extra", 1)
+    second.set_attr("extra", 2)
+    assert first._layout is second._layout
+    assert first.get_attr("extra") == 1
+    assert second.get_attr("extra") == 2
+    assert not families[0].persons["f0.s1"].has_attr("extra")
+
+
+def test_person_tags_mask() -> None:
+    family = _build_families(1)[0]
+    person = family.persons["f0.p1"]
+
+    assert person.tags == {FamilyTag.SIMPLEX}
+    assert family.tags == {FamilyTag.SIMPLEX}
+    person.unset_tag(FamilyTag.SIMPLEX)
+    person.set_tag(FamilyTag.QUAD)
+    assert person.has_tag(FamilyTag.QUAD)
+    assert not person.has_tag(FamilyTag.SIMPLEX)
+    assert person.all_tag_labels()["tag_quad_family"]
+
+
+def test_family_pickle_and_deepcopy() -> None:
+    family = _build_families(1)[0]
+
+    for result in (
+        pickle.loads(pickle.dumps(family)),
+        copy.deepcopy(family),
+    ):
+        assert result == family
+        assert result.tags == family.tags
+        for person_id, person in family.persons.items():
+            restored = result.persons[person_id]
+            assert restored._attributes == person._attributes
+            assert restored._layout is person._layout
+            assert restored.tags == person.tags
+
+
+def test_person_memory_footprint() -> None:
+    count = 2_500
+    gc.collect()
+    tracemalloc.start()
+    try:
+        families = _build_families(count)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(families) == count
+    # about 960 bytes per person with dict based attributes and tag sets
+    assert current / (4 * count) < 750
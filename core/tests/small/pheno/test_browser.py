@@ -305,3 +305,57 @@ def test_regression_display_names_with_ids(
 
 def test_has_measure_descriptions(fake_pheno_browser: PhenoBrowser) -> None:
     assert fake_pheno_browser.has_measure_descriptions is True
+
+
+def test_save_resets_search_index(tmp_path: pathlib.Path) -> None:
+    db_path = str(tmp_path / "browser.db")
+    browser = PhenoBrowser(db_path, read_only=False)
+    measure = {
+        "measure_id": "test_instrument.test_measure",
+        "instrument_name": "test_instrument",
+        "measure_name": "test_measure",
+        "measure_type": 1,
+        "description": "a test measure",
+        "values_domain": "[0, 10]",
+    }
+    assert browser.count_measures(keyword="measure") == 0
+
+    browser.save(measure)
+
+    assert browser.count_measures(keyword="measure") == 1
+    assert [
+        m["measure_id"] for m in browser.search_measures(keyword="measure")
+    ] == ["test_instrument.test_measure"]
+
+
+@pytest.mark.parametrize("instrument_name,keyword,expected", [
+    ("i2", None, ["i2.m1"]),
+    (None, "i3", ["i3.m1"]),
+    ("i1", "m1", ["i1.m1", "i1.m10"]),
+    (None, "missing", []),
+])
+def test_search_measure_ids(
+    fake_pheno_browser: PhenoBrowser,
+    instrument_name: str | None,
+    keyword: str | None,
+    expected: list[str],
+) -> None:
+    assert fake_pheno_browser.search_measure_ids(
+        instrument_name, keyword) == expected
+
+
+def test_search_measure_ids_is_not_paged(tmp_path: pathlib.Path) -> None:
+    browser = PhenoBrowser(str(tmp_path / "browser.db"), read_only=False)
+    for index in range(PhenoBrowser.PAGE_SIZE + 10):
+        browser.save({
+            "measure_id": f"i1.m{index:04}",
+            "instrument_name": "i1",
+            "measure_name": f"m{index:04}",
+            "measure_type": 1,
+        })
+
+    measure_ids = browser.search_measure_ids("i1")
+    assert len(measure_ids) == PhenoBrowser.PAGE_SIZE + 10
+    assert measure_ids == sorted(measure_ids)
+    assert len(browser.search_measure_ids(keyword="m")) == \
+        PhenoBrowser.PAGE_SIZE + 10
@@ -0,0 +1,54 @@
+# pylint: disable=W0621,C0114,C0116,W0212,W0613
+import pytest
+
+from gpf.pheno.measures_search import MeasuresSearchIndex
+
+
+@pytest.fixture
+def index() -> MeasuresSearchIndex:
+    return MeasuresSearchIndex(
+        [
+            "i1.age", "i1.iq", "i1.head_size",
+            "i2.age", "i2.score%", "other.m1",
+        ],
+        ["age", "iq", "head_size", "age", "score%", "m1"],
+        ["i1", "i1", "i1", "i2", "i2", "other"],
+    )
+
+
+@pytest.mark.parametrize("keyword, expected", [
+    ("age", ["i1.age", "i2.age"]),
+    ("AGE", ["i1.age", "i2.age"]),
+    ("i1.", ["i1.age", "i1.iq", "i1.head_size"]),
+    ("iq", ["i1.iq"]),
+    ("e", ["i1.age", "i1.head_size", "i2.age", "i2.score%", "other.m1"]),
+    ("_", ["i1.head_size"]),
+    ("%", ["i2.score%"]),
+    ("d_s", ["i1.head_size"]),
+    ("agei", []),
+    ("missing", []),
+])
+def test_match_measure_ids(
+    index: MeasuresSearchIndex, keyword: str, expected: list[str],
+) -> None:
+    assert index.match_measure_ids(keyword) == expected
+
+
+def test_match_instrument_name(index: MeasuresSearchIndex) -> None:
+    assert index.match_measure_ids("other") == ["other.m1"]
+    assert index.match_measure_ids("i2") == ["i2.age", "i2.score%"]
+
+
+def test_match_within_instrument(index: MeasuresSearchIndex) -> None:
+    assert index.match_measure_ids("age", "i2") == ["i2.age"]
+    assert index.match_measure_ids("i2", "i2") == ["i2.age", "i2.score%"]
+    assert index.match_measure_ids("other", "other") == ["other.m1"]
+    assert index.match_measure_ids("age", "missing") == []
+
+
+def test_empty_index() -> None:
+    index = MeasuresSearchIndex([], [], [])
+
+    assert len(index) == 0
+    assert index.match_measure_ids("age") == []
+    assert index.match_measure_ids("a") == []
@@ -404,6 +404,26 @@ def test_study_get_people_measure_values_non_overlapping(
     assert result[8]["i4.m1"] is None
 
 
+def test_study_get_people_measure_values_batches(
+    fake_phenotype_data: PhenotypeStudy,
+) -> None:
+    measure_ids = ["i3.m1", "i4.m1"]
+    batches = list(fake_phenotype_data.db.get_people_measure_values_batches(
+        measure_ids, batch_size=4,
+    ))
+    assert len(batches) == 3
+
+    rows = [row for batch in batches for row in batch.to_pylist()]
+    expected = list(fake_phenotype_data.get_people_measure_values(
+        measure_ids,
+    ))
+    assert [row["person_id"] for row in rows] == \
+        [row["person_id"] for row in expected]
+    for row, expected_row in zip(rows, expected, strict=True):
+        for measure_id in measure_ids:
+            assert row[measure_id] == expected_row[measure_id]
+
+
 def test_study_get_people_measure_values_correct_values(
     fake_phenotype_data: PhenotypeStudy,
 ) -> None:
@@ -111,6 +111,24 @@ def test_pheno_group_get_people_measure_values(
     assert out["i1.iq"] == pytest.approx(86.41, abs=1e-2)
 
 
+def test_pheno_group_get_people_measure_values_batches(
+    fake_group: PhenotypeGroup,
+) -> None:
+    batches = list(fake_group.get_people_measure_values_batches(
+        ["i1.iq", "i5.iq"], person_ids=["f1.p1"]))
+
+    assert len(batches) == 2
+    for batch in batches:
+        assert batch.schema.names == [
+            "person_id", "family_id", "role", "status", "sex",
+            "i1.iq", "i5.iq",
+        ]
+    assert batches[0].column("i1.iq")[0].as_py() == \
+        pytest.approx(86.41, abs=1e-2)
+    assert batches[0].column("i5.iq").null_count == 1
+    assert batches[1].column("i1.iq").null_count == 1
+
+
 def test_pheno_group_get_measures(fake_group: PhenotypeGroup) -> None:
     # Total measures are 30
     measures = fake_group.get_measures(measure_type=MeasureType.continuous)
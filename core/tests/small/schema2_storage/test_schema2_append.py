@@ -0,0 +1,246 @@
+# pylint: disable=W0621,C0114,C0116,W0212,W0613
+import pathlib
+
+import pytest
+import pytest_mock
+from gain.genomic_resources.testing import (
+    setup_denovo,
+    setup_pedigree,
+    setup_vcf,
+)
+from pyarrow import dataset as ds
+
+from gpf.gpf_instance.gpf_instance import GPFInstance
+from gpf.import_tools.cli import run_with_project
+from gpf.parquet.schema2.loader import ParquetLoader
+from gpf.parquet.schema2.processing_pipeline import (
+    AnnotationPipelineVariantsBatchFilter,
+)
+from gpf.schema2_storage.schema2_layout import load_schema2_dataset_layout
+from gpf.testing.acgt_import import acgt_gpf
+from gpf.testing.import_helpers import cnv_import, denovo_import, vcf_import
+
+VCF_HEADER = """
+##fileformat=VCFv4.2
+##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+##contig=<ID=chr1>
+##contig=<ID=chr2>
+"""
+
+
+def _setup_pedigree(root_path: pathlib.Path, family_id: str) -> pathlib.Path:
+    return setup_pedigree(
+        root_path / family_id / "in.ped",
+        f"""
+familyId    personId       dadId          momId          sex status role
+{family_id} {family_id}.mo 0              0              2   1      mom
+{family_id} {family_id}.da 0              0              1   1      dad
+{family_id} {family_id}.ch {family_id}.da {family_id}.mo 2   2      prb
+        """)
+
+
+def _import_families(
+    root_path: pathlib.Path,
+    gpf_instance: GPFInstance,
+    family_id: str,
+    variants: list[tuple[str, int, str, str]], *,
+    append: bool = False,
+) -> None:
+    ped_path = _setup_pedigree(root_path, family_id)
+    records = "\n".join(
+        f"{chrom} {pos} {ref} {alt} {family_id}.ch"
+        for chrom, pos, ref, alt in variants)
+    denovo_path = setup_denovo(
+        root_path / family_id / "in.tsv",
+        f"""
+chrom pos ref alt person_id
+{records}
+        """)
+    project = denovo_import(
+        root_path, "study", ped_path, [denovo_path],
+        gpf_instance=gpf_instance,
+        project_config_overwrite={"destination": {"storage_type": "schema2"}},
+        project_config_update={
+            "processing_config": {"append": append},
+            "partition_description": {
+                "region_bin": {"chromosomes": ["chr1"], "region_length": 50},
+            },
+        },
+    )
+    run_with_project(project)
+
+
+def _import_cnvs(
+    root_path: pathlib.Path,
+    gpf_instance: GPFInstance,
+    family_id: str,
+    cnvs: list[tuple[str, str]], *,
+    append: bool = False,
+) -> None:
+    ped_path = _setup_pedigree(root_path, family_id)
+    best_states = {"CNV+": "2||2||3", "CNV-": "2||2||1"}
+    records = "\n".join(
+        f"{family_id} {location} {variant} {best_states[variant]}"
+        for location, variant in cnvs)
+    cnv_path = setup_denovo(
+        root_path / family_id / "in_cnv.tsv",
+        f"""
+family_id location variant best_state
+{records}
+        """)
+    project = cnv_import(
+        root_path, "study", ped_path, [cnv_path],
+        gpf_instance=gpf_instance,
+        project_config_overwrite={"destination": {"storage_type": "schema2"}},
+        project_config_update={
+            "processing_config": {"append": append},
+            "partition_description": {
+                "region_bin": {"chromosomes": ["chr1"], "region_length": 50},
+            },
+        },
+    )
+    run_with_project(project)
+
+
+@pytest.fixture
+def gpf_instance(tmp_path: pathlib.Path) -> GPFInstance:
+    return acgt_gpf(tmp_path)
+
+
+@pytest.fixture
+def appended_study(
+    tmp_path: pathlib.Path,
+    gpf_instance: GPFInstance,
+    mocker: pytest_mock.MockerFixture,
+) -> tuple[ParquetLoader, pytest_mock.MockType]:
+    _import_families(tmp_path, gpf_instance, "f1", [
+        ("chr1", 1, "A", "G"), ("chr2", 1, "A", "G"),
+    ])
+    annotate = mocker.spy(AnnotationPipelineVariantsBatchFilter, "filter")
+    _import_families(tmp_path, gpf_instance, "f2", [
+        ("chr1", 1, "A", "G"), ("chr1", 60, "A", "T"),
+    ], append=True)
+    return (
+        ParquetLoader(load_schema2_dataset_layout(
+            str(tmp_path / "work_dir" / "study"))),
+        annotate,
+    )
+
+
+def test_append_families_pedigree(
+    appended_study: tuple[ParquetLoader, pytest_mock.MockType],
+) -> None:
+    loader, _ = appended_study
+
+    assert list(loader.families.keys()) == ["f1", "f2"]
+
+
+def test_append_families_variants(
+    appended_study: tuple[ParquetLoader, pytest_mock.MockType],
+) -> None:
+    loader, _ = appended_study
+
+    variants = [
+        (sv.chrom, sv.position, fv.family_id)
+        for sv, fvs in loader.fetch_variants()
+        for fv in fvs
+    ]
+    assert sorted(variants) == [
+        ("chr1", 1, "f1"), ("chr1", 1, "f2"),
+        ("chr1", 60, "f2"), ("chr2", 1, "f1"),
+    ]
+
+
+def test_append_families_reuses_annotation(
+    appended_study: tuple[ParquetLoader, pytest_mock.MockType],
+) -> None:
+    _, annotate = appended_study
+
+    annotated = [
+        (fv.summary_variant.chrom, fv.summary_variant.position)
+        for call in annotate.call_args_list
+        for fv in call.args[1]
+    ]
+    assert annotated == [("chr1", 60)]
+
+
+@pytest.mark.usefixtures("appended_study")
+def test_append_families_twice_fails(
+    tmp_path: pathlib.Path,
+    gpf_instance: GPFInstance,
+) -> None:
+    with pytest.raises(ValueError, match="families already in"):
+        _import_families(tmp_path, gpf_instance, "f1", [
+            ("chr1", 1, "A", "G"),
+        ], append=True)
+
+
+@pytest.mark.usefixtures("appended_study")
+def test_append_families_without_frequencies(
+    tmp_path: pathlib.Path,
+) -> None:
+    summary = ds.dataset(
+        tmp_path / "work_dir" / "study" / "summary",
+        format="parquet", partitioning="hive",
+    ).to_table(columns=["af_allele_count", "af_allele_freq"])
+
+    assert len(summary) > 0
+    assert summary.column("af_allele_count").null_count == len(summary)
+    assert summary.column("af_allele_freq").null_count == len(summary)
+
+
+@pytest.mark.usefixtures("appended_study")
+def test_append_transmitted_variants_fails(
+    tmp_path: pathlib.Path,
+    gpf_instance: GPFInstance,
+) -> None:
+    ped_path = _setup_pedigree(tmp_path, "f3")
+    vcf_path = setup_vcf(
+        tmp_path / "f3" / "in.vcf.gz",
+        f"""{VCF_HEADER}
+#CHROM POS  ID REF ALT QUAL FILTER INFO FORMAT f3.mo f3.da f3.ch
+chr1   1    .  A   G    .    .      .    GT     0/1   0/0   0/1
+        """)
+    project = vcf_import(
+        tmp_path, "study", ped_path, [vcf_path],
+        gpf_instance=gpf_instance,
+        project_config_overwrite={"destination": {"storage_type": "schema2"}},
+        project_config_update={
+            "processing_config": {"append": True},
+            "partition_description": {
+                "region_bin": {"chromosomes": ["chr1"], "region_length": 50},
+            },
+        },
+    )
+    with pytest.raises(ValueError, match="allele frequencies"):
+        run_with_project(project)
+
+
+def test_append_cnv_with_same_breakpoints(
+    tmp_path: pathlib.Path,
+    gpf_instance: GPFInstance,
+    mocker: pytest_mock.MockerFixture,
+) -> None:
+    _import_cnvs(tmp_path, gpf_instance, "f1", [("chr1:11-30", "CNV-")])
+    annotate = mocker.spy(AnnotationPipelineVariantsBatchFilter, "filter")
+    _import_cnvs(
+        tmp_path, gpf_instance, "f2", [("chr1:11-30", "CNV+")], append=True)
+
+    annotated = [
+        sa.allele_type.name
+        for call in annotate.call_args_list
+        for fv in call.args[1]
+        for sa in fv.summary_variant.alt_alleles
+    ]
+    assert annotated == ["large_duplication"]
+
+    loader = ParquetLoader(load_schema2_dataset_layout(
+        str(tmp_path / "work_dir" / "study")))
+    variants = [
+        (fv.family_id, sv.alt_alleles[0].allele_type.name)
+        for sv, fvs in loader.fetch_variants()
+        for fv in fvs
+    ]
+    assert sorted(variants) == [
+        ("f1", "large_deletion"), ("f2", "large_duplication"),
+    ]
@@ -1,14 +1,25 @@
 # pylint: disable=W0621,C0114,C0116,W0212,W0613
+import pathlib
+
 import pyarrow.parquet as pq
 import pytest
-from gain.genomic_resources.testing import setup_pedigree, setup_vcf
+import pytest_mock
+from gain.genomic_resources.testing import (
+    setup_denovo,
+    setup_pedigree,
+    setup_vcf,
+)
 
+from gpf.import_tools import import_tools
+from gpf.import_tools.import_tools import Bucket
+from gpf.parquet.partition_descriptor import PartitionDescriptor
 from gpf.schema2_storage.schema2_import_storage import (
     Schema2DatasetLayout,
+    Schema2ImportStorage,
     create_schema2_dataset_layout,
 )
 from gpf.testing.acgt_import import acgt_gpf
-from gpf.testing.import_helpers import vcf_study
+from gpf.testing.import_helpers import denovo_import, vcf_import, vcf_study
 
 
 @pytest.fixture(scope="module")
@@ -59,3 +70,158 @@ def test_schema2_import_metadata(import_data: Schema2DatasetLayout) -> None:
     assert meta["reference_genome"] == "genome"
     assert "gene_models" in meta
     assert meta["gene_models"] == "empty_gene_models"
+
+
+@pytest.mark.parametrize("regions,expected", [
+    (["chr1:1-100"], {"chr1_0"}),
+    (["chr1:101-200"], {"chr1_0", "chr1_1"}),
+    (["chr1:201-250"], {"chr1_1", "chr1_2"}),
+    (["chr1:150-250"], {"chr1_0", "chr1_1", "chr1_2"}),
+    (["chr1:30-80"], {"chr1_0"}),
+    (["chr2"], {"chr2_0", "chr2_1", "chr2_2"}),
+    (["chr3:1-100", "chr4:101-200"], {"other_0", "other_1"}),
+    (["chr5"], None),
+    ([], None),
+])
+def test_bucket_region_bins(
+    regions: list[str], expected: set[str] | None,
+) -> None:
+    part_desc = PartitionDescriptor(
+        chromosomes=["chr1", "chr2"], region_length=100)
+    chromosome_lengths = {"chr1": 250, "chr2": 250, "chr3": 250, "chr4": 250}
+    bucket = Bucket("vcf", "test", regions, 1)
+
+    assert Schema2ImportStorage._bucket_region_bins(
+        bucket, part_desc, chromosome_lengths) == expected
+
+
+def test_write_variant_skips_unchanged_buckets(
+    tmp_path: pathlib.Path,
+    mocker: pytest_mock.MockerFixture,
+) -> None:
+    gpf_instance = acgt_gpf(tmp_path)
+    ped_path = setup_pedigree(
+        tmp_path / "study" / "pedigree" / "in.ped",
+        """
+familyId personId dadId momId sex status role
+f1.1     mom1     0     0     2   1      mom
+f1.1     dad1     0     0     1   1      dad
+f1.1     ch1      dad1  mom1  2   2      prb
+        """)
+    vcf_content = """
+##fileformat=VCFv4.2
+##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+##contig=<ID=chr1>
+#CHROM POS  ID REF ALT QUAL FILTER INFO FORMAT mom1 dad1 ch1
+chr1   1    .  A   G    .    .      .    GT     0/1  0/1  0/0
+        """
+    vcf_path = setup_vcf(tmp_path / "study" / "vcf" / "in.vcf.gz", vcf_content)
+    project = vcf_import(
+        tmp_path, "study", ped_path, [vcf_path],
+        gpf_instance=gpf_instance,
+        project_config_overwrite={"destination": {"storage_type": "schema2"}},
+    )
+    [bucket] = project.get_import_variants_buckets()
+    fingerprint = project.get_bucket_fingerprint(bucket)
+    assert project.get_bucket_fingerprint(bucket) == fingerprint
+
+    create_pipeline = mocker.spy(
+        Schema2ImportStorage, "_create_import_processing_pipeline")
+
+    Schema2ImportStorage._do_write_variant(project, bucket)
+    assert create_pipeline.call_count == 1
+    outputs = Schema2ImportStorage._bucket_output_filenames(project, bucket)
+    assert len(outputs) == 2
+
+    Schema2ImportStorage._do_write_variant(project, bucket)
+    assert create_pipeline.call_count == 1
+
+    setup_vcf(
+        tmp_path / "study" / "vcf" / "in.vcf.gz",
+        vcf_content.replace("0/1  0/1  0/0", "0/1  0/0  0/1"))
+    assert project.get_bucket_fingerprint(bucket) != fingerprint
+    Schema2ImportStorage._do_write_variant(project, bucket)
+    assert create_pipeline.call_count == 2
+    assert Schema2ImportStorage._bucket_output_filenames(
+        project, bucket) == outputs
+
+
+def test_bucket_fingerprint_covers_row_group_sizes(
+    tmp_path: pathlib.Path,
+) -> None:
+    gpf_instance = acgt_gpf(tmp_path)
+    ped_path = setup_pedigree(
+        tmp_path / "study" / "pedigree" / "in.ped",
+        """
+familyId personId dadId momId sex status role
+f1.1     mom1     0     0     2   1      mom
+f1.1     dad1     0     0     1   1      dad
+f1.1     ch1      dad1  mom1  2   2      prb
+        """)
+    denovo_path = setup_denovo(
+        tmp_path / "study" / "denovo" / "in.tsv",
+        """
+chrom pos ref alt person_id
+chr1  1   A   G   ch1
+        """)
+    project = denovo_import(
+        tmp_path, "study", ped_path, [denovo_path],
+        gpf_instance=gpf_instance,
+        project_config_overwrite={"destination": {"storage_type": "schema2"}},
+    )
+    [bucket] = project.get_import_variants_buckets()
+    fingerprint = project.get_bucket_fingerprint(bucket)
+
+    processing_config = project.import_config.setdefault(
+        "processing_config", {})
+    processing_config["parquet_row_group_size"] = 10
+    row_group_size_fingerprint = project.get_bucket_fingerprint(bucket)
+    assert row_group_size_fingerprint != fingerprint
+
+    processing_config["parquet_row_group_bytes"] = 1_000_000
+    assert project.get_bucket_fingerprint(bucket) not in {
+        fingerprint, row_group_size_fingerprint}
+
+
+def test_import_task_graph_fingerprints_inputs_once(
+    tmp_path: pathlib.Path,
+    mocker: pytest_mock.MockerFixture,
+) -> None:
+    gpf_instance = acgt_gpf(tmp_path)
+    ped_path = setup_pedigree(
+        tmp_path / "study" / "pedigree" / "in.ped",
+        """
+familyId personId dadId momId sex status role
+f1.1     mom1     0     0     2   1      mom
+f1.1     dad1     0     0     1   1      dad
+f1.1     ch1      dad1  mom1  2   2      prb
+        """)
+    denovo_path = setup_denovo(
+        tmp_path / "study" / "denovo" / "in.tsv",
+        """
+chrom pos ref alt person_id
+chr1  1   A   G   ch1
+chr2  1   A   G   ch1
+        """)
+    project = denovo_import(
+        tmp_path, "study", ped_path, [denovo_path],
+        gpf_instance=gpf_instance,
+        project_config_overwrite={"destination": {"storage_type": "schema2"}},
+        project_config_update={
+            "processing_config": {
+                "denovo": {
+                    "chromosomes": ["chr1", "chr2"],
+                    "region_length": 30,
+                },
+            },
+        },
+    )
+    assert len(project.get_import_variants_buckets()) > 1
+    file_fingerprint = mocker.spy(import_tools, "file_fingerprint")
+
+    Schema2ImportStorage().generate_import_task_graph(project)
+
+    fingerprinted = [
+        call.args[0] for call in file_fingerprint.call_args_list]
+    assert len(fingerprinted) == 2
+    assert len(set(fingerprinted)) == 2
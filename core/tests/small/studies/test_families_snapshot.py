@@ -0,0 +1,155 @@
+# pylint: disable=W0621,C0114,C0116,W0212,W0613
+import logging
+import pathlib
+import textwrap
+
+import pytest
+from box import Box
+from gain.genomic_resources.testing import (
+    setup_denovo,
+    setup_pedigree,
+)
+from pytest_mock import MockerFixture
+
+from gpf.gpf_instance.gpf_instance import GPFInstance
+from gpf.studies.families_snapshot import (
+    FamiliesSnapshotCache,
+    families_fingerprint,
+)
+from gpf.studies.study import GenotypeData, GenotypeDataGroup
+from gpf.testing.acgt_import import acgt_gpf
+from gpf.testing.import_helpers import denovo_study
+
+DATASET_CONFIG = {
+    "id": "ds1",
+    "person_set_collections": {
+        "phenotype": {
+            "id": "phenotype",
+            "name": "Phenotype",
+            "sources": [{"from": "pedigree", "source": "status"}],
+            "domain": [
+                {
+                    "color": "#4b2626",
+                    "id": "affected",
+                    "name": "affected",
+                    "values": ["affected"],
+                },
+                {
+                    "color": "#ffffff",
+                    "id": "unaffected",
+                    "name": "unaffected",
+                    "values": ["unaffected"],
+                },
+            ],
+            "default": {
+                "color": "#aaaaaa",
+                "id": "unspecified",
+                "name": "unspecified",
+            },
+        },
+        "selected_person_set_collections": ["phenotype"],
+    },
+}
+
+
+@pytest.fixture
+def snapshot_studies(
+    tmp_path: pathlib.Path,
+) -> tuple[GPFInstance, list[GenotypeData]]:
+    gpf_instance = acgt_gpf(tmp_path)
+    studies = []
+    for index in (1, 2):
+        var_path = setup_denovo(
+            tmp_path / f"study_{index}" / "in.tsv",
+            f"""
+chrom  pos  ref  alt  person_id
+chr1   {index}    A    C    ch{index}
+            """)
+        ped_path = setup_pedigree(
+            tmp_path / f"study_{index}" / "in.ped", textwrap.dedent(f"""
+familyId personId dadId momId sex status role
+f{index}       mom{index}     0     0     2   1      mom
+f{index}       dad{index}     0     0     1   1      dad
+f{index}       ch{index}      dad{index}  mom{index}  2   2      prb
+            """))
+        studies.append(denovo_study(
+            tmp_path, f"study_{index}", ped_path, [var_path],
+            gpf_instance=gpf_instance,
+        ))
+    return gpf_instance, studies
+
+
+def _build_group(
+    gpf_instance: GPFInstance,
+    studies: list[GenotypeData],
+    cache: FamiliesSnapshotCache,
+) -> GenotypeDataGroup:
+    return GenotypeDataGroup(
+        gpf_instance.genotype_storages,
+        Box(DATASET_CONFIG, default_box=True),
+        studies,
+        families_snapshots=cache,
+    )
+
+
+def test_group_families_snapshot_is_saved_and_reused(
+    tmp_path: pathlib.Path,
+    snapshot_studies: tuple[GPFInstance, list[GenotypeData]],
+    mocker: MockerFixture,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    gpf_instance, studies = snapshot_studies
+    cache = FamiliesSnapshotCache(tmp_path / "cache")
+
+    first = _build_group(gpf_instance, studies, cache)
+    fingerprint = families_fingerprint(first.config, studies)
+    assert cache.snapshot_path("ds1", fingerprint).exists()
+
+    combine = mocker.spy(GenotypeDataGroup, "_combine_families")
+    with caplog.at_level(logging.INFO, logger="gpf.studies.study"):
+        second = _build_group(gpf_instance, studies, cache)
+
+    combine.assert_not_called()
+    assert "families of ds1 loaded from the cache in" in caplog.text
+    assert "process RSS" in caplog.text
+    assert set(second.families.keys()) == {"f1", "f2"}
+    assert second.families.persons["f1", "ch1"].get_attr("phenotype") == \
+        "affected"
+    psc = second.person_set_collections["phenotype"]
+    assert len(psc.person_sets["affected"]) == 2
+    assert len(psc.person_sets["unaffected"]) == 4
+    assert psc.families is second.families
+
+
+def test_group_families_snapshot_invalidated_on_pedigree_change(
+    tmp_path: pathlib.Path,
+    snapshot_studies: tuple[GPFInstance, list[GenotypeData]],
+) -> None:
+    gpf_instance, studies = snapshot_studies
+    cache = FamiliesSnapshotCache(tmp_path / "cache")
+
+    group = _build_group(gpf_instance, studies, cache)
+    fingerprint = families_fingerprint(group.config, studies)
+
+    studies[0].families.persons["f1", "ch1"].set_attr("sample_id", "s1")
+    changed = families_fingerprint(group.config, studies)
+    assert changed != fingerprint
+
+    _build_group(gpf_instance, studies, cache)
+    snapshots = list((tmp_path / "cache").glob("ds1-*.families.pickle"))
+    assert snapshots == [cache.snapshot_path("ds1", changed)]
+
+
+def test_group_families_snapshot_ignores_person_set_attributes(
+    tmp_path: pathlib.Path,
+    snapshot_studies: tuple[GPFInstance, list[GenotypeData]],
+) -> None:
+    gpf_instance, studies = snapshot_studies
+    group = _build_group(
+        gpf_instance, studies, FamiliesSnapshotCache(tmp_path / "cache"))
+    fingerprint = families_fingerprint(group.config, studies)
+
+    studies[0].families.persons["f1", "ch1"].set_attr(
+        "phenotype", "affected")
+
+    assert families_fingerprint(group.config, studies) == fingerprint
@@ -1,4 +1,5 @@
 # pylint: disable=redefined-outer-name,C0114,C0116,R0917,C0302
+import argparse
 import pathlib
 import textwrap
 from collections.abc import Callable
@@ -31,6 +32,8 @@ from gain.utils.regions import Region
 from pytest_mock import MockerFixture
 
 from gpf.tools.liftover_tools import (
+    CNVLiftoverTool,
+    DenovoLiftoverTool,
     VCFLiftoverTool,
     _region_output_filename,
     cnv_liftover_main,
@@ -1515,3 +1518,107 @@ def test_dae_liftover_exact_toomany_threshold(
         assert len(lines) == 2  # Header + 1 variant
         parts = lines[1].strip().split("\t")
         assert len(parts[3].split(";")) == 3
+
+
+def test_vcf_liftover_parallel_matches_sequential(
+    tmp_path: pathlib.Path,
+    liftover_data: GenomicResourceRepo,
+) -> None:
+    vcf_file = setup_vcf(
+        tmp_path / "in.vcf.gz", textwrap.dedent("""
+##fileformat=VCFv4.2
+##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+##contig=<ID=chrA>
+#CHROM POS ID REF ALT QUAL FILTER INFO FORMAT mom1
+chrA   6   .  A   C   .    .      .    GT     0/1
+chrA   11  .  T   G   .    .      .    GT     0/1
+chrA   13  .  T   G   .    .      .    GT     0/1
+chrA   16  .  G   A   .    .      .    GT     0/1
+        """))
+    common_argv = [
+        "--chain", "liftover_chain",
+        "--source-genome", "source_genome",
+        "--target-genome", "target_genome",
+    ]
+
+    sequential_vcf = tmp_path / "sequential.vcf"
+    vcf_liftover_main(
+        [*common_argv, "-o", str(sequential_vcf), str(vcf_file)],
+        grr=liftover_data)
+
+    parallel_vcf = tmp_path / "parallel.vcf"
+    vcf_liftover_main(
+        [*common_argv, "-o", str(parallel_vcf),
+         "-j", "2", "--region-size", "7", str(vcf_file)],
+        grr=liftover_data)
+
+    with closing(pysam.VariantFile(str(sequential_vcf))) as vcffile:
+        expected = [
+            (v.chrom, v.pos, v.ref, v.alts) for v in vcffile.fetch()]
+    with closing(pysam.VariantFile(str(parallel_vcf))) as vcffile:
+        variants = [
+            (v.chrom, v.pos, v.ref, v.alts) for v in vcffile.fetch()]
+
+    assert len(variants) == 4
+    assert sorted(variants) == sorted(expected)
+    assert [v[1] for v in variants] == sorted(v[1] for v in variants)
+    assert not list(tmp_path.glob(".liftover-*"))
+
+
+def test_denovo_liftover_partition_regions(
+    tmp_path: pathlib.Path,
+    liftover_data: GenomicResourceRepo,
+) -> None:
+    tool = DenovoLiftoverTool()
+    tool.cli_args = argparse.Namespace(
+        chain="liftover_chain",
+        source_genome="source_genome",
+        target_genome="target_genome",
+        region_size=10,
+        output=str(tmp_path / "out.txt"),
+    )
+    tool.open_resources(liftover_data)
+
+    assert tool.partition_regions() == [
+        Region("chrA", 1, 10), Region("chrA", 11, 20),
+        Region("chrA", 21, 25),
+    ]
+    assert tool.partition_regions(Region("chrA", 8, 12)) == [
+        Region("chrA", 8, 10), Region("chrA", 11, 12),
+    ]
+
+
+def test_liftover_merge_outputs_sorts_by_target(
+    tmp_path: pathlib.Path,
+    liftover_data: GenomicResourceRepo,
+) -> None:
+    tool = CNVLiftoverTool()
+    tool.cli_args = argparse.Namespace(
+        chain="liftover_chain",
+        source_genome="source_genome",
+        target_genome="target_genome",
+    )
+    tool.open_resources(liftover_data)
+
+    part1 = tmp_path / "part1.tsv"
+    part1.write_text(
+        "location\tcnv_type\n"
+        "chrB:15-20\tLARGE_DUPLICATION\n"
+        "chrB:2-4\tLARGE_DELETION\n",
+    )
+    part2 = tmp_path / "part2.tsv"
+    part2.write_text(
+        "location\tcnv_type\n"
+        "chrB:10-12\tLARGE_DELETION\n",
+    )
+    for part in (part1, part2):
+        tool.sort_output(str(part))
+    out = tmp_path / "out.tsv"
+    tool.merge_outputs([str(part1), str(part2)], str(out))
+
+    assert out.read_text().splitlines() == [
+        "location\tcnv_type",
+        "chrB:2-4\tLARGE_DELETION",
+        "chrB:10-12\tLARGE_DELETION",
+        "chrB:15-20\tLARGE_DUPLICATION",
+    ]
@@ -1,13 +1,19 @@
 # pylint: disable=redefined-outer-name,C0114,C0116,protected-access
 import json
 import logging
+import os
 import pathlib
 
 import pyarrow as pa
 import pyarrow.parquet as pq
 import pytest
 
-from gpf.tools.verify_parquet import FileResult, main, verify_parquet_file
+from gpf.tools.verify_parquet import (
+    FileResult,
+    main,
+    parquet_footer_checksum,
+    verify_parquet_file,
+)
 
 
 @pytest.fixture
@@ -234,3 +240,121 @@ def test_cli_mixed_good_and_bad_exits_one(
         for rec in caplog.records
         if rec.levelno >= logging.ERROR
     )
+
+
+def test_verify_parquet_file_fingerprints_ok_result(
+    valid_parquet: pathlib.Path,
+) -> None:
+    result = verify_parquet_file(str(valid_parquet))
+
+    assert result.ok is True
+    assert result.size == valid_parquet.stat().st_size
+    assert result.mtime_ns == valid_parquet.stat().st_mtime_ns
+    assert result.footer_checksum == parquet_footer_checksum(
+        str(valid_parquet))
+
+
+def test_cli_manifest_skips_unchanged_files(
+    tmp_path: pathlib.Path,
+) -> None:
+    data = tmp_path / "data"
+    data.mkdir()
+    table = pa.table({"x": [1, 2, 3]})
+    for i in range(3):
+        pq.write_table(table, data / f"f{i}.parquet")
+    manifest = tmp_path / "manifest.json"
+    report = tmp_path / "report.json"
+
+    assert main([
+        str(data), "--manifest", str(manifest), "--json", str(report),
+    ]) == 0
+    doc = json.loads(report.read_text())
+    assert doc["stats"]["verified"] == 3
+    assert doc["stats"]["skipped"] == 0
+    assert len(json.loads(manifest.read_text())["files"]) == 3
+
+    pq.write_table(pa.table({"x": [4, 5]}), data / "f1.parquet")
+    pq.write_table(table, data / "f3.parquet")
+
+    assert main([
+        str(data), "--manifest", str(manifest), "--json", str(report),
+    ]) == 0
+    doc = json.loads(report.read_text())
+    assert doc["checked"] == 4
+    assert doc["stats"]["verified"] == 2
+    assert doc["stats"]["skipped"] == 2
+    by_path = {entry["path"]: entry for entry in doc["files"]}
+    assert by_path[str(data / "f0.parquet")]["cached"] is True
+    assert "cached" not in by_path[str(data / "f1.parquet")]
+
+
+def test_cli_manifest_shallow_entries_do_not_satisfy_deep(
+    valid_parquet: pathlib.Path, tmp_path: pathlib.Path,
+) -> None:
+    manifest = tmp_path / "manifest.json"
+    report = tmp_path / "report.json"
+
+    assert main([str(valid_parquet), "--manifest", str(manifest)]) == 0
+    assert main([
+        str(valid_parquet), "--deep", "-j", "1",
+        "--manifest", str(manifest), "--json", str(report),
+    ]) == 0
+
+    doc = json.loads(report.read_text())
+    assert doc["stats"]["verified"] == 1
+    entry = json.loads(manifest.read_text())["files"][str(valid_parquet)]
+    assert entry["deep"] is True
+
+
+def test_cli_manifest_deep_reverifies_files_with_changed_mtime(
+    multi_rowgroup_parquet: pathlib.Path, tmp_path: pathlib.Path,
+) -> None:
+    manifest = tmp_path / "manifest.json"
+    args = [
+        str(multi_rowgroup_parquet), "--deep", "-j", "1",
+        "--manifest", str(manifest),
+    ]
+    assert main(args) == 0
+
+    # rewrite the file with corrupted data pages; size and footer stay
+    raw = bytearray(multi_rowgroup_parquet.read_bytes())
+    offset = len(raw) // 4
+    for i in range(offset, offset + 32):
+        raw[i] ^= 0xFF
+    multi_rowgroup_parquet.write_bytes(bytes(raw))
+    stat = multi_rowgroup_parquet.stat()
+    os.utime(
+        multi_rowgroup_parquet,
+        ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert main(args) == 1
+    assert json.loads(manifest.read_text())["files"] == {}
+
+
+def test_cli_manifest_drops_failed_files(
+    valid_parquet: pathlib.Path, tmp_path: pathlib.Path,
+) -> None:
+    manifest = tmp_path / "manifest.json"
+    assert main([str(valid_parquet), "--manifest", str(manifest)]) == 0
+
+    valid_parquet.write_bytes(b"")
+
+    assert main([str(valid_parquet), "--manifest", str(manifest)]) == 1
+    assert json.loads(manifest.read_text())["files"] == {}
+
+
+def test_cli_deep_process_pool(
+    multi_rowgroup_parquet: pathlib.Path, tmp_path: pathlib.Path,
+) -> None:
+    report = tmp_path / "report.json"
+
+    rc = main([
+        str(multi_rowgroup_parquet), "--deep", "-j", "2",
+        "--executor", "process", "--batch-size", "10",
+        "--json", str(report),
+    ])
+
+    assert rc == 0
+    doc = json.loads(report.read_text())
+    assert doc["stats"]["bytes_verified"] == \
+        multi_rowgroup_parquet.stat().st_size
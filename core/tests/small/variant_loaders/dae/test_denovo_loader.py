@@ -3,9 +3,11 @@ import pathlib
 from collections.abc import Callable
 
 import pytest
+import pytest_mock
 from gain.genomic_resources.reference_genome import ReferenceGenome
 from gain.utils.regions import Region
 
+from gpf.import_tools.bucket_planning import loader_density
 from gpf.pedigrees.families_data import FamiliesData
 from gpf.variants_loaders.dae.loader import DenovoLoader
 
@@ -163,3 +165,46 @@ def test_reset_regions_with_chrom_add_prefix(
     variants = list(loader.full_variants_iterator())
     assert len(variants) == 3
     assert {sv.chromosome for sv, _ in variants} == {"chr1", "chr2"}
+
+
+def test_reset_regions_converts_only_region_records(
+    denovo_loader: Callable[
+        [pathlib.Path, dict[str, str], ReferenceGenome], DenovoLoader],
+    denovo_vcf_style: pathlib.Path,
+    acgt_genome_19: ReferenceGenome,
+    mocker: pytest_mock.MockerFixture,
+) -> None:
+    loader = denovo_loader(denovo_vcf_style, {}, acgt_genome_19)
+    load = mocker.spy(loader, "_flexible_denovo_load_internal")
+
+    loader.reset_regions([Region("2", 3, 10)])
+    variants = list(loader.full_variants_iterator())
+
+    assert [(sv.chromosome, sv.position) for sv, _ in variants] == [("2", 5)]
+    assert load.call_count == 1
+    assert len(load.call_args.kwargs["raw_df"]) == 1
+    assert loader._denovo_df is None
+
+    list(loader.full_variants_iterator())
+    assert load.call_count == 1
+
+    assert len(loader.denovo_df) == 4
+
+
+def test_loader_density_does_not_convert_records(
+    denovo_loader: Callable[
+        [pathlib.Path, dict[str, str], ReferenceGenome], DenovoLoader],
+    denovo_vcf_style: pathlib.Path,
+    acgt_genome_19: ReferenceGenome,
+    mocker: pytest_mock.MockerFixture,
+) -> None:
+    loader = denovo_loader(denovo_vcf_style, {}, acgt_genome_19)
+    load = mocker.spy(loader, "_flexible_denovo_load_internal")
+
+    density = loader_density(loader)
+
+    assert density is not None
+    assert sum(
+        float(counts.sum()) for _, counts in density.values()) == 4
+    assert load.call_count == 0
+    assert loader._denovo_df is None
@@ -1,5 +1,17 @@
 # pylint: disable=W0621,C0114,C0116,W0212,W0613,C0115
-from gpf.variants_loaders.raw.loader import CLIArgument, CLILoader
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+from gain.utils.regions import Region
+
+from gpf.variants_loaders.raw.loader import (
+    CLIArgument,
+    CLILoader,
+    group_rows,
+    regions_mask,
+)
 
 
 def test_cli_defaults_does_not_include_positionals() -> None:
@@ -34,3 +46,40 @@ def test_cli_defaults_does_not_include_positionals() -> None:
     loader = TestLoader()
     defaults = loader.cli_defaults()
     assert set(defaults.keys()) == {"kwarg1", "kwarg2"}
+
+
+def test_group_rows() -> None:
+    data = pd.DataFrame({
+        "chrom": ["2", "1", "2", None, "1", "2"],
+        "position": [10, 5, 10, 7, 5, 11],
+        "family_id": ["f1", "f2", "f3", "f4", "f5", "f6"],
+    })
+
+    keys, order, bounds = group_rows(data, ["chrom", "position"])
+
+    assert keys.to_dict("records") == [
+        {"chrom": "2", "position": 10},
+        {"chrom": "1", "position": 5},
+        {"chrom": "2", "position": 11},
+    ]
+    groups = [
+        data["family_id"].to_numpy()[order[begin:end]].tolist()
+        for begin, end in itertools.pairwise(bounds)
+    ]
+    assert groups == [["f1", "f3"], ["f2", "f5"], ["f6"]]
+
+
+@pytest.mark.parametrize("regions,expected", [
+    ([None], [True, True, True, True]),
+    ([], [False, False, False, False]),
+    ([Region("1")], [True, True, False, False]),
+    ([Region("1", 10, 20)], [True, False, False, False]),
+    ([Region("1", 21), Region("2", None, 15)], [False, True, True, False]),
+])
+def test_regions_mask(
+    regions: list[Region | None], expected: list[bool],
+) -> None:
+    chroms = np.array(["1", "1", "2", "2"], dtype=object)
+    positions = np.array([15, 25, 15, 25])
+
+    assert regions_mask(regions, chroms, positions).tolist() == expected
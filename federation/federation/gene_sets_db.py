@@ -1,6 +1,9 @@
 """Classes for handling of remote gene sets."""
 
+import hashlib
+import json
 import logging
+import time
 from functools import cached_property
 from typing import Any
 
@@ -8,10 +11,13 @@ from gain.gene_sets.gene_set import BaseGeneSetCollection, GeneSet
 
 from federation.utils import prefix_remote_identifier, prefix_remote_name
 from gpf.gene_sets.gene_sets_db import GeneSetsDb
+from gpf.gene_sets.gene_sets_search import GeneSetsSearchIndex
 from rest_client.rest_client import RESTClient
 
 logger = logging.getLogger(__name__)
 
+REMOTE_GENE_SET_VERSION_TTL = 300.0
+
 
 class RemoteGeneSetCollection(BaseGeneSetCollection):
     """Class for handling remote gene set collections."""
@@ -34,6 +40,7 @@ class RemoteGeneSetCollection(BaseGeneSetCollection):
             prefix_remote_name(desc, self.rest_client)
         self.web_format_str = fmt
         self.gene_sets: dict[str, GeneSet] = {}
+        self._gene_set_versions: dict[str, tuple[float, str]] = {}
 
     def _load_remote_gene_sets(self) -> None:
         if self._remote_gene_sets_loaded:
@@ -68,23 +75,50 @@ class RemoteGeneSetCollection(BaseGeneSetCollection):
 
         gene_set = self.gene_sets.get(gene_set_id)
         if gene_set is None or len(gene_set.syms) != gene_set.count:
-            raw_gene_set = self.rest_client.get_gene_set_download(
-                self._remote_collection_id, gene_set_id,
-            ).split("\n")
-            raw_gene_set = [gs.strip() for gs in raw_gene_set]
-            raw_gene_set = [gs for gs in raw_gene_set if gs]
-            name = raw_gene_set.pop(0).strip('"')
-            name = name.strip()
-            description = raw_gene_set.pop(0).strip('"')
-            description = description.strip()
-            assert name is not None
-            assert description is not None
-            assert name == gene_set_id, (name, gene_set_id)
-            gene_set = GeneSet(gene_set_id, description, raw_gene_set)
-            self.gene_sets[gene_set_id] = gene_set
+            gene_set = self._download_gene_set(gene_set_id)
+
+        return gene_set
 
+    def _download_gene_set(self, gene_set_id: str) -> GeneSet:
+        raw_gene_set = self.rest_client.get_gene_set_download(
+            self._remote_collection_id, gene_set_id,
+        ).split("\n")
+        raw_gene_set = [gs.strip() for gs in raw_gene_set]
+        raw_gene_set = [gs for gs in raw_gene_set if gs]
+        name = raw_gene_set.pop(0).strip('"')
+        name = name.strip()
+        description = raw_gene_set.pop(0).strip('"')
+        description = description.strip()
+        assert name is not None
+        assert description is not None
+        assert name == gene_set_id, (name, gene_set_id)
+        gene_set = GeneSet(gene_set_id, description, raw_gene_set)
+        self.gene_sets[gene_set_id] = gene_set
         return gene_set
 
+    def get_gene_set_version(self, gene_set_id: str) -> str:
+        """Return a hash of the content of a remote gene set.
+
+        The gene set is downloaded again once its version is older than
+        REMOTE_GENE_SET_VERSION_TTL seconds, so changes on the remote side
+        are picked up.
+        """
+        cached = self._gene_set_versions.get(gene_set_id)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < \
+                REMOTE_GENE_SET_VERSION_TTL:
+            return cached[1]
+
+        self._load_remote_gene_sets()
+        if gene_set_id not in self.remote_gene_sets_names:
+            return ""
+        gene_set = self._download_gene_set(gene_set_id)
+        version = hashlib.sha256(json.dumps([
+            gene_set["name"], gene_set["desc"], sorted(gene_set["syms"]),
+        ]).encode()).hexdigest()
+        self._gene_set_versions[gene_set_id] = (now, version)
+        return version
+
     def get_all_gene_sets(self) -> list[GeneSet]:
         self._load_remote_gene_sets()
         gene_set_descriptions = self.rest_client.get_gene_sets(
@@ -173,6 +207,30 @@ class RemoteGeneSetsDb(GeneSetsDb):
             self.gene_set_collections[collection_id].get_all_gene_sets(),
         )
 
+    def get_gene_set_version(
+        self, collection_id: str, gene_set_id: str,
+    ) -> str:
+        if self._local_gsdb.has_gene_set_collection(collection_id):
+            return self._local_gsdb.get_gene_set_version(
+                collection_id, gene_set_id)
+        return self.gene_set_collections[
+            collection_id
+        ].get_gene_set_version(gene_set_id)
+
+    def search_gene_sets(
+        self, collection_id: str,
+        query: str | None = None,
+        limit: int | None = None,
+    ) -> list[GeneSet]:
+        if self._local_gsdb.has_gene_set_collection(collection_id):
+            return self._local_gsdb.search_gene_sets(
+                collection_id, query, limit)
+        # remote gene sets are fetched on each request, so the index
+        # is not cached
+        gene_sets = self.get_all_gene_sets(collection_id)
+        index = GeneSetsSearchIndex.from_gene_sets(gene_sets)
+        return [gene_sets[position] for position in index.search(query, limit)]
+
     def get_gene_set(
             self, collection_id: str, gene_set_id: str) -> GeneSet | None:
         if self._local_gsdb.has_gene_set_collection(collection_id):
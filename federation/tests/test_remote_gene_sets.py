@@ -1,7 +1,11 @@
 # pylint: disable=W0621,C0114,C0116,W0212,W0613
 import pytest
+import pytest_mock
 
-from federation.gene_sets_db import RemoteGeneSetCollection
+from federation.gene_sets_db import (
+    REMOTE_GENE_SET_VERSION_TTL,
+    RemoteGeneSetCollection,
+)
 from rest_client.rest_client import RESTClient
 
 
@@ -38,3 +42,35 @@ def test_get_gene_set(rest_client: RESTClient) -> None:
 
     assert gene_set["count"] == 1
     assert len(gene_set["syms"]) == 1
+
+
+def test_get_gene_set_version_is_refreshed_after_ttl(
+    mocker: pytest_mock.MockerFixture,
+) -> None:
+    rest_client = mocker.Mock()
+    rest_client.client_id = "remote"
+    rest_client.get_gene_sets.return_value = [
+        {"name": "gs1", "desc": "Gene Set 1", "count": 2},
+    ]
+    rest_client.get_gene_set_download.return_value = \
+        '"gs1"\n"Gene Set 1"\nPOGZ\nCHD8\n'
+    monotonic = mocker.patch(
+        "federation.gene_sets_db.time.monotonic", return_value=0.0)
+    rgsc = RemoteGeneSetCollection("main", rest_client, "", "")
+
+    version = rgsc.get_gene_set_version("gs1")
+    assert rgsc.get_gene_set_version("gs1") == version
+    assert rest_client.get_gene_set_download.call_count == 1
+    rest_client.get_gene_sets.assert_called_once()
+
+    # symbols change on the remote side while the count stays the same
+    rest_client.get_gene_set_download.return_value = \
+        '"gs1"\n"Gene Set 1"\nPOGZ\nANK2\n'
+    monotonic.return_value = REMOTE_GENE_SET_VERSION_TTL + 1.0
+    assert rgsc.get_gene_set_version("gs1") != version
+    assert rest_client.get_gene_set_download.call_count == 2
+
+    gene_set = rgsc.get_gene_set("gs1")
+    assert gene_set is not None
+    assert set(gene_set["syms"]) == {"POGZ", "ANK2"}
+    assert rgsc.get_gene_set_version("missing") == ""
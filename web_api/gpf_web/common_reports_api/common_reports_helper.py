@@ -7,9 +7,8 @@ from utils.query_params import parse_query_params
 
 from gpf.common_reports.common_report import CommonReport
 from gpf.pedigrees.families_data import FamiliesData
+from gpf.pedigrees.families_index import get_families_index
 from gpf.pedigrees.family import FamilyTag
-from gpf.pedigrees.family_tag_builder import check_family_tags_query
-from gpf.pedigrees.loader import FamiliesLoader
 
 
 class BaseCommonReportsHelper(GPFTool):
@@ -74,13 +73,13 @@ class CommonReportsHelper(BaseCommonReportsHelper):
         common_report = self._get_common_report_from_data()
         if common_report is None:
             return None
-        return common_report.to_dict()
+        return common_report.get_dict()
 
     def get_full_common_report(self) -> dict[str, Any] | None:
         common_report = self._get_common_report_from_data()
         if common_report is None:
             return None
-        return common_report.to_dict(full=True)
+        return common_report.get_dict(full=True)
 
     def _get_common_report_from_data(self) -> CommonReport | None:
         common_report = None
@@ -117,19 +116,12 @@ class CommonReportsHelper(BaseCommonReportsHelper):
         else:
             study_families = self.study.phenotype_data.families
 
-        counter_families_data = FamiliesData.from_families({
-            family_id: study_families[family_id]
-            for family_id in counter_families
-        })
-
-        tsv = FamiliesLoader.to_tsv(counter_families_data)
-        return [f"{ln}\n" for ln in tsv.strip().split("\n")]
+        return get_families_index(study_families).tsv_lines(counter_families)
 
     def get_family_data_tsv(
         self,
     ) -> list[str]:
-        tsv = FamiliesLoader.to_tsv(self.study.families)
-        return [f"{ln}\n" for ln in tsv.strip().split("\n")]
+        return get_families_index(self.study.families).tsv_lines()
 
     def get_filtered_family_data_tsv(
         self,
@@ -144,17 +136,16 @@ class CommonReportsHelper(BaseCommonReportsHelper):
 
         result = self._collect_families(study_families, tags_query)
 
-        tsv = FamiliesLoader.to_tsv(result)
-        return [f"{ln}\n" for ln in tsv.strip().split("\n")]
+        return get_families_index(study_families).tsv_lines(result)
 
     def _collect_families(
         self,
         study_families: FamiliesData,
         tags_query: dict[str, Any] | None,
-    ) -> FamiliesData:
-        """Collect and filter families by tags."""
+    ) -> list[str] | None:
+        """Collect ids of families passing a tags query."""
         if tags_query is None:
-            return study_families
+            return None
 
         or_mode = tags_query.get("orMode")
         if or_mode is None or not isinstance(or_mode, bool):
@@ -168,14 +159,8 @@ class CommonReportsHelper(BaseCommonReportsHelper):
             raise ValueError("Invalid exclude or none specified")
         exclude_tags = {FamilyTag.from_label(label) for label in exclude_tags}
 
-        result = {
-            family_id: family
-            for family_id, family in study_families.items()
-            if check_family_tags_query(
-                family, or_mode=or_mode,
-                include_tags=include_tags,
-                exclude_tags=exclude_tags,
-            )
-        }
-
-        return FamiliesData.from_families(result)
+        return get_families_index(study_families).query_tags(
+            or_mode=or_mode,
+            include_tags=include_tags,
+            exclude_tags=exclude_tags,
+        )
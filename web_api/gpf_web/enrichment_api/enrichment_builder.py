@@ -10,6 +10,7 @@ from utils.expand_gene_set import expand_gene_set
 
 from enrichment_api.enrichment_helper import EnrichmentHelper
 from enrichment_api.enrichment_serializer import EnrichmentSerializer
+from gpf.gpf_instance.gene_score_index import get_gene_score_index
 from gpf.person_sets import PersonSetCollection
 
 logger = logging.getLogger(__name__)
@@ -250,11 +251,15 @@ class EnrichmentBuilder(BaseEnrichmentBuilder):
                 raise ValueError(
                     f"Score not found: {gene_score_id}",
                 )
-            gene_syms = list(
-                score.get_genes(
-                    gene_score_id,
-                    score_min=range_start,
-                    score_max=range_end,
-                ),
-            )
+            index = get_gene_score_index(score, gene_score_id)
+            if index.is_numeric:
+                gene_syms = list(index.get_genes(range_start, range_end))
+            else:
+                gene_syms = list(
+                    score.get_genes(
+                        gene_score_id,
+                        score_min=range_start,
+                        score_max=range_end,
+                    ),
+                )
         return gene_syms
@@ -283,13 +283,14 @@ def test_full_study_families_view(
 
     response = admin_client.get(url)
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) == 2  # type: ignore
+    data = json.loads(b"".join(response.streaming_content))  # type: ignore
+    assert len(data) == 2
     f1_1_idx = -1
-    for idx, fam in enumerate(response.data):  # type: ignore
+    for idx, fam in enumerate(data):
         if fam["family_id"] == "f1.1":
             f1_1_idx = idx
             break
-    family = response.data[f1_1_idx]  # type: ignore
+    family = data[f1_1_idx]
     assert family["family_id"] == "f1.1"
     assert family["family_type"] == "other"
     assert family["person_ids"] == ["mom1", "dad1", "p1", "s1"]
@@ -311,3 +312,29 @@ def test_full_study_families_view(
         "not_sequenced": False,
         "missing": False,
     }
+
+
+def test_full_study_families_view_pages(
+    admin_client: Client,
+    t4c8_wgpf_instance: WGPFInstance,  # noqa: ARG001 ; setup WGPF instance
+) -> None:
+    url = "/api/v3/families/t4c8_study_1/all"
+
+    response = admin_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    families = json.loads(
+        b"".join(response.streaming_content))  # type: ignore
+
+    pages = []
+    for page in (1, 2):
+        response = admin_client.get(f"{url}?page={page}&page_size=1")
+        assert response.status_code == status.HTTP_200_OK
+        pages.extend(json.loads(
+            b"".join(response.streaming_content)))  # type: ignore
+    assert pages == families
+
+    response = admin_client.get(f"{url}?page=3&page_size=1")
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = admin_client.get(f"{url}?page=first")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -2,14 +2,18 @@ from datasets_api.permissions import (
     get_instance_timestamp_etag,
     get_permissions_etag,
 )
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.http import etag
 from query_base.query_base import DatasetAccessRightsView, QueryBaseView
 from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
+from utils.streaming_response_util import encoded_iterator_to_json
 
-from gpf.pedigrees.family_tag_builder import FamilyTag, check_tag
+from gpf.pedigrees.families_index import get_families_index
+from gpf.pedigrees.family_tag_builder import FamilyTag
 
 
 class ListFamiliesView(QueryBaseView, DatasetAccessRightsView):
@@ -38,18 +42,18 @@ class ListFamiliesView(QueryBaseView, DatasetAccessRightsView):
                 status.HTTP_200_OK,
             )
 
-        result = set()
-        tag_labels = tags_query.split(",")
-        tags = {FamilyTag.from_label(label) for label in tag_labels}
-        for family_id, family in families.items():
-            for tag in tags:
-                try:
-                    tagged = check_tag(family, tag)
-                    if tagged:
-                        result.add(family_id)
-                except ValueError as err:
-                    print(err)
-                    return Response(status=status.HTTP_400_BAD_REQUEST)
+        try:
+            tags = {
+                FamilyTag.from_label(label)
+                for label in tags_query.split(",")
+            }
+        except KeyError as err:
+            print(err)
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+
+        result = get_families_index(families).query_tags(
+            or_mode=True, include_tags=tags, exclude_tags=set(),
+        )
 
         return Response(
             result,
@@ -239,13 +243,18 @@ class AllMemberDetailsView(QueryBaseView, DatasetAccessRightsView):
 class ListAllDetailsView(QueryBaseView, DatasetAccessRightsView):
     """List of all family details."""
 
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+
     @method_decorator(etag(get_permissions_etag))
     def get(
-        self, request: Request,  # noqa: ARG002
+        self, request: Request,
         dataset_id: str,
-    ) -> Response:
-        # pylint: disable=unused-argument
-        """Response to get request for all families details in a dataset."""
+    ) -> Response | StreamingHttpResponse:
+        """Response to get request for all families details in a dataset.
+
+        The details are streamed as a JSON array. If a page is requested,
+        only the families of that page are listed.
+        """
         if dataset_id is None:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
@@ -259,13 +268,28 @@ class ListAllDetailsView(QueryBaseView, DatasetAccessRightsView):
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
         families = dataset.genotype_data.families
-
-        out = []
-
-        for family in families.values():
-            json = family.to_json()
-            members = family.members_in_order
-            json["members"] = [m.to_json() for m in members]
-            out.append(json)
-
-        return Response(out, status=status.HTTP_200_OK)
+        family_ids = list(families.keys())
+
+        page = request.GET.get("page")
+        if page is not None:
+            try:
+                page = int(page)
+                page_size = int(request.GET.get("page_size", self.page_size))
+            except ValueError:
+                return Response(status=status.HTTP_400_BAD_REQUEST)
+            if page < 1 or page_size < 1:
+                return Response(status=status.HTTP_400_BAD_REQUEST)
+            page_start = (page - 1) * page_size
+            family_ids = family_ids[page_start:page_start + page_size]
+            if len(family_ids) == 0:
+                return Response(status=status.HTTP_204_NO_CONTENT)
+
+        families_index = get_families_index(families)
+        return StreamingHttpResponse(
+            encoded_iterator_to_json(
+                families_index.family_details_json(family_id)
+                for family_id in family_ids
+            ),
+            status=status.HTTP_200_OK,
+            content_type="application/json",
+        )
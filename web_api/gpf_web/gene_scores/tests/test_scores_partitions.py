@@ -35,3 +35,24 @@ def test_bad_gene_score_partition(
         url, json.dumps(data), content_type="application/json", format="json",
     )
     assert response.status_code == 404
+
+
+def test_gene_scores_partitions_counts(
+    user_client: Client,
+    t4c8_wgpf_instance: WGPFInstance,  # noqa: ARG001 ; setup WGPF instance
+) -> None:
+    url = "/api/v3/gene_scores/partitions"
+    whole = user_client.post(
+        url, json.dumps({"score": "t4c8_score", "min": -1e9, "max": 1e9}),
+        content_type="application/json", format="json",
+    ).json()
+    assert whole["left"]["count"] == 0
+    assert whole["right"]["count"] == 0
+    assert whole["mid"]["count"] > 0
+
+    split = user_client.post(
+        url, json.dumps({"score": "t4c8_score", "min": 1.5, "max": 5.0}),
+        content_type="application/json", format="json",
+    ).json()
+    assert split["left"]["count"] + split["mid"]["count"] + \
+        split["right"]["count"] == whole["mid"]["count"]
@@ -1,6 +1,5 @@
 from typing import Any
 
-import numpy as np
 from datasets_api.permissions import get_instance_timestamp_etag
 from django.http.response import StreamingHttpResponse
 from django.utils.decorators import method_decorator
@@ -12,6 +11,8 @@ from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from gpf.gpf_instance.gene_score_index import get_gene_score_index
+
 
 class GeneScoresListView(QueryBaseView):
     """Provides list of all gene scores."""
@@ -99,10 +100,11 @@ class GeneScoresDownloadView(QueryBaseView):
     def get(self, _request: Request, score: str) -> StreamingHttpResponse:
         """Serve a gene score download request."""
         score_desc = self.gpf_instance.get_gene_score_desc(score)
-        gene_score = score_desc.resource_id
-        tsv = self.gpf_instance.get_gene_score(gene_score).to_tsv(score)
+        gene_score = self.gpf_instance.get_gene_score(score_desc.resource_id)
+        index = get_gene_score_index(gene_score, score)
 
-        response = StreamingHttpResponse(tsv, content_type="text/csv")
+        response = StreamingHttpResponse(
+            iter(index.tsv_lines), content_type="text/csv")
 
         response["Content-Disposition"] = "attachment; filename=scores.csv"
         response["Expires"] = "0"
@@ -127,7 +129,9 @@ class GeneScoresPartitionsView(QueryBaseView):
 
         score_desc = self.gpf_instance.get_gene_score_desc(score_name)
         gene_score = self.gpf_instance.get_gene_score(score_desc.resource_id)
-        df = gene_score.get_score_df(score_name)
+        index = get_gene_score_index(gene_score, score_name)
+        if not index.is_numeric:
+            return Response(status=status.HTTP_400_BAD_REQUEST)
 
         try:
             score_min = float(data["min"])
@@ -139,19 +143,12 @@ class GeneScoresPartitionsView(QueryBaseView):
         except (ValueError, TypeError):
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        total = 1.0 * len(df)
-
-        ldf = df[df[score_name] < score_min]
-        rdf = df[df[score_name] > score_max]
-        mdf = df[
-            np.logical_and(
-                df[score_name] >= score_min,
-                df[score_name] <= score_max)
-        ]
+        total = 1.0 * index.total
+        left, mid, right = index.count_partitions(score_min, score_max)
 
         res = {
-            "left": {"count": len(ldf), "percent": len(ldf) / total},
-            "mid": {"count": len(mdf), "percent": len(mdf) / total},
-            "right": {"count": len(rdf), "percent": len(rdf) / total},
+            "left": {"count": left, "percent": left / total},
+            "mid": {"count": mid, "percent": mid / total},
+            "right": {"count": right, "percent": right / total},
         }
         return Response(res)
@@ -6,6 +6,7 @@ from urllib.parse import urlencode
 
 from django.test.client import Client
 from gpf_instance.gpf_instance import WGPFInstance
+from pytest_mock import MockerFixture
 from rest_framework import status
 
 
@@ -438,3 +439,104 @@ def test_gene_sets_missing_collection(
         url, json.dumps(query), content_type="application/json", format="json",
     )
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_denovo_gene_sets_filter_and_limit(
+    admin_client: Client,
+    t4c8_wgpf_instance: WGPFInstance,  # noqa: ARG001 ; setup WGPF instance
+) -> None:
+    url = "/api/v3/gene_sets/gene_sets"
+    query = {
+        "geneSetsCollection": "denovo",
+        "geneSetsTypes": [
+            {
+                "datasetId": "t4c8_study_4",
+                "collections": [
+                    {
+                        "personSetId": "phenotype",
+                        "types": [
+                            "autism",
+                        ],
+                    },
+                ],
+            },
+        ],
+        "filter": "synonymous",
+        "limit": 1,
+    }
+    response = admin_client.post(
+        url, json.dumps(query),
+        content_type="application/json", format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+
+    assert len(result) == 1
+    assert result[0]["name"] == "Synonymous"
+
+
+def test_denovo_gene_set_download_etag(
+    admin_client: Client,
+    t4c8_wgpf_instance: WGPFInstance,  # noqa: ARG001 ; setup WGPF instance
+) -> None:
+    url = "/api/v3/gene_sets/gene_set_download"
+    query = {
+        "geneSetsCollection": "denovo",
+        "geneSet": "Synonymous",
+        "geneSetsTypes": [
+            {
+                "datasetId": "t4c8_dataset",
+                "collections": [
+                    {
+                        "personSetId": "phenotype",
+                        "types": [
+                            "autism",
+                        ],
+                    },
+                ],
+            },
+        ],
+    }
+    request = f"{url}?{urlencode(query)}"
+    response = admin_client.get(request)
+    assert response.status_code == status.HTTP_200_OK
+    content = b"".join(response.streaming_content)  # type: ignore
+    etag = response["ETag"]
+
+    response = admin_client.get(request)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] == etag
+    assert b"".join(response.streaming_content) == content  # type: ignore
+
+    response = admin_client.get(request, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    query["geneSet"] = "Missense"
+    response = admin_client.get(f"{url}?{urlencode(query)}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+def test_gene_set_download_etag_covers_gene_set_version(
+    admin_client: Client,
+    t4c8_wgpf_instance: WGPFInstance,
+    mocker: MockerFixture,
+) -> None:
+    url = "/api/v3/gene_sets/gene_set_download"
+    query = {
+        "geneSetsCollection": "main",
+        "geneSet": "t4_candidates",
+    }
+    request = f"{url}?{urlencode(query)}"
+    response = admin_client.get(request)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response["ETag"]
+
+    # an updated gene set resource gives a new gene set version
+    mocker.patch.object(
+        t4c8_wgpf_instance.gene_sets_db, "get_gene_set_version",
+        return_value="updated",
+    )
+    response = admin_client.get(request, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
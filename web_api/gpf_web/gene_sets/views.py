@@ -1,14 +1,19 @@
 """Classes to handle gene set views."""
 
 import ast
-import itertools
+import hashlib
+import json
 import logging
+import weakref
+from collections import OrderedDict
 from collections.abc import Sequence
 from copy import deepcopy
+from threading import Lock
 from typing import Any, cast
 
 from datasets_api.permissions import get_instance_timestamp_etag
-from django.http.response import StreamingHttpResponse
+from django.http.response import HttpResponseBase, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
 from django.views.decorators.http import etag
 from gain.gene_sets.gene_set import GeneSet
@@ -20,6 +25,40 @@ from utils.gene_sets import get_denovo_gene_set_spec
 
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_PAYLOADS_LIMIT = 64
+
+
+class _DownloadPayloadsCache:
+    """Rendered gene set downloads kept per gene sets DB.
+
+    Payloads are addressed by the E-Tag of the download, which covers the
+    requested gene set and the version of its content.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._payloads: weakref.WeakKeyDictionary[
+            Any, OrderedDict[str, bytes]] = weakref.WeakKeyDictionary()
+
+    def get(self, gene_sets_db: Any, etag: str) -> bytes | None:
+        with self._lock:
+            payloads = self._payloads.get(gene_sets_db)
+            if payloads is None or etag not in payloads:
+                return None
+            payloads.move_to_end(etag)
+            return payloads[etag]
+
+    def put(self, gene_sets_db: Any, etag: str, payload: bytes) -> None:
+        with self._lock:
+            payloads = self._payloads.setdefault(gene_sets_db, OrderedDict())
+            payloads[etag] = payload
+            payloads.move_to_end(etag)
+            while len(payloads) > DOWNLOAD_PAYLOADS_LIMIT:
+                payloads.popitem(last=False)
+
+
+_DOWNLOAD_PAYLOADS = _DownloadPayloadsCache()
+
 
 class GeneSetsCollectionsView(QueryBaseView):
     """Class to handle gene sets collections view."""
@@ -101,14 +140,19 @@ class GeneSetsView(QueryBaseView):
             data.get("geneSetsTypes", []),
         )
 
-        gene_sets: Sequence[GeneSet | dict[str, Any]] = []
+        query = data.get("filter")
+        limit = int(data["limit"]) if "limit" in data else None
+
+        response: Sequence[GeneSet | dict[str, Any]] = []
 
         if "denovo" in gene_sets_collection_id:
             if not self.gpf_instance.denovo_gene_sets_db.has_gene_sets():
                 return Response(status=status.HTTP_404_NOT_FOUND)
-            gene_sets = self.gpf_instance \
-                .denovo_gene_sets_db.get_all_gene_sets(
+            response = self.gpf_instance \
+                .denovo_gene_sets_db.search_gene_sets(
                     gene_sets_types,
+                    query,
+                    limit,
                     gene_sets_collection_id,
                 )
         else:
@@ -117,24 +161,13 @@ class GeneSetsView(QueryBaseView):
             ):
                 return Response(status=status.HTTP_404_NOT_FOUND)
 
-            gene_sets = self.gpf_instance.gene_sets_db.get_all_gene_sets(
+            response = self.gpf_instance.gene_sets_db.search_gene_sets(
                 gene_sets_collection_id,
+                query,
+                limit,
             )
         logger.debug("gene set collection: %s", gene_sets_collection_id)
-        logger.debug("gene sets: %s", len(gene_sets))
-
-        response = gene_sets[:]
-        if "filter" in data:
-            query = data["filter"].lower()
-            response = [
-                r
-                for r in response
-                if query in r["name"].lower() or query in r["desc"].lower()
-            ]
-
-        if "limit" in data:
-            limit = int(data["limit"])
-            response = response[:limit]
+        logger.debug("gene sets: %s", len(response))
 
         response = [
             {
@@ -171,15 +204,29 @@ class GeneSetDownloadView(QueryBaseView):
     }
     """
 
-    def post(self, request: Request) -> Response | StreamingHttpResponse:
+    def post(self, request: Request) -> HttpResponseBase:
         if not request.data:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        return self._build_response(cast(dict, request.data))
+        return self._build_response(request, cast(dict, request.data))
+
+    @staticmethod
+    def _download_etag(
+        gene_sets_collection_id: str,
+        gene_set_id: str,
+        gene_sets_types: Any,
+        version: str,
+    ) -> str:
+        content = json.dumps(
+            [gene_sets_collection_id, gene_set_id, gene_sets_types, version],
+            sort_keys=True, default=sorted,
+        )
+        digest = hashlib.md5(content.encode()).hexdigest()  # noqa: S324
+        return f'"{digest}"'
 
     def _build_response(
-        self, data: dict[str, Any],
-    ) -> Response | StreamingHttpResponse:
+        self, request: Request, data: dict[str, Any],
+    ) -> HttpResponseBase:
         if "geneSetsCollection" not in data or "geneSet" not in data:
             return Response(status=status.HTTP_400_BAD_REQUEST)
         gene_sets_collection_id = data["geneSetsCollection"]
@@ -188,45 +235,61 @@ class GeneSetDownloadView(QueryBaseView):
             data.get("geneSetsTypes", []),
         )
 
-        gene_set: GeneSet | dict[str, Any] | None = None
-
+        gene_sets_db: Any
         if "denovo" in gene_sets_collection_id:
-            if not self.gpf_instance.denovo_gene_sets_db.has_gene_sets():
+            gene_sets_db = self.gpf_instance.denovo_gene_sets_db
+            if not gene_sets_db.has_gene_sets():
                 return Response(status=status.HTTP_404_NOT_FOUND)
-            gene_set = self.gpf_instance.denovo_gene_sets_db.get_gene_set(
-                gene_set_id,
-                gene_sets_types,
-                gene_sets_collection_id,
-            )
+            version = gene_sets_db.cache_version
         else:
-            if not self.gpf_instance.gene_sets_db.has_gene_set_collection(
+            gene_sets_db = self.gpf_instance.gene_sets_db
+            if not gene_sets_db.has_gene_set_collection(
                 gene_sets_collection_id,
             ):
                 return Response(
                     {"unknown gene set collection": gene_sets_collection_id},
                     status=status.HTTP_404_NOT_FOUND,
                 )
+            gene_sets_types = {}
+            version = gene_sets_db.get_gene_set_version(
+                gene_sets_collection_id, gene_set_id)
+
+        etag = self._download_etag(
+            gene_sets_collection_id, gene_set_id, gene_sets_types, version)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        payload = _DOWNLOAD_PAYLOADS.get(gene_sets_db, etag)
+        if payload is None:
+            gene_set: GeneSet | dict[str, Any] | None
+            if "denovo" in gene_sets_collection_id:
+                gene_set = gene_sets_db.get_gene_set(
+                    gene_set_id,
+                    gene_sets_types,
+                    gene_sets_collection_id,
+                )
+            else:
+                gene_set = gene_sets_db.get_gene_set(
+                    gene_sets_collection_id,
+                    gene_set_id,
+                )
 
-            gene_set = self.gpf_instance.gene_sets_db.get_gene_set(
-                gene_sets_collection_id,
-                gene_set_id,
-            )
-
-        if gene_set is None:
-            return Response(status=status.HTTP_404_NOT_FOUND)
+            if gene_set is None:
+                return Response(status=status.HTTP_404_NOT_FOUND)
 
-        gene_syms = [f"{s}\n".encode() for s in gene_set["syms"]]
-        result = itertools.chain(
-            [
-                f"{gene_set['name']}\n".encode(),
-                f"{gene_set['desc']}\n".encode(),
-            ],
-            gene_syms)
+            payload = "".join([
+                f"{gene_set['name']}\n",
+                f"{gene_set['desc']}\n",
+                *(f"{sym}\n" for sym in gene_set["syms"]),
+            ]).encode()
+            _DOWNLOAD_PAYLOADS.put(gene_sets_db, etag, payload)
 
-        response = StreamingHttpResponse(result, content_type="text/csv")
+        response = StreamingHttpResponse([payload], content_type="text/csv")
 
         response["Content-Disposition"] = "attachment; filename=geneset.csv"
         response["Expires"] = "0"
+        response["ETag"] = etag
 
         return response
 
@@ -237,11 +300,11 @@ class GeneSetDownloadView(QueryBaseView):
             res["geneSetsTypes"] = ast.literal_eval(res["geneSetsTypes"])
         return res
 
-    def get(self, request: Request) -> Response | StreamingHttpResponse:
+    def get(self, request: Request) -> HttpResponseBase:
         if not request.query_params:
             return Response(status=status.HTTP_400_BAD_REQUEST)
         data = self._parse_query_params(cast(dict, request.query_params))
-        return self._build_response(data)
+        return self._build_response(request, data)
 
 
 class GeneSetsHasDenovoView(QueryBaseView):
@@ -87,6 +87,16 @@ def test_search_gene_symbols(
     response = anonymous_client.get("/api/v3/genome/gene_models/search/C")
     assert len(response.data["gene_symbols"]) == 15  # type: ignore
 
+    response = anonymous_client.get("/api/v3/genome/gene_models/search/test")
+    assert response.data["gene_symbols"] == [  # type: ignore
+        "CTEST", "CTEST2", "CTEST3", "CTEST4",
+    ]
+
+    response = anonymous_client.get("/api/v3/genome/gene_models/search/chd1")
+    assert response.data["gene_symbols"] == [  # type: ignore
+        "CHD1", "CHD1L",
+    ]
+
 
 def test_validate_gene_symbols(
     anonymous_client: Client,
@@ -114,8 +124,11 @@ def test_validate_gene_symbols(
                 "CHD99",  # Invalid gene symbol
                 "CTEST3",
                 "CTEST99",  # Invalid gene symbol
+                "chd7",  # Invalid: variant queries are case-sensitive
             ],
         }),
         content_type="application/json",
     )
-    assert response.data == ["CHDHA", "CHD99", "CTEST99"]  # type: ignore
+    assert response.data == [  # type: ignore
+        "CHDHA", "CHD99", "CTEST99", "chd7",
+    ]
@@ -1,4 +1,3 @@
-from itertools import islice
 from typing import Any
 
 from datasets_api.permissions import get_instance_timestamp_etag
@@ -95,21 +94,16 @@ class GeneSymbolsSearch(QueryBaseView):
 
     @method_decorator(etag(get_instance_timestamp_etag))
     def get(self, _request: Request, search_term: str) -> Response:
-        """Return list of gene symbols matching the search."""
-        search_term = search_term.lower()
-        gene_models = self.gpf_instance.gene_models.gene_models
-
-        matching_gene_symbols = islice(
-            filter(
-                lambda gs: gs.lower().startswith(search_term),
-                gene_models.keys(),
-            ),
-            None,
-            self.RESPONSE_LIMIT,
-        )
+        """Return list of gene symbols matching the search.
+
+        Gene symbols starting with the search term come first, followed by
+        gene symbols containing it.
+        """
+        matching_gene_symbols = self.gpf_instance.gene_symbols_index.search(
+            search_term, self.RESPONSE_LIMIT)
 
         return Response(
-            {"gene_symbols": list(matching_gene_symbols)},
+            {"gene_symbols": matching_gene_symbols},
             status=status.HTTP_200_OK,
         )
 
@@ -119,7 +113,11 @@ class GeneSymbolsValidate(QueryBaseView):
 
     @method_decorator(etag(get_instance_timestamp_etag))
     def post(self, request: Request) -> Response:
-        """Return list gene symbols that are not valid."""
+        """Return list gene symbols that are not valid.
+
+        Gene symbols are matched case-sensitively, the same way variant
+        queries match them.
+        """
         data = request.data
 
         assert isinstance(data, dict)
@@ -129,9 +127,9 @@ class GeneSymbolsValidate(QueryBaseView):
         if len(gene_symbols) == 0:
             return Response([], status=status.HTTP_200_OK)
 
-        gene_models = self.gpf_instance.gene_models.gene_models
+        gene_symbols_index = self.gpf_instance.gene_symbols_index
         invalid_gene_symbols = [
-            gs for gs in gene_symbols if gs not in gene_models
+            gs for gs in gene_symbols if gs not in gene_symbols_index
         ]
 
         return Response(
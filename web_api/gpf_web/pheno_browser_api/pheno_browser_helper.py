@@ -2,19 +2,17 @@ import csv
 import logging
 from abc import abstractmethod
 from collections.abc import Generator
+from functools import reduce
 from io import StringIO
 from typing import Any
 
+import pyarrow.compute as pc
 from gpf_instance.extension import GPFTool
 from studies.study_wrapper import WDAEAbstractStudy, WDAEStudy
 
 logger = logging.getLogger(__name__)
 
 
-class CountError(Exception):
-    pass
-
-
 class BasePhenoBrowserHelper(GPFTool):
     """Base class for pheno browser helpers."""
 
@@ -45,7 +43,7 @@ class BasePhenoBrowserHelper(GPFTool):
         self,
         data: dict[str, Any],
     ) -> Generator[str, None, None]:
-        """Get measure ids."""
+        """Get CSV content of the values of the searched measures."""
 
     @abstractmethod
     def measures_count_status(
@@ -147,15 +145,9 @@ class PhenoBrowserHelper(BasePhenoBrowserHelper):
                 and instrument not in self.study.phenotype_data.instruments):
             raise KeyError
 
-        measures = self.study.phenotype_data.search_measures(
+        measure_ids = self.study.phenotype_data.search_measure_ids(
             instrument, search_term,
         )
-        measure_ids = [
-            measure["measure"]["measure_id"] for measure in measures
-        ]
-
-        if len(measure_ids) > 1900:
-            raise CountError
 
         return self._csv_value_iterator(
             self.study, measure_ids,
@@ -166,7 +158,12 @@ class PhenoBrowserHelper(BasePhenoBrowserHelper):
         dataset: WDAEStudy,
         measure_ids: list[str],
     ) -> Generator[str, None, None]:
-        """Create CSV content for people measures data."""
+        """Create CSV content for people measures data.
+
+        Measure values are read as Arrow record batches and the rows of
+        every batch are written with the same CSV writer as the header, as
+        a single chunk. People without any measure values are skipped.
+        """
         header = ["person_id", *measure_ids]
         buffer = StringIO()
         writer = csv.writer(buffer, delimiter=",")
@@ -175,20 +172,23 @@ class PhenoBrowserHelper(BasePhenoBrowserHelper):
         buffer.seek(0)
         buffer.truncate(0)
 
-        values_iterator = dataset.phenotype_data.get_people_measure_values(
-            measure_ids)
+        if not measure_ids:
+            buffer.close()
+            return
 
-        for values_dict in values_iterator:
-            output = [values_dict[header[0]]]
-            all_null = True
-            for col in header[1:]:
-                value = values_dict[col]
-                if value is not None:
-                    all_null = False
-                output.append(value)
-            if all_null:
+        batches = dataset.phenotype_data.get_people_measure_values_batches(
+            measure_ids)
+        for batch in batches:
+            has_values = reduce(pc.or_, (
+                pc.is_valid(batch.column(measure_id))
+                for measure_id in measure_ids
+            ))
+            rows = batch.select(header).filter(has_values)
+            if rows.num_rows == 0:
                 continue
-            writer.writerow(output)
+            writer.writerows(
+                zip(*(column.to_pylist() for column in rows.columns),
+                    strict=True))
             yield buffer.getvalue()
             buffer.seek(0)
             buffer.truncate(0)
@@ -201,8 +201,6 @@ class PhenoBrowserHelper(BasePhenoBrowserHelper):
     ) -> str:
         count = self._count_measure_ids(data)
 
-        if count > 1900:
-            return "too large"
         if count == 0:
             return "zero"
         return "ok"
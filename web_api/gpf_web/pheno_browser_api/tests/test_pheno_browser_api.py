@@ -1,4 +1,6 @@
 # pylint: disable=W0621,C0114,C0116,W0212,W0613
+import csv
+import io
 import json
 from collections.abc import Iterator
 from typing import Any, cast
@@ -270,6 +272,37 @@ def test_download_all_instruments_specific_measures(
     }
 
 
+def test_download_content(
+    admin_client: Client,
+    t4c8_wgpf_instance: WGPFInstance,  # noqa: ARG001
+) -> None:
+    data = {
+        "dataset_id": "t4c8_study_1",
+        "instrument": "i1",
+        "search_term": "i1.age",
+    }
+    response = cast(StreamingHttpResponse, admin_client.get(
+        DOWNLOAD_URL, data,
+    ))
+
+    assert response.status_code == 200
+
+    content = b"".join(
+        cast(Iterator[bytes], response.streaming_content)).decode("utf-8")
+    # header and values are written by the same CSV writer
+    assert all(
+        line.endswith("\r\n")
+        for line in content.splitlines(keepends=True))
+    assert '"' not in content
+    rows = list(csv.reader(io.StringIO(content)))
+    assert rows[0] == ["person_id", "i1.age"]
+    assert len(rows) > 1
+    for row in rows[1:]:
+        assert len(row) == 2
+        assert row[0]
+        assert float(row[1]) >= 0
+
+
 @override_settings(FEATURE_FLAGS={"pheno_browser_download": False})
 def test_download_disabled_returns_404(
     admin_client: Client,
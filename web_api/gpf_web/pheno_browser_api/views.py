@@ -17,7 +17,6 @@ from studies.study_wrapper import WDAEAbstractStudy, WDAEStudy
 
 from pheno_browser_api.pheno_browser_helper import (
     BasePhenoBrowserHelper,
-    CountError,
     PhenoBrowserHelper,
 )
 
@@ -215,9 +214,6 @@ class PhenoMeasuresDownload(
         except KeyError:
             logger.info("Measures not found")
             return Response(status=status.HTTP_404_NOT_FOUND)
-        except CountError:
-            logger.info("Measure count is too large")
-            return Response(status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
 
         response["Content-Disposition"] = \
             "attachment; filename=measures.csv"
@@ -254,6 +250,7 @@ class PhenoMeasuresDownload(
             logger.exception("Measures not found")
             return Response(status=status.HTTP_404_NOT_FOUND)
 
+        # only remote instances that still cap the download report this
         if count_status == "too_large":
             logger.info("Measure count is too large")
             return Response(status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
@@ -295,9 +292,6 @@ class PhenoMeasuresCount(QueryBaseView, DatasetAccessRightsView):
         except KeyError:
             logger.exception("Measures not found")
             return Response(status=status.HTTP_404_NOT_FOUND)
-        except CountError:
-            logger.exception("Measure count is too large")
-            return Response(status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
 
         return Response({"count": count})
 
@@ -10,6 +10,7 @@ from gain.effect_annotation.effect import EffectTypesMixin
 from gain.gene_scores.gene_scores import GeneScoresDb
 from gain.utils.regions import Region
 
+from gpf.gpf_instance.gene_score_index import get_gene_score_index
 from gpf.gpf_instance.gpf_instance import GPFInstance
 from gpf.person_filters import make_pedigree_filter, make_pheno_filter
 from gpf.person_filters.person_filters import make_pheno_filter_beta
@@ -97,6 +98,11 @@ class QueryTransformer(QueryTransformerProtocol):
             if score is None:
                 return None
 
+            if values is None:
+                index = get_gene_score_index(score, scores_name)
+                if index.is_numeric:
+                    return list(index.get_genes(range_start, range_end))
+
             genes = score.get_genes(
                 scores_name, range_start, range_end, values)
 
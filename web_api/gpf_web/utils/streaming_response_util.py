@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 import logging
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from typing import Any
 
 import numpy as np
@@ -51,3 +51,14 @@ def iterator_to_json(
     finally:
         variants.close()
         yield "]"
+
+
+def encoded_iterator_to_json(
+    items: Iterable[str],
+) -> Generator[str, None, None]:
+    """Join an iterator of JSON encoded items into a JSON array generator."""
+    separator = "["
+    for item in items:
+        yield separator + item
+        separator = ","
+    yield "[]" if separator == "[" else "]"